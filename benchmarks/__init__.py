@@ -0,0 +1,25 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Benchmarks of Spyctral.
+
+The 'suite_*' modules are an asv (airspeed velocity) suite, configured in
+'asv.conf.json' at the root of the repository. The inputs are written by
+'generators' with the sizes given by the parameters of each benchmark.
+
+Run from the repository root::
+
+    asv run --python=same --set-commit-hash $(git rev-parse HEAD)
+    asv compare <old commit> <new commit>
+
+The results are stored in '.asv/results', one file per commit and
+machine, so any two runs can be compared; 'asv continuous main HEAD'
+runs both commits and reports the changes. Add '--quick' to run each
+benchmark once, or '--bench <regex>' to select benchmarks.
+
+The 'bench_*' modules are standalone scripts (see their docstrings).
+"""
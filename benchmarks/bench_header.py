@@ -0,0 +1,92 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Micro-benchmark of the Starlight header parser.
+
+Run from the repository root::
+
+    python benchmarks/bench_header.py [--repeat N]
+
+The header lines of every file in 'set_STARLIGHT_files' are collected once
+and then parsed N times with '_proces_header' (the compiled grammar) and
+with '_proces_header_line' alone (the generic path), so only the header
+parsing itself is timed.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import argparse
+import pathlib
+import timeit
+
+from spyctral.io import starlight
+from spyctral.utils import buffers
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+SET_DIR = (
+    pathlib.Path(__file__).parent.parent
+    / "tests"
+    / "datasets"
+    / "set_STARLIGHT_files"
+)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def collect_headers(paths):
+    """Return the header lines of each Starlight file."""
+    headers = []
+    for path in paths:
+        with buffers.open_mapped(path) as buffer:
+            header_lines, _, _ = starlight._split_starlight(buffer)
+        headers.append(header_lines)
+    return headers
+
+
+def generic_header(header_ln):
+    """Parse a header only through the generic path."""
+    head_dict = {}
+    for sl in header_ln:
+        starlight._proces_header_line(sl, head_dict)
+    return head_dict
+
+
+def main(repeat):
+    """Print the time per header of both parsers."""
+    headers = collect_headers(sorted(SET_DIR.glob("*.out")))
+    n_headers = len(headers) * repeat
+
+    print(f"{'parser':<12} {'us/header':>10} {'headers/s':>12}")
+    for name, parse in (
+        ("generic", generic_header),
+        ("grammar", starlight._proces_header),
+    ):
+        elapsed = min(
+            timeit.repeat(
+                lambda: [parse(h) for h in headers], number=repeat, repeat=3
+            )
+        )
+        print(
+            f"{name:<12} {elapsed / n_headers * 1e6:>10.1f} "
+            f"{n_headers / elapsed:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--repeat", type=int, default=100, help="passes over the headers"
+    )
+    main(parser.parse_args().repeat)
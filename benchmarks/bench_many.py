@@ -0,0 +1,83 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Scaling of 'read_starlight_many' with the number of workers.
+
+Run from the repository root::
+
+    python benchmarks/bench_many.py [--files N]
+
+N files are taken from 'set_STARLIGHT_files' (cycling over the directory)
+and read with 1, 2, 4 and all the CPUs, returning full summaries and
+compact tables.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import argparse
+import itertools
+import os
+import pathlib
+import time
+import warnings
+
+from spyctral.io import starlight
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+SET_DIR = (
+    pathlib.Path(__file__).parent.parent
+    / "tests"
+    / "datasets"
+    / "set_STARLIGHT_files"
+)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def bench(paths, **kwargs):
+    """Return the time to read 'paths' with 'read_starlight_many'."""
+    start = time.perf_counter()
+    starlight.read_starlight_many(paths, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(n_files):
+    """Print the time and the speedup for each number of workers."""
+    warnings.simplefilter("ignore")
+
+    paths = list(
+        itertools.islice(
+            itertools.cycle(sorted(SET_DIR.glob("*.out"))), n_files
+        )
+    )
+    n_cpus = os.cpu_count()
+    workers = sorted({1, 2, 4, n_cpus})
+
+    print(f"{n_files} files, {n_cpus} CPUs")
+    print(f"{'workers':>8} {'full s':>10} {'speedup':>8} {'compact s':>10}")
+    serial = None
+    for n in workers:
+        full = bench(paths, workers=n, chunksize=8)
+        compact = bench(paths, workers=n, chunksize=8, compact=True)
+        serial = serial or full
+        print(f"{n:>8} {full:>10.2f} {serial / full:>8.2f} {compact:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--files", type=int, default=600, help="number of files to read"
+    )
+    main(parser.parse_args().files)
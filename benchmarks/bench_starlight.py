@@ -0,0 +1,150 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Timing of 'read_starlight' on the test datasets and on larger files.
+
+Run from the repository root::
+
+    python benchmarks/bench_starlight.py [--files N]
+
+The larger files are built from 'case_SC_Starlight.out' by repeating the
+rows of the synthetic spectrum, so the header and results sections stay
+the same and only the spectrum grows.
+
+The batch run reads N files from 'set_STARLIGHT_files' (cycling over the
+directory), keeps every summary and reports the total time and the memory
+held by the summaries, with ``lazy=False`` and ``lazy=True``.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import argparse
+import itertools
+import pathlib
+import tempfile
+import time
+import timeit
+import tracemalloc
+import warnings
+
+from spyctral.io import starlight
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DATASETS = pathlib.Path(__file__).parent.parent / "tests" / "datasets"
+
+SOURCE = DATASETS / "case_SC_Starlight.out"
+
+SET_DIR = DATASETS / "set_STARLIGHT_files"
+
+#: Number of pixels of the synthetic spectrum in the larger files.
+PIXELS = (10_000, 100_000)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def make_large_starlight(path, n_pixels, source=SOURCE):
+    """Write a copy of 'source' whose synthetic spectrum has 'n_pixels'."""
+    lines = source.read_text().splitlines()
+    marker = next(
+        i
+        for i, line in enumerate(lines)
+        if line.startswith(starlight.SL_SECTION_SPECTRUM.decode())
+    )
+    head = lines[:marker + 1]
+    rows = lines[marker + 2:]
+    rows = [row for row in rows if row.strip()]
+
+    step = 2.0
+    start = float(rows[0].split()[0])
+    spectrum = []
+    for i in range(n_pixels):
+        values = rows[i % len(rows)].split()[1:]
+        spectrum.append(f" {start + i * step:.2f}    " + "   ".join(values))
+
+    path.write_text(
+        "\n".join(head + [f" {n_pixels}    [Nl_obs]"] + spectrum) + "\n"
+    )
+    return path
+
+
+def bench(path, number, **kwargs):
+    """Return the best time per call of 'read_starlight' on 'path'."""
+    times = timeit.repeat(
+        lambda: starlight.read_starlight(path, **kwargs),
+        number=number,
+        repeat=3,
+    )
+    return min(times) / number
+
+
+def bench_batch(n_files, **kwargs):
+    """Return the total time and the memory held after reading n_files."""
+    paths = itertools.islice(
+        itertools.cycle(sorted(SET_DIR.glob("*.out"))), n_files
+    )
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    summaries = [starlight.read_starlight(p, **kwargs) for p in paths]
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del summaries
+    return elapsed, held
+
+
+def main(n_files):
+    """Print the time per file for each dataset and each larger file."""
+    warnings.simplefilter("ignore")
+
+    paths = sorted(DATASETS.glob("case_SC_Starlight*.out"))
+    paths = [p for p in paths if "broken" not in p.name]
+
+    print(f"{'file':<32} {'pixels':>8} {'ms/file':>10} {'lazy':>10}")
+    for path in paths:
+        n_pixels = len(starlight.read_starlight(path).data.synthetic_spectrum)
+        eager = bench(path, number=10)
+        lazy = bench(path, number=10, lazy=True)
+        print(
+            f"{path.name:<32} {n_pixels:>8} "
+            f"{eager * 1e3:>10.2f} {lazy * 1e3:>10.2f}"
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_pixels in PIXELS:
+            path = make_large_starlight(
+                pathlib.Path(tmp) / f"large_{n_pixels}.out", n_pixels
+            )
+            eager = bench(path, number=1)
+            lazy = bench(path, number=1, lazy=True)
+            print(
+                f"{path.name:<32} {n_pixels:>8} "
+                f"{eager * 1e3:>10.2f} {lazy * 1e3:>10.2f}"
+            )
+
+    print()
+    print(f"batch of {n_files} files {'seconds':>12} {'MiB held':>10}")
+    for lazy in (False, True):
+        elapsed, held = bench_batch(n_files, lazy=lazy)
+        print(f"lazy={lazy!s:<17} {elapsed:>12.2f} {held / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--files", type=int, default=200, help="files in the batch run"
+    )
+    main(parser.parse_args().files)
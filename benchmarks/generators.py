@@ -0,0 +1,309 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Writers of synthetic Starlight and FISA files of any size.
+
+Run from the repository root::
+
+    python benchmarks/generators.py starlight out.out --pixels 1000000
+    python benchmarks/generators.py fisa out.fisa --pixels 1000000
+
+The Starlight files take the header of 'case_SC_Starlight.out' with the
+number of SSPs ('N_base'), of chains ('N_chains') and of pixels updated,
+and random but well formed tables: a few SSPs hold most of the light, so
+the ages and metallicities are defined for any 'N_base'. The FISA files
+have the four spectra written by FISA, three on the observed wavelength
+grid and the template on its own grid.
+
+The same arguments and seed always write the same file.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import argparse
+import pathlib
+import re
+
+import numpy as np
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DATASETS = pathlib.Path(__file__).parent.parent / "tests" / "datasets"
+
+SOURCE = DATASETS / "case_SC_Starlight.out"
+
+#: Metallicities of the SSPs of the Starlight files, in order.
+STARLIGHT_Z = (0.004, 0.008, 0.02)
+
+#: Number of SSPs that hold most of the light in the Starlight files.
+STARLIGHT_ACTIVE_SSPS = 6
+
+#: First wavelength and step (in Angstrom) of the Starlight spectrum.
+STARLIGHT_GRID = (3808.0, 2.0)
+
+#: First wavelength and step of the observed and template FISA grids.
+FISA_GRID = (3800.44995, 1.0)
+FISA_TEMPLATE_GRID = (3000.0, 2.0)
+
+FISA_HEADER = """\
+ #---------------------------HEADER------------------------------
+ # SPECTRUM ANALYZED WITH FISA v. 0.92
+ # Date 04/01/2022; time 21:46:19
+ # Reddening:  0.280868769
+ # Adopted Templated:/home/fisa/templates/{template}.dat
+ # Normalization Point:   5299.45020
+ # Format: Index 0 = Unreddened spectrum
+ #         Index 1 = Template spectrum
+ #         Index 2 = Observed spectrum
+ #         Index 3 = Residual flux
+ #---------------------------------------------------------------
+"""
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _continuum(wavelength, rng):
+    """Return a smooth normalized continuum with absorption-like wiggles."""
+    x = (wavelength - wavelength[0]) / 500.0
+    wiggles = 0.05 * np.sin(7.0 * x) + 0.03 * np.sin(23.0 * x + rng.random())
+    return 0.8 + 0.2 * np.tanh(x - 1.0) + wiggles
+
+
+def _set_header_values(lines, values):
+    """Replace the values of the header lines whose tag is in 'values'."""
+    updated = []
+    for line in lines:
+        match = re.match(r"(?P<values>[^\[]*)\[(?P<tag>[^\]]*)\]", line)
+        tag = match and match["tag"].split()[0]
+        if tag in values:
+            width = len(match["values"])
+            line = f"{values[tag]:<{width}}" + line[width:]
+        updated.append(line)
+    return updated
+
+
+def _ssp_table(n_base, rng):
+    """Return the rows of the 'synthetic_results' table."""
+    n_ages = -(-n_base // len(STARLIGHT_Z))
+    ages = np.geomspace(1e6, 1.3e10, n_ages)
+
+    x_j = np.zeros(n_base)
+    active = rng.choice(
+        n_base, min(n_base, STARLIGHT_ACTIVE_SSPS), replace=False
+    )
+    x_j[active] = rng.dirichlet(np.ones(len(active))) * 95.0
+    x_j += rng.random(n_base) * 5.0 / n_base
+    mini_j = x_j * rng.uniform(0.001, 1.0, n_base)
+    mini_j *= 100.0 / mini_j.sum()
+    mcor_j = mini_j * rng.uniform(1.0, 1.5, n_base)
+    mcor_j *= 100.0 / mcor_j.sum()
+
+    rows = []
+    for j in range(n_base):
+        age, z = ages[j % n_ages], STARLIGHT_Z[j // n_ages]
+        rows.append(
+            f"{j + 1:>3}   {x_j[j]:>9.4f}     {mini_j[j]:.4E}    "
+            f"{mcor_j[j]:.4E}    {age:.6E}  {z:.5f}  "
+            f"{1e-2 / (1 + j % n_ages):.3E}    0   "
+            f"{1.0 - 0.5 * (j % n_ages) / n_ages:.4f}   "
+            f"age{j % n_ages:03d}_m{j // n_ages:02d}            0.0000     "
+            f"{rng.uniform(1, 40):.4E}   {rng.uniform(2, 14):>8.4f}   "
+            f"{rng.uniform(0, 4):.4f}   {rng.uniform(70, 120):>8.4f}"
+        )
+    return rows, x_j, mini_j
+
+
+def _chains_table(values, n_chains, rng):
+    """Return the rows of a chains table ('min', '<>' and each chain)."""
+    chains = np.abs(values[:, None] + rng.normal(0, 0.5, (len(values), 1)))
+    chains = chains * rng.uniform(0.8, 1.2, (len(values), n_chains))
+    return [
+        f"{j + 1:>3}   "
+        + "  ".join(
+            f"{v:>10.4f}" for v in (values[j], chains[j].mean(), *chains[j])
+        )
+        for j in range(len(values))
+    ]
+
+
+def write_starlight(
+    path, *, n_base=69, n_pixels=1524, n_chains=7, seed=0, source=SOURCE
+):
+    """
+    Write a synthetic Starlight output file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Where to write the file.
+    n_base : int, optional
+        Number of SSPs of the base (rows of the results and chains tables).
+    n_pixels : int, optional
+        Number of pixels of the synthetic spectrum.
+    n_chains : int, optional
+        Number of Markov chains (columns of the chains tables).
+    seed : int, optional
+        Seed of the random values.
+    source : path-like, optional
+        Starlight file whose header is copied.
+
+    Returns
+    -------
+    pathlib.Path
+        The path of the file.
+    """
+    path = pathlib.Path(path)
+    rng = np.random.default_rng(seed)
+
+    lines = source.read_text().splitlines()
+    title = next(i for i, line in enumerate(lines) if line.startswith("# j"))
+    l_ini, step = STARLIGHT_GRID
+    header = _set_header_values(
+        lines[:title],
+        {
+            "N_base": n_base,
+            "N_chains": n_chains,
+            "NEX0s_base": n_base,
+            "l_ini": f"{l_ini:.2f}",
+            "l_fin": f"{l_ini + step * (n_pixels - 1):.2f}",
+            "dl": f"{step:.2f}",
+            "NOl_eff": n_pixels,
+            "Nl_eff": n_pixels,
+        },
+    )
+
+    ssp_rows, x_j, mini_j = _ssp_table(n_base, rng)
+    solutions = 2 + n_chains
+    lines = [
+        *header,
+        lines[title],
+        *ssp_rows,
+        "",
+        "",
+        "## Synthesis Results - Average & Chains ##",
+        "",
+        f"# j      x_j: min, <> & last-chain-values for 1 ...  "
+        f"{n_chains} chains",
+        *_chains_table(x_j, n_chains, rng),
+        "",
+        f"# j      m_j: min, <> & last-chain-values for 1 ...  "
+        f"{n_chains} chains",
+        *_chains_table(mini_j, n_chains, rng),
+        "",
+        f"# AV, chi2 & Mass for <> & i_chain = 1 ...  {n_chains} solutions",
+        "AV   "
+        + "  ".join(f"{v:.4f}" for v in rng.uniform(0.7, 0.8, solutions)),
+        "chi2 "
+        + "  ".join(f"{v:.4E}" for v in rng.uniform(1.2, 1.3, solutions)),
+        "Mass "
+        + "  ".join(f"{v:.4E}" for v in rng.uniform(9e3, 1e4, solutions)),
+        " 164.96                                  "
+        "[v0_min (km/s) before EX0s...]",
+        " 330.07                                  "
+        "[vd_min (km/s) before EX0s...]",
+        "",
+        "",
+        "## Synthetic spectrum (Best Model) ##l_obs f_obs f_syn wei",
+        f" {n_pixels}    [Nl_obs]",
+    ]
+
+    l_obs = l_ini + step * np.arange(n_pixels)
+    f_syn = _continuum(l_obs, rng)
+    f_obs = f_syn + rng.normal(0.0, 0.02, n_pixels)
+    weights = np.where(rng.random(n_pixels) < 0.1, -1.0, 36.115)
+
+    with open(path, "w") as fp:
+        fp.write("\n".join(lines) + "\n")
+        np.savetxt(
+            fp,
+            np.column_stack([l_obs, f_obs, f_syn, weights]),
+            fmt=" %.2f    %.5f   %.5f   %.3f",
+        )
+    return path
+
+
+def write_fisa(path, *, n_pixels=3000, template="G2", seed=0):
+    """
+    Write a synthetic FISA output file.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Where to write the file.
+    n_pixels : int, optional
+        Number of pixels of each of the four spectra.
+    template : str, optional
+        Name of the adopted template (a key of the default maps, e.g. "G2").
+    seed : int, optional
+        Seed of the random values.
+
+    Returns
+    -------
+    pathlib.Path
+        The path of the file.
+    """
+    path = pathlib.Path(path)
+    rng = np.random.default_rng(seed)
+
+    start, step = FISA_GRID
+    wavelength = start + step * np.arange(n_pixels)
+    start, step = FISA_TEMPLATE_GRID
+    template_wavelength = start + step * np.arange(n_pixels)
+
+    unreddened = _continuum(wavelength, rng)
+    observed = unreddened + rng.normal(0.0, 0.02, n_pixels)
+    blocks = (
+        (wavelength, unreddened),
+        (template_wavelength, _continuum(template_wavelength, rng)),
+        (wavelength, observed),
+        (wavelength, observed - unreddened),
+    )
+
+    with open(path, "w") as fp:
+        fp.write(FISA_HEADER.format(template=template))
+        for i, (x, y) in enumerate(blocks):
+            if i:
+                fp.write("\n\n")
+            np.savetxt(fp, np.column_stack([x, y]), fmt="   %.5f      %.9E")
+    return path
+
+
+def main(argv=None):
+    """Write one synthetic file from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("kind", choices=["starlight", "fisa"])
+    parser.add_argument("path", type=pathlib.Path)
+    parser.add_argument("--pixels", type=int, default=None)
+    parser.add_argument("--base", type=int, default=69, help="Starlight")
+    parser.add_argument("--chains", type=int, default=7, help="Starlight")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.kind == "starlight":
+        path = write_starlight(
+            args.path,
+            n_base=args.base,
+            n_pixels=args.pixels or 1524,
+            n_chains=args.chains,
+            seed=args.seed,
+        )
+    else:
+        path = write_fisa(
+            args.path, n_pixels=args.pixels or 3000, seed=args.seed
+        )
+    print(f"{path} ({path.stat().st_size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
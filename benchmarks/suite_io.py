@@ -0,0 +1,156 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""asv benchmarks of the Starlight and FISA readers.
+
+The input files are written once per class by 'setup_cache' (see
+'generators'), with every size given by the parameters.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import warnings
+
+from spyctral.io import fisa, starlight
+from spyctral.utils import buffers
+
+from . import generators
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+PIXELS = [1_000, 100_000, 1_000_000]
+
+N_BASE = [69, 500, 2_000]
+
+N_CHAINS = [7, 100]
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+class ReadStarlight:
+    """'read_starlight' with the number of pixels of the spectrum."""
+
+    params = (PIXELS, [False, True])
+    param_names = ["n_pixels", "lazy"]
+    timeout = 600
+
+    def setup_cache(self):
+        return {
+            n_pixels: str(
+                generators.write_starlight(
+                    f"starlight_{n_pixels}.out", n_pixels=n_pixels
+                ).resolve()
+            )
+            for n_pixels in PIXELS
+        }
+
+    def setup(self, paths, n_pixels, lazy):
+        warnings.simplefilter("ignore")
+
+    def time_read_starlight(self, paths, n_pixels, lazy):
+        starlight.read_starlight(paths[n_pixels], lazy=lazy)
+
+    def peakmem_read_starlight(self, paths, n_pixels, lazy):
+        starlight.read_starlight(paths[n_pixels], lazy=lazy)
+
+
+class ReadStarlightBase:
+    """'read_starlight' with the number of SSPs and of chains."""
+
+    params = (N_BASE, N_CHAINS)
+    param_names = ["n_base", "n_chains"]
+    timeout = 300
+
+    def setup_cache(self):
+        return {
+            (n_base, n_chains): str(
+                generators.write_starlight(
+                    f"starlight_{n_base}_{n_chains}.out",
+                    n_base=n_base,
+                    n_chains=n_chains,
+                ).resolve()
+            )
+            for n_base in N_BASE
+            for n_chains in N_CHAINS
+        }
+
+    def setup(self, paths, n_base, n_chains):
+        warnings.simplefilter("ignore")
+
+    def time_read_starlight(self, paths, n_base, n_chains):
+        starlight.read_starlight(paths[n_base, n_chains])
+
+
+class ProcesHeader:
+    """'_proces_header' on the header lines of a Starlight file."""
+
+    def setup(self):
+        path = generators.SOURCE
+        with buffers.open_mapped(path) as buffer:
+            self.header_lines, _, _ = starlight._split_starlight(buffer)
+
+    def time_proces_header(self):
+        starlight._proces_header(self.header_lines)
+
+
+class GetSSPContributions:
+    """'_get_ssp_contributions' with the number of SSPs."""
+
+    params = N_BASE
+    param_names = ["n_base"]
+
+    def setup_cache(self):
+        return {
+            n_base: str(
+                generators.write_starlight(
+                    f"starlight_{n_base}.out", n_base=n_base
+                ).resolve()
+            )
+            for n_base in N_BASE
+        }
+
+    def setup(self, paths, n_base):
+        warnings.simplefilter("ignore")
+        summary = starlight.read_starlight(paths[n_base], lazy=True)
+        self.tables = {"synthetic_results": summary.data.synthetic_results}
+
+    def time_get_ssp_contributions(self, paths, n_base):
+        starlight._get_ssp_contributions(self.tables, 5)
+
+
+class ReadFisa:
+    """'read_fisa' with the number of pixels of each spectrum."""
+
+    params = PIXELS
+    param_names = ["n_pixels"]
+    timeout = 600
+
+    def setup_cache(self):
+        return {
+            n_pixels: str(
+                generators.write_fisa(
+                    f"fisa_{n_pixels}.fisa", n_pixels=n_pixels
+                ).resolve()
+            )
+            for n_pixels in PIXELS
+        }
+
+    def setup(self, paths, n_pixels):
+        warnings.simplefilter("ignore")
+
+    def time_read_fisa(self, paths, n_pixels):
+        fisa.read_fisa(paths[n_pixels])
+
+    def peakmem_read_fisa(self, paths, n_pixels):
+        fisa.read_fisa(paths[n_pixels])
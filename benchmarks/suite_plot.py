@@ -0,0 +1,62 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""asv benchmarks of each SpectralPlotter mode.
+
+Each run draws a new figure on the Agg backend, so the time includes the
+rendering, and closes it.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import warnings
+
+import matplotlib.pyplot as plt
+
+from .suite_summary import KINDS, PIXELS, read, write_inputs
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MODES = ["all_spectra", "single", "split", "subplots"]
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+class PlotModes:
+    """'SpectralPlotter' modes with the number of pixels of the spectra."""
+
+    params = (KINDS, PIXELS, MODES)
+    param_names = ["kind", "n_pixels", "mode"]
+
+    def setup_cache(self):
+        return write_inputs()
+
+    def setup(self, paths, kind, n_pixels, mode):
+        warnings.simplefilter("ignore")
+        plt.switch_backend("Agg")
+        self.summary = read(paths[kind, n_pixels], kind)
+        self.kwargs = {}
+        if mode == "single":
+            self.kwargs["spectrum_name"] = next(iter(self.summary.spectra))
+
+    def teardown(self, paths, kind, n_pixels, mode):
+        plt.close("all")
+
+    def time_plot(self, paths, kind, n_pixels, mode):
+        if mode != "subplots":  # the other modes draw on the current axes
+            plt.figure()
+        self.summary.plot(mode, **self.kwargs)
+        figure = plt.gcf()
+        figure.canvas.draw()
+        plt.close(figure)
@@ -0,0 +1,133 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""asv benchmarks of the SpectralSummary properties and of its memory."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import gc
+import tracemalloc
+import warnings
+
+from spyctral.io import fisa, starlight
+
+from . import generators
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+KINDS = ["starlight", "fisa"]
+
+PIXELS = [3_000, 100_000]
+
+#: Summaries kept alive to measure the memory retained by each one.
+RETAINED_READS = 20
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def write_inputs():
+    """Write a Starlight and a FISA file of each size in 'PIXELS'."""
+    paths = {}
+    for n_pixels in PIXELS:
+        paths["starlight", n_pixels] = generators.write_starlight(
+            f"starlight_{n_pixels}.out", n_pixels=n_pixels
+        )
+        paths["fisa", n_pixels] = generators.write_fisa(
+            f"fisa_{n_pixels}.fisa", n_pixels=n_pixels
+        )
+    return {key: str(path.resolve()) for key, path in paths.items()}
+
+
+def read(path, kind):
+    """Read a file with the reader of its kind."""
+    reader = (
+        starlight.read_starlight if kind == "starlight" else fisa.read_fisa
+    )
+    return reader(path)
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+
+class SummaryProperties:
+    """Properties and methods of a summary."""
+
+    params = (KINDS, PIXELS)
+    param_names = ["kind", "n_pixels"]
+
+    def setup_cache(self):
+        return write_inputs()
+
+    def setup(self, paths, kind, n_pixels):
+        warnings.simplefilter("ignore")
+        self.summary = read(paths[kind, n_pixels], kind)
+
+    def time_feh_ratio(self, paths, kind, n_pixels):
+        self.summary.feh_ratio
+
+    def time_get_all_properties(self, paths, kind, n_pixels):
+        self.summary.get_all_properties
+
+    def time_header_info_df(self, paths, kind, n_pixels):
+        self.summary.header_info_df
+
+    def time_repr(self, paths, kind, n_pixels):
+        repr(self.summary)
+
+    def time_compact(self, paths, kind, n_pixels):
+        self.summary.compact()
+
+    def time_footprint(self, paths, kind, n_pixels):
+        self.summary.footprint()
+
+
+class SummaryMemory:
+    """Memory held by the summaries."""
+
+    params = (KINDS, PIXELS)
+    param_names = ["kind", "n_pixels"]
+    unit = "bytes"
+
+    def setup_cache(self):
+        return write_inputs()
+
+    def setup(self, paths, kind, n_pixels):
+        warnings.simplefilter("ignore")
+
+    def track_footprint(self, paths, kind, n_pixels):
+        summary = read(paths[kind, n_pixels], kind)
+        return int(summary.footprint().loc["total", "total_bytes"])
+
+    def track_footprint_compact(self, paths, kind, n_pixels):
+        summary = read(paths[kind, n_pixels], kind).compact()
+        return int(summary.footprint().loc["total", "total_bytes"])
+
+    def track_retained(self, paths, kind, n_pixels):
+        # bytes still allocated per summary while all of them are alive
+        path = paths[kind, n_pixels]
+        read(path, kind)  # the first read loads modules and caches
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            summaries = [read(path, kind) for _ in range(RETAINED_READS)]
+            gc.collect()
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        del summaries
+        return retained // RETAINED_READS
@@ -26,19 +26,79 @@ __version__ = "0.0.1"
 # IMPORTS
 # =============================================================================
 
-from .core.core import SpectralSummary
-from .core.plot import SpectralPlotter
-from .io import fisa
-from .io import starlight
-from .io.fisa import read_fisa
-from .io.starlight import read_starlight
+import importlib
+
+# =============================================================================
+# LAZY ATTRIBUTES
+# =============================================================================
+
+# The public objects are imported the first time they are accessed
+# (PEP 562), so 'import spyctral' does not load pandas, astropy, specutils
+# nor matplotlib. Each name maps to its module and, for objects, the name
+# inside it.
+_LAZY_ATTRIBUTES = {
+    "core": (".core", None),
+    "io": (".io", None),
+    "utils": (".utils", None),
+    "SpectralCollection": (".core.collection", "SpectralCollection"),
+    "SpectralSummary": (".core.core", "SpectralSummary"),
+    "SpectralPlotter": (".core.plot", "SpectralPlotter"),
+    "cache": (".cache", None),
+    "profiling": (".profiling", None),
+    "instrument": (".profiling", "instrument"),
+    "fisa": (".io.fisa", None),
+    "starlight": (".io.starlight", None),
+    "iter_fisa_blocks": (".io.fisa", "iter_fisa_blocks"),
+    "read_fisa": (".io.fisa", "read_fisa"),
+    "resolve_fisa_templates": (".io.fisa", "resolve_fisa_templates"),
+    "scan_fisa_headers": (".io.fisa", "scan_fisa_headers"),
+    "read_starlight": (".io.starlight", "read_starlight"),
+    "read_starlight_many": (".io.starlight", "read_starlight_many"),
+    "scan_starlight_headers": (".io.starlight", "scan_starlight_headers"),
+    "summarize_starlight_chains": (
+        ".io.starlight",
+        "summarize_starlight_chains",
+    ),
+    "sweep_starlight": (".io.starlight", "sweep_starlight"),
+}
+
+
+def __getattr__(name):
+    """Imports the public objects on first access (PEP 562)."""
+    try:
+        module_name, attr = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value  # the next accesses do not go through here
+    return value
+
+
+def __dir__():
+    """Lists the attributes of the package, including the lazy ones."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 
 __all__ = [
+    "SpectralCollection",
     "SpectralSummary",
+    "cache",
+    "profiling",
+    "instrument",
     "fisa",
     "starlight",
+    "iter_fisa_blocks",
     "read_fisa",
+    "resolve_fisa_templates",
+    "scan_fisa_headers",
     "read_starlight",
+    "read_starlight_many",
+    "scan_starlight_headers",
+    "summarize_starlight_chains",
+    "sweep_starlight",
     "SpectralPlotter",
 ]
@@ -0,0 +1,746 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Opt-in caches of the results of the Spyctral readers.
+
+Once enabled, 'read_starlight' and 'read_fisa' store every summary read
+from a file as a binary snapshot (see 'spyctral.io.snapshot') and load it
+back instead of parsing the file again::
+
+    >>> import spyctral
+    >>> spyctral.cache.enable("~/.cache/spyctral", max_bytes=2**30)
+
+Each entry is keyed by the identity of the file (its resolved path, size
+and modification time, or a hash of its content), the reader and its
+keyword arguments. Entries are written to a temporary directory and
+renamed into place, so several processes can share the same cache; the
+least recently used entries are removed when the cache grows beyond
+'max_bytes'. Lazy reads ('lazy=True') are not stored on disk, as storing
+them would parse their tables.
+
+The in-memory cache keeps the summaries read in this process, for
+interactive sessions that read the same files again and again::
+
+    >>> spyctral.cache.enable_memory(max_entries=64, max_bytes=2**28)
+
+It is looked up before the on-disk cache. Every call returns its own copy
+of the summary, so changing the result of one call does not change the
+results of the others.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import collections
+import copy
+import datetime as dt
+import errno
+import functools
+import hashlib
+import inspect
+import json
+import numbers
+import os
+import pathlib
+import shutil
+import threading
+import uuid
+
+import attrs
+
+from . import __version__
+from .utils.bunch import Lazy
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Name of the snapshot inside each entry of the cache.
+CACHE_SNAPSHOT_NAME = "summary.snap"
+
+#: Bytes hashed at a time when the cache hashes the content of the files.
+CACHE_HASH_CHUNK_SIZE = 1 << 20
+
+# Prefix of the entries that are being written or removed.
+_TMP_PREFIX = ".tmp-"
+
+# Cache used by the readers, if any (see 'enable').
+_CACHE = None
+
+# In-memory cache used by the readers, if any (see 'enable_memory').
+_MEMORY = None
+
+# Values shared by the copies of a summary instead of being copied.
+_IMMUTABLE = (
+    type(None),
+    numbers.Number,
+    str,
+    bytes,
+    tuple,
+    frozenset,
+    dt.date,
+)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _file_signature(path):
+    """Size and modification time of a file, which change with it."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _nbytes(value):
+    """
+    Estimates the bytes held by the arrays of a value of a summary.
+
+    Values not computed yet (see 'Lazy') and values without arrays count
+    as zero.
+
+    Parameters
+    ----------
+    value : object
+        A table, spectrum, DataFrame, array or any other value.
+
+    Returns
+    -------
+    int
+        The estimated size in bytes.
+    """
+    if isinstance(value, Lazy):
+        return 0
+    if hasattr(value, "memory_usage"):  # pandas.DataFrame
+        return int(value.memory_usage(index=True).sum())
+    if hasattr(value, "itercols"):  # astropy.table.Table
+        arrays = list(value.itercols())
+    elif hasattr(value, "spectral_axis"):  # specutils.Spectrum1D
+        arrays = [value.flux, value.spectral_axis]
+    else:
+        arrays = [value]
+
+    # arrays shared by several columns or spectra are counted once
+    buffers = {}
+    for array in arrays:
+        interface = getattr(array, "__array_interface__", None)
+        if interface is not None:
+            buffers[interface["data"][0]] = array.nbytes
+    return sum(buffers.values())
+
+
+def _detach(bunch, copy_item):
+    """
+    Builds the content of a Bunch for a copy of a cached summary.
+
+    Immutable values are shared, small containers are copied at once and
+    the other values (tables, spectra, arrays, ...) are copied the first
+    time they are accessed.
+
+    Parameters
+    ----------
+    bunch : Bunch
+        Bunch of the cached summary.
+    copy_item : callable
+        Function 'copy_item(bunch, key)' that returns a copy of a value.
+
+    Returns
+    -------
+    dict
+        Content of the new Bunch.
+    """
+    data = {}
+    for key, value in bunch._data.items():
+        if isinstance(value, _IMMUTABLE):
+            data[key] = value
+        elif isinstance(value, (dict, list, set)):
+            data[key] = copy.deepcopy(value)
+        else:
+            data[key] = Lazy(functools.partial(copy_item, bunch, key))
+    return data
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attrs.define
+class DiskCache:
+    """
+    Directory with the snapshots of the summaries read from files.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Directory of the cache.
+    max_bytes : int or None
+        Maximum size of the cache. None means unbounded.
+    hash_content : bool
+        If True, files are identified by a hash of their content; if False,
+        by their resolved path, size and modification time.
+    hits, misses : int
+        Lookups of this process found and not found in the cache.
+    nbytes : int or None
+        Estimated size of the cache: its size when it was last listed plus
+        the entries stored since then by this process. None until the
+        cache is first listed.
+    """
+
+    path: pathlib.Path = attrs.field(
+        converter=lambda v: pathlib.Path(v).expanduser()
+    )
+    max_bytes: int = attrs.field(default=None)
+    hash_content: bool = attrs.field(default=False, converter=bool)
+    hits: int = attrs.field(default=0, init=False)
+    misses: int = attrs.field(default=0, init=False)
+    nbytes: int = attrs.field(default=None, init=False)
+
+    def __attrs_post_init__(self):
+        """Creates the directory of the cache."""
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _file_id(self, path):
+        """Identity of a file, as stored in the key of its entries."""
+        if not self.hash_content:
+            stat = os.stat(path)
+            return [os.path.realpath(path), stat.st_size, stat.st_mtime_ns]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as fp:
+            while chunk := fp.read(CACHE_HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key(self, reader, path, kwargs):
+        """
+        Computes the key of the entry of a file read by a reader.
+
+        Parameters
+        ----------
+        reader : str
+            Name of the reader.
+        path : str or path-like
+            Path of the file.
+        kwargs : dict
+            Keyword arguments of the reader.
+
+        Returns
+        -------
+        str
+            Hexadecimal digest.
+        """
+        payload = json.dumps(
+            [__version__, reader, self._file_id(path), kwargs],
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def load(self, key):
+        """
+        Loads the summary of an entry.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+
+        Returns
+        -------
+        core.SpectralSummary or None
+            The summary, or None if the entry does not exist (or was
+            removed while it was being read).
+        """
+        from .io import snapshot
+
+        entry = self.path / key
+        try:
+            summary = snapshot.load_snapshot(entry / CACHE_SNAPSHOT_NAME)
+            os.utime(entry)  # most recently used
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return summary
+
+    def store(self, key, summary):
+        """
+        Stores a summary as an entry, then evicts the least recently used
+        entries if the cache is too big.
+
+        The snapshot is written to a temporary directory that is renamed
+        to the entry, so other processes never see a partial entry. If the
+        entry already exists (written by another process), it is kept.
+
+        The size of the cache is estimated by adding the size of the new
+        entry to 'nbytes', and the entries are listed to evict the least
+        recently used ones only when the estimate exceeds 'max_bytes'. The
+        entries stored by other processes are taken into account the next
+        time the cache is listed.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        summary : core.SpectralSummary
+            The summary to store.
+        """
+        from .io import snapshot
+
+        tmp = self.path / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+        tmp.mkdir()
+        try:
+            snapshot.save_snapshot(summary, tmp / CACHE_SNAPSHOT_NAME)
+            size = sum(f.stat().st_size for f in tmp.iterdir())
+            try:
+                os.rename(tmp, self.path / key)
+            except OSError as err:
+                if err.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                    raise
+                # already stored by another process
+                shutil.rmtree(tmp, ignore_errors=True)
+                return
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        if self.max_bytes is None:
+            return
+        if self.nbytes is None:
+            self.evict(self.max_bytes)
+        else:
+            self.nbytes += size
+            if self.nbytes > self.max_bytes:
+                self.evict(self.max_bytes)
+
+    def entries(self):
+        """
+        Lists the entries of the cache.
+
+        Returns
+        -------
+        list of tuple
+            Tuples ('key', 'last_used', 'size'), from the least to the most
+            recently used.
+        """
+        entries = []
+        for entry in self.path.iterdir():
+            if entry.name.startswith(_TMP_PREFIX):
+                continue
+            try:
+                last_used = entry.stat().st_mtime_ns
+                size = sum(f.stat().st_size for f in entry.iterdir())
+            except OSError:  # removed by another process
+                continue
+            entries.append((entry.name, last_used, size))
+        return sorted(entries, key=lambda entry: entry[1])
+
+    def evict(self, max_bytes):
+        """
+        Removes the least recently used entries until the cache takes at
+        most 'max_bytes', and updates 'nbytes'.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Size to reach.
+        """
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= max_bytes:
+                break
+            self._remove(key)
+            total -= size
+        self.nbytes = total
+
+    def _remove(self, key):
+        """Removes an entry, renaming it first so it disappears at once."""
+        trash = self.path / f"{_TMP_PREFIX}{uuid.uuid4().hex}"
+        try:
+            os.rename(self.path / key, trash)
+        except OSError:  # removed by another process
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def clear(self):
+        """Removes all the entries of the cache."""
+        for key, _, _ in self.entries():
+            self._remove(key)
+        self.nbytes = 0
+
+
+@attrs.define
+class _MemoryEntry:
+    """Summary held by a MemoryCache and the signature of its file."""
+
+    signature: tuple
+    summary: object
+    nbytes: int
+
+
+@attrs.define
+class MemoryCache:
+    """
+    In-memory cache of the summaries read from files, with least recently
+    used eviction.
+
+    An entry is dropped when the size or the modification time of its file
+    changes. The cached summaries are never returned: every lookup returns
+    a copy whose tables, spectra and arrays are copied when first accessed.
+
+    Attributes
+    ----------
+    max_entries : int or None
+        Maximum number of entries. None means unbounded.
+    max_bytes : int or None
+        Maximum estimated size of the arrays held by the entries. None
+        means unbounded.
+    hits, misses : int
+        Lookups found and not found in the cache.
+    evictions : int
+        Entries removed to keep the cache within its limits.
+    invalidations : int
+        Entries dropped because their file changed.
+    nbytes : int
+        Estimated size of the arrays held by the entries.
+    """
+
+    max_entries: int = attrs.field(default=128)
+    max_bytes: int = attrs.field(default=None)
+    hits: int = attrs.field(default=0, init=False)
+    misses: int = attrs.field(default=0, init=False)
+    evictions: int = attrs.field(default=0, init=False)
+    invalidations: int = attrs.field(default=0, init=False)
+    nbytes: int = attrs.field(default=0, init=False)
+    _entries: collections.OrderedDict = attrs.field(
+        factory=collections.OrderedDict, init=False, repr=False
+    )
+    _lock: threading.RLock = attrs.field(
+        factory=threading.RLock, init=False, repr=False
+    )
+
+    def __len__(self):
+        """len(x) <==> x.__len__()."""
+        return len(self._entries)
+
+    def key(self, reader, path, kwargs):
+        """
+        Computes the key of the entry of a file read by a reader.
+
+        Parameters
+        ----------
+        reader : str
+            Name of the reader.
+        path : str or path-like
+            Path of the file.
+        kwargs : dict
+            Keyword arguments of the reader.
+
+        Returns
+        -------
+        tuple
+            The key: the reader, the resolved path and the arguments.
+        """
+        payload = json.dumps(kwargs, sort_keys=True, default=repr)
+        return reader, os.path.realpath(path), payload
+
+    def get(self, key, signature):
+        """
+        Looks up the summary of an entry.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the entry.
+        signature : tuple
+            Current size and modification time of the file. An entry
+            stored with another signature is dropped.
+
+        Returns
+        -------
+        core.SpectralSummary or None
+            A copy of the summary, or None if there is no valid entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature != signature:
+                self._pop(key)
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._copy_summary(key, entry)
+
+    def put(self, key, signature, summary):
+        """
+        Stores a summary, then evicts the least recently used entries if
+        the cache exceeds its limits.
+
+        Parameters
+        ----------
+        key : tuple
+            Key of the entry.
+        signature : tuple
+            Size and modification time of the file when it was read.
+        summary : core.SpectralSummary
+            The summary. It must not be used afterwards, use the returned
+            copy instead.
+
+        Returns
+        -------
+        core.SpectralSummary
+            A copy of the summary.
+        """
+        nbytes = sum(
+            _nbytes(value)
+            for bunch in (summary.data, summary.spectra, summary.extra_info)
+            for value in bunch._data.values()
+        )
+        entry = _MemoryEntry(signature, summary, nbytes)
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = entry
+            self.nbytes += nbytes
+            self._evict()
+        return self._copy_summary(key, entry)
+
+    def stats(self):
+        """
+        Returns the statistics of the cache.
+
+        Returns
+        -------
+        dict
+            Counts of hits, misses, evictions and invalidations, number of
+            entries and estimated size in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "nbytes": self.nbytes,
+            }
+
+    def clear(self):
+        """Removes all the entries of the cache."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _pop(self, key):
+        """Removes an entry. The lock must be held."""
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.nbytes
+
+    def _evict(self):
+        """Removes the least recently used entries over the limits."""
+        while self._entries and (
+            (self.max_entries is not None and len(self) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _copy_summary(self, key, entry):
+        """Copy of the summary of an entry (see '_detach')."""
+        summary = entry.summary
+        copy_item = functools.partial(self._copy_item, key, entry)
+        return attrs.evolve(
+            summary,
+            header=_detach(summary.header, copy_item),
+            data=_detach(summary.data, copy_item),
+            spectra=_detach(summary.spectra, copy_item),
+            extra_info=_detach(summary.extra_info, copy_item),
+        )
+
+    def _copy_item(self, key, entry, bunch, name):
+        """
+        Copies a value of a cached summary. If the value was not computed
+        yet, it is computed once for all the copies and the size of the
+        entry grows.
+        """
+        with self._lock:
+            pending = isinstance(bunch._data[name], Lazy)
+            value = bunch[name]
+            if pending and self._entries.get(key) is entry:
+                nbytes = _nbytes(value)
+                entry.nbytes += nbytes
+                self.nbytes += nbytes
+                self._evict()
+        return copy.deepcopy(value)
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+def enable(path, max_bytes=None, *, hash_content=False):
+    """
+    Enables the on-disk cache of the readers.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Directory of the cache. It is created if it does not exist and can
+        be shared by several processes.
+    max_bytes : int, optional
+        Maximum size of the cache. The least recently used entries are
+        removed when it is exceeded. Default: unbounded.
+    hash_content : bool, optional
+        If True, files are identified by a hash of their content, which
+        is safe against files rewritten without changing their size and
+        modification time but reads each file once per lookup. Default:
+        False (resolved path, size and modification time).
+
+    Returns
+    -------
+    DiskCache
+        The enabled cache.
+    """
+    global _CACHE
+    _CACHE = DiskCache(path, max_bytes=max_bytes, hash_content=hash_content)
+    return _CACHE
+
+
+def disable():
+    """Disables the on-disk cache of the readers. The entries are kept."""
+    global _CACHE
+    _CACHE = None
+
+
+def get_cache():
+    """
+    Returns the enabled cache.
+
+    Returns
+    -------
+    DiskCache or None
+        The cache used by the readers, or None if it is disabled.
+    """
+    return _CACHE
+
+
+def enable_memory(max_entries=128, max_bytes=None):
+    """
+    Enables the in-memory cache of the readers.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of summaries kept. Default: 128.
+    max_bytes : int, optional
+        Maximum estimated size of the arrays of the summaries kept.
+        Default: unbounded.
+
+    Returns
+    -------
+    MemoryCache
+        The enabled cache.
+    """
+    global _MEMORY
+    _MEMORY = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+    return _MEMORY
+
+
+def disable_memory():
+    """Disables the in-memory cache of the readers and drops its entries."""
+    global _MEMORY
+    _MEMORY = None
+
+
+def get_memory_cache():
+    """
+    Returns the enabled in-memory cache.
+
+    Returns
+    -------
+    MemoryCache or None
+        The in-memory cache used by the readers, or None if it is
+        disabled.
+    """
+    return _MEMORY
+
+
+def cached_reader(reader):
+    """
+    Decorates a reader so that, while a cache is enabled, the summaries
+    of the files it reads are stored in and loaded from the caches.
+
+    The in-memory cache is looked up first, then the on-disk cache. Only
+    inputs given as paths are cached; bytes and streams are always read.
+    Storing a summary on disk computes its values not yet loaded (see
+    'Lazy'), so lazy reads ('lazy=True') skip the on-disk cache.
+
+    Parameters
+    ----------
+    reader : callable
+        Function with the signature 'reader(path_or_buffer, **kwargs)'.
+
+    Returns
+    -------
+    callable
+        The decorated reader.
+    """
+
+    signature = inspect.signature(reader)
+
+    @functools.wraps(reader)
+    def wrapper(path_or_buffer, **kwargs):
+        cache, memory = _CACHE, _MEMORY
+        if (cache is None and memory is None) or not isinstance(
+            path_or_buffer, (str, os.PathLike)
+        ):
+            return reader(path_or_buffer, **kwargs)
+
+        # the defaults are part of the key, so omitting them is a hit too
+        arguments = signature.bind(path_or_buffer, **kwargs)
+        arguments.apply_defaults()
+        arguments = dict(arguments.arguments)
+        path = arguments.pop(next(iter(signature.parameters)))
+        if arguments.get("lazy"):
+            cache = None
+
+        if memory is not None:
+            # the signature is taken before reading, so a file changed
+            # while it is read is read again on the next lookup
+            memory_key = memory.key(reader.__name__, path, arguments)
+            file_signature = _file_signature(path)
+            summary = memory.get(memory_key, file_signature)
+            if summary is not None:
+                return summary
+
+        if cache is not None:
+            key = cache.key(reader.__name__, path, arguments)
+            summary = cache.load(key)
+            if summary is None:
+                summary = reader(path_or_buffer, **kwargs)
+                cache.store(key, summary)
+        else:
+            summary = reader(path_or_buffer, **kwargs)
+
+        if memory is not None:
+            summary = memory.put(memory_key, file_signature, summary)
+        return summary
+
+    return wrapper
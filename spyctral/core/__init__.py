@@ -12,8 +12,51 @@
 # IMPORTS
 # =============================================================================
 
-from .core import SpectralSummary
-from ..io.fisa import read_fisa
-from ..io.starlight import read_starlight
+import importlib
 
-__all__ = ["SpectralSummary", "read_fisa", "read_starlight"]
+# =============================================================================
+# LAZY ATTRIBUTES
+# =============================================================================
+
+# Imported on first access (PEP 562), so importing 'spyctral.core.core'
+# does not load the readers. Each name maps to its module and, for objects,
+# the name inside it.
+_LAZY_ATTRIBUTES = {
+    "collection": (".collection", None),
+    "core": (".core", None),
+    "plot": (".plot", None),
+    "SpectralCollection": (".collection", "SpectralCollection"),
+    "SpectralSummary": (".core", "SpectralSummary"),
+    "format_properties": (".core", "format_properties"),
+    "read_fisa": ("..io.fisa", "read_fisa"),
+    "read_starlight": ("..io.starlight", "read_starlight"),
+}
+
+
+def __getattr__(name):
+    """Imports the public objects on first access (PEP 562)."""
+    try:
+        module_name, attr = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lists the attributes of the package, including the lazy ones."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+__all__ = [
+    "SpectralCollection",
+    "SpectralSummary",
+    "format_properties",
+    "read_fisa",
+    "read_starlight",
+]
@@ -0,0 +1,368 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Columnar container of many spectral summaries."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import attrs
+
+import numpy as np
+
+import pandas as pd
+
+from .core import Z_SUN, format_properties
+from ..utils import buffers
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Scalar properties of the summaries kept as float columns.
+COLLECTION_COLUMNS = (
+    "age",
+    "err_age",
+    "reddening",
+    "av_value",
+    "z_value",
+    "normalization_point",
+)
+
+# Keyword arguments of 'read_starlight_many' accepted by 'from_starlight'.
+# 'compact' is not: it returns a data frame instead of the summaries.
+STARLIGHT_READ_KWARGS = (
+    "workers",
+    "chunksize",
+    "xj_percent",
+    "age_decimals",
+    "rv",
+    "z_decimals",
+    "object_name",
+    "lazy",
+)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _object_array(values):
+    """Builds a 1D object array, without unpacking sequence values."""
+    values = list(values)
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _read_only(array):
+    """Marks an array as read-only and returns it."""
+    array.flags.writeable = False
+    return array
+
+
+def _extract_columns(summaries):
+    """
+    Extracts the scalar properties of the summaries as columns.
+
+    Parameters
+    ----------
+    summaries : numpy.ndarray
+        Object array of 'SpectralSummary'.
+
+    Returns
+    -------
+    dict
+        'obj_name' as an object array and each of 'COLLECTION_COLUMNS' as
+        a float64 array, all read-only.
+    """
+    n_summaries = len(summaries)
+    columns = {
+        "obj_name": _object_array(s.obj_name for s in summaries),
+    }
+    for name in COLLECTION_COLUMNS:
+        columns[name] = np.fromiter(
+            (getattr(s, name) for s in summaries),
+            dtype=np.float64,
+            count=n_summaries,
+        )
+    return {name: _read_only(column) for name, column in columns.items()}
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attrs.define(repr=False, eq=False)
+class SpectralCollection:
+    """
+    Many 'SpectralSummary' objects with their scalar properties stored as
+    contiguous columns.
+
+    Selections (slices, boolean masks, integer arrays), sorting and the
+    derived properties work on the columns at once, without going through
+    the summaries one by one.
+
+    Attributes
+    ----------
+    summaries : numpy.ndarray
+        Object array with the summaries.
+    paths : numpy.ndarray or None
+        Object array with the path each summary was read from, if any.
+    """
+
+    summaries: np.ndarray = attrs.field(converter=_object_array)
+    paths: np.ndarray = attrs.field(
+        default=None,
+        converter=attrs.converters.optional(_object_array),
+    )
+    _columns: dict = attrs.field(default=None, kw_only=True)
+
+    def __attrs_post_init__(self):
+        """Extracts the columns and validates the paths."""
+        if self.paths is not None and len(self.paths) != len(self.summaries):
+            raise ValueError(
+                f"Got {len(self.paths)} paths for "
+                f"{len(self.summaries)} summaries"
+            )
+        if self._columns is None:
+            self._columns = _extract_columns(self.summaries)
+
+    @classmethod
+    def from_starlight(cls, paths, **read_kwargs):
+        """
+        Reads many Starlight files into a collection.
+
+        Parameters
+        ----------
+        paths : str, path-like or iterable of them
+            A directory (all its '*.out' files), a glob expression, a
+            single file or an iterable of files.
+        **read_kwargs
+            Keyword arguments of 'read_starlight_many' listed in
+            'STARLIGHT_READ_KWARGS' (e.g. 'workers', 'xj_percent' or
+            'lazy').
+
+        Returns
+        -------
+        SpectralCollection
+            The summaries, with the paths they were read from.
+
+        Raises
+        ------
+        ValueError
+            If a keyword argument is not one of 'STARLIGHT_READ_KWARGS'.
+        """
+        from ..io import starlight
+
+        unsupported = sorted(set(read_kwargs) - set(STARLIGHT_READ_KWARGS))
+        if unsupported:
+            raise ValueError(
+                f"Unsupported keyword arguments: {', '.join(unsupported)}"
+            )
+
+        paths = buffers.resolve_paths(paths, "*.out")
+        summaries = starlight.read_starlight_many(paths, **read_kwargs)
+        return cls(summaries, paths=[str(path) for path in paths])
+
+    @classmethod
+    def from_fisa(cls, paths, **read_kwargs):
+        """
+        Reads many FISA files into a collection.
+
+        Parameters
+        ----------
+        paths : str, path-like or iterable of them
+            A directory (all its '*.fisa' files), a glob expression, a
+            single file or an iterable of files.
+        **read_kwargs
+            Keyword arguments of 'read_fisa' (e.g. 'age_map' or 'z_map').
+
+        Returns
+        -------
+        SpectralCollection
+            The summaries, with the paths they were read from.
+        """
+        from ..io import fisa
+
+        paths = buffers.resolve_paths(paths, "*.fisa")
+        summaries = [fisa.read_fisa(path, **read_kwargs) for path in paths]
+        return cls(summaries, paths=[str(path) for path in paths])
+
+    @property
+    def obj_name(self):
+        """Object names of the summaries."""
+        return self._columns["obj_name"]
+
+    @property
+    def age(self):
+        """Ages of the summaries."""
+        return self._columns["age"]
+
+    @property
+    def err_age(self):
+        """Errors of the ages of the summaries."""
+        return self._columns["err_age"]
+
+    @property
+    def reddening(self):
+        """Reddening values of the summaries."""
+        return self._columns["reddening"]
+
+    @property
+    def av_value(self):
+        """Extinction values of the summaries."""
+        return self._columns["av_value"]
+
+    @property
+    def z_value(self):
+        """Metallicities of the summaries."""
+        return self._columns["z_value"]
+
+    @property
+    def normalization_point(self):
+        """Normalization points of the summaries."""
+        return self._columns["normalization_point"]
+
+    @property
+    def feh_ratio(self):
+        """
+        Calculates the metallicity ratio [Fe/H] of all the summaries at once
+        (see 'SpectralSummary.feh_ratio').
+
+        Returns
+        -------
+        numpy.ndarray
+            Metallicity ratio [Fe/H] of each summary.
+        """
+        return np.log10(self.z_value / Z_SUN)
+
+    def __len__(self):
+        """len(x) <==> x.__len__()."""
+        return len(self.summaries)
+
+    def __iter__(self):
+        """iter(x) <==> x.__iter__()."""
+        return iter(self.summaries)
+
+    def __getitem__(self, key):
+        """
+        Selects from the collection.
+
+        Parameters
+        ----------
+        key : str, int, slice or array-like
+            Name of a column, position of a summary, or a slice, boolean
+            mask or array of positions.
+
+        Returns
+        -------
+        numpy.ndarray, SpectralSummary or SpectralCollection
+            The column, the summary or a new collection with the selected
+            summaries.
+        """
+        if isinstance(key, str):
+            if key == "feh_ratio":
+                return self.feh_ratio
+            return self._columns[key]
+        if isinstance(key, (int, np.integer)):
+            return self.summaries[key]
+        if not isinstance(key, slice):
+            key = np.asarray(key)
+        return self._take(key)
+
+    def _take(self, index):
+        """Builds a collection with the summaries selected by 'index'."""
+        columns = {
+            name: _read_only(column[index])
+            for name, column in self._columns.items()
+        }
+        return type(self)(
+            self.summaries[index],
+            paths=None if self.paths is None else self.paths[index],
+            columns=columns,
+        )
+
+    def sort_by(self, column, *, ascending=True):
+        """
+        Sorts the collection by one of its columns.
+
+        Parameters
+        ----------
+        column : str
+            Name of the column (including "feh_ratio").
+        ascending : bool, optional
+            Sort order. Default: True.
+
+        Returns
+        -------
+        SpectralCollection
+            The sorted collection. Summaries with equal values keep their
+            order.
+        """
+        values = self[column]
+        if ascending:
+            order = np.argsort(values, kind="stable")
+        else:
+            # sorting the reversed values keeps the ties in their order
+            reverse = np.argsort(values[::-1], kind="stable")[::-1]
+            order = len(values) - 1 - reverse
+        return self._take(order)
+
+    @property
+    def get_all_properties(self):
+        """
+        Creates a DataFrame with the properties of all the summaries, the
+        collection-wide version of 'SpectralSummary.get_all_properties'.
+
+        The table is built at once from the columns and keeps the numbers
+        as float64; use 'format_properties' for display.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per summary, indexed by path when the collection was
+            read from files, with one column per property: "object_name",
+            "age", "err_age", "reddening", "av_value", "z_value",
+            "feh_ratio" and "normalization_point".
+        """
+        data = {
+            "object_name": self.obj_name,
+            "age": self.age,
+            "err_age": self.err_age,
+            "reddening": self.reddening,
+            "av_value": self.av_value,
+            "z_value": self.z_value,
+            "feh_ratio": self.feh_ratio,
+            "normalization_point": self.normalization_point,
+        }
+        index = None
+        if self.paths is not None:
+            index = pd.Index(self.paths, name="path")
+        return pd.DataFrame(data, index=index)
+
+    def format_properties(self):
+        """
+        Formats the properties of the summaries for display
+        (see 'core.format_properties').
+
+        Returns
+        -------
+        pandas.DataFrame
+            'get_all_properties' with "age" and "err_age" in scientific
+            notation.
+        """
+        return format_properties(self.get_all_properties)
+
+    def __repr__(self):
+        """x.__repr__() <==> repr(x)."""
+        return f"<SpectralCollection [{len(self)} summaries]>"
@@ -25,6 +25,9 @@ from ..utils.bunch import Bunch
 #: Z sun (cite)
 Z_SUN = 0.019
 
+#: Display format of the properties shown in scientific notation.
+PROPERTY_FORMATS = {"age": "{:.2e}", "err_age": "{:.2e}"}
+
 
 # =============================================================================
 # USEFUL FUNCTIONS
@@ -53,6 +56,31 @@ def _header_to_dataframe(header):
     return df
 
 
+def format_properties(properties):
+    """
+    Formats a table of properties for display, e.g. the one returned by
+    'SpectralCollection.get_all_properties'.
+
+    The table itself keeps the numbers; only the returned copy has the
+    columns of 'PROPERTY_FORMATS' converted to text.
+
+    Parameters
+    ----------
+    properties : pandas.DataFrame
+        Table with one column per property.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Copy of the table with the formatted columns.
+    """
+    formatted = properties.copy()
+    for name, fmt in PROPERTY_FORMATS.items():
+        if name in formatted:
+            formatted[name] = [fmt.format(v) for v in formatted[name]]
+    return formatted
+
+
 # =============================================================================
 # CLASSES
 # =============================================================================
@@ -193,6 +221,99 @@ class SpectralSummary:
             f"  extra_info={{{extra_info_keys}}})>"
         )
 
+    def save(self, path):
+        """
+        Saves the summary as a binary snapshot: the arrays of its tables,
+        spectra and data frames in a container file, and the rest in a JSON
+        side-car next to it ('path' + '.json').
+
+        Parameters
+        ----------
+        path : str or path-like
+            Path of the container.
+
+        Returns
+        -------
+        pathlib.Path
+            The path of the container.
+        """
+        from ..io import snapshot
+
+        return snapshot.save_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a summary saved with 'SpectralSummary.save'.
+
+        The arrays are memory-mapped and the tables, spectra and data frames
+        are rebuilt on first access.
+
+        Parameters
+        ----------
+        path : str or path-like
+            Path of the container.
+
+        Returns
+        -------
+        SpectralSummary
+            The saved summary.
+        """
+        from ..io import snapshot
+
+        return snapshot.load_snapshot(path)
+
+    def compact(self):
+        """
+        Returns a copy of the summary in a compact memory layout.
+
+        The arrays of the tables, spectra and data frames are copied into a
+        single buffer, without duplicates, and the objects are rebuilt on
+        first access as views of it (see 'snapshot.pack_summary'). Useful
+        to hold many summaries in memory.
+
+        Returns
+        -------
+        SpectralSummary
+            The compact copy.
+        """
+        from ..io import snapshot
+
+        return snapshot.pack_summary(self)
+
+    def footprint(self):
+        """
+        Measures the memory held by the summary.
+
+        Each object is counted once, in the first part that references it
+        (in the order of the index), so arrays shared by tables and spectra
+        are not counted twice. Values not loaded yet (see 'Lazy') count
+        what they hold, not what they would build.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Table indexed by part ("header", "data", "spectra",
+            "extra_info", the rest of the summary as "summary" and
+            "total"), with the columns "objects", "object_bytes",
+            "array_bytes" and "total_bytes".
+        """
+        import astropy.units as u
+
+        from ..utils import footprint
+
+        seen, ignore = set(), (u.UnitBase,)
+        parts = {
+            name: footprint.measure(self[name], seen=seen, ignore=ignore)
+            for name in ("header", "data", "spectra", "extra_info")
+        }
+        parts["summary"] = footprint.measure(self, seen=seen, ignore=ignore)
+
+        df = pd.DataFrame.from_dict(parts, orient="index")
+        df.loc["total"] = df.sum()
+        df["total_bytes"] = df["object_bytes"] + df["array_bytes"]
+        return df
+
     @property
     def feh_ratio(self):
         """
@@ -229,26 +350,28 @@ class SpectralSummary:
         """
         Creates a DataFrame containing all relevant parameters of the instance.
         Numerical values are formatted to display in scientific notation where
-        necessary.
+        necessary (see 'PROPERTY_FORMATS').
+
+        To work with the properties of many summaries as numbers, use
+        'SpectralCollection.get_all_properties'.
 
         Returns
         -------
         pandas.DataFrame
             A DataFrame with two columns: "Property" and "Value".
         """
-        age = f"{self.age:.2e}"
-        err_age = f"{self.err_age:.2e}"
-
         properties = {
             "object_name": self.obj_name,
-            "age": age,
-            "err_age": err_age,
+            "age": self.age,
+            "err_age": self.err_age,
             "reddening": self.reddening,
             "av_value": self.av_value,
             "z_value": self.z_value,
             "feh_ratio": self.feh_ratio,
             "normalization_point": self.normalization_point,
         }
+        for name, fmt in PROPERTY_FORMATS.items():
+            properties[name] = fmt.format(properties[name])
 
         df = pd.DataFrame(
             list(properties.items()), columns=["Property", "Value"]
@@ -14,6 +14,7 @@
 # =============================================================================
 
 
+import contextlib
 import re
 
 import astropy.units as u
@@ -21,9 +22,17 @@ from astropy.table import QTable
 
 import dateutil.parser
 
+import numpy as np
+
+import pandas as pd
+
 from specutils import Spectrum1D
+from specutils.spectra.spectral_axis import SpectralAxis
+from specutils.utils.wcs_utils import gwcs_from_array
 
+from spyctral import cache, profiling
 from spyctral.core import core
+from spyctral.utils import buffers
 
 
 # =============================================================================
@@ -104,6 +113,17 @@ FISA_RX_NORMALIZATION_POINT = re.compile(
 FISA_RX_SPECTRA_NAMES = re.compile(r"Index (?P<index>\d) = (?P<value>[^\n]+)")
 
 
+# Keys of the header dictionary returned by '_process_header'.
+FISA_HEADER_KEYS = (
+    "fisa_version",
+    "date_time",
+    "reddening",
+    "adopted_template",
+    "normalization_point",
+    "spectra_names",
+)
+
+
 # =============================================================================
 # DEFAULT MAPS
 # =============================================================================
@@ -248,49 +268,120 @@ def _fisa_spectra_names(spectra, table_names):
     return renamed_spectra
 
 
-def _process_blocks(spectra_blocks, tab_names):
+def _split_fisa(buffer):
+    """
+    Collects the header lines of a FISA file and finds where its spectral
+    data starts.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the FISA file (see 'buffers.open_mapped').
+
+    Returns
+    -------
+    tuple
+        A tuple containing:
+
+        - **'header_lines'** (*list of str*): Lines starting with ' #',
+            without the surrounding spaces.
+        - **'data_start'** (*int*): Byte offset of the first spectral block.
+    """
+    header_lines = []
+    data_start = 0
+    for line in buffers.iter_lines(buffer):
+        if line.startswith(b" #"):
+            header_lines.append(line.decode().strip())
+        elif line.strip():
+            break
+        data_start += len(line)
+
+    return header_lines, data_start
+
+
+def _process_blocks(buffer, spans, tab_names):
     """
     Processes spectral data blocks extracted from a FISA file and converts them
     into structured tables with columns for wavelength and normalized flux.
 
+    All the blocks are decoded at once from the bytes of the file. The blocks
+    sampled on the wavelength grid of the first one (observed, unreddened and
+    residual spectra) keep a single wavelength array and their fluxes are
+    stored as the rows of one 2-D matrix; their tables hold views of those
+    arrays instead of copies.
+
     Parameters
     ----------
-    spectra_blocks : list of list of str
-        List of spectral blocks, where each block contains lines of
-        text-formatted data.
+    buffer : mmap.mmap or bytes
+        Content of the FISA file.
+    spans : list of tuple of int
+        Byte span of each spectral block (see 'buffers.iter_blocks').
     tab_names : tuple of str
         Tuple of strings representing the names associated with each spectrum.
 
     Returns
     -------
-    dict
-        A dictionary where keys are table names (tab_names) and values are
-        spectral tables ('QTable') with the following columns:
+    tuple
+        A tuple containing:
 
-            - **'Wavelength'** (*Quantity*): Wavelength values in Angstroms).
-            - **'Normalizated_flux'** (*float*): Normalized flux values.
+        - **'spectra_tables'** (*dict*): Keys are table names (tab_names) and
+            values are spectral tables ('QTable') with the columns
+            **'Wavelength'** (*Quantity*, in Angstroms) and
+            **'Normalizated_flux'** (*float*).
+        - **'wavelength'** (*ndarray*): Wavelength grid of the first block.
+        - **'flux_matrix'** (*ndarray*): Array of shape (n_spectra, n_pixels)
+            with the flux of every block sampled on 'wavelength'.
+        - **'matrix_names'** (*tuple of str*): Name of each row of
+            'flux_matrix'.
+
+    Raises
+    ------
+    ValueError
+        If an element of a block cannot be converted to a number.
     """
-
-    spectra = []
-
-    for block in spectra_blocks:
-        block_data = []
-        column_names = [
-            "Wavelength",
-            "Normalizated_flux",
-        ]
-        for line in block:
-            elements = list(map(float, line.strip().split()))
-            block_data.append(elements)
-
-        if column_names and block_data:
-            table = QTable(rows=block_data, names=column_names)
-            table["Wavelength"].unit = u.Angstrom
+    tab_names = tuple(tab_names)
+    spans = spans[: len(tab_names)]
+    with profiling.stage("read_fisa", "decode") as current:
+        blocks = buffers.decode_blocks(buffer, spans, names=tab_names)
+        current.count(
+            nbytes=sum(stop - start for start, stop in spans),
+            rows=sum(len(block) for block in blocks),
+        )
+    if not blocks:
+        return {}, np.empty(0), np.empty((0, 0)), ()
+
+    with profiling.stage("read_fisa", "qtable") as current:
+        wavelength = np.ascontiguousarray(blocks[0][:, 0])
+        shared = [np.array_equal(block[:, 0], wavelength) for block in blocks]
+        matrix_names = tuple(
+            name for name, in_grid in zip(tab_names, shared) if in_grid
+        )
+        flux_matrix = np.empty((len(matrix_names), len(wavelength)))
+        shared_wavelength = u.Quantity(wavelength, u.Angstrom, copy=False)
+
+        spectra = []
+        row = 0
+        for block, in_grid in zip(blocks, shared):
+            if in_grid:
+                flux_matrix[row] = block[:, 1]
+                block_wavelength, flux = shared_wavelength, flux_matrix[row]
+                row += 1
+            else:
+                block_wavelength = u.Quantity(
+                    np.ascontiguousarray(block[:, 0]), u.Angstrom, copy=False
+                )
+                flux = np.ascontiguousarray(block[:, 1])
+            table = QTable(
+                [block_wavelength, flux],
+                names=["Wavelength", "Normalizated_flux"],
+                copy=False,
+            )
             spectra.append(table)
+        current.count(rows=sum(len(table) for table in spectra))
 
     spectra_tables = _fisa_spectra_names(spectra, tab_names)
 
-    return spectra_tables
+    return spectra_tables, wavelength, flux_matrix, matrix_names
 
 
 def _get_str_template(header):
@@ -373,6 +464,10 @@ def _get_spectra(data):
     Converts the processed spectral data into a dictionary of 'Spectrum1D'
     objects, representing spectra with wavelength and flux.
 
+    The spectra are views of the tables: the fluxes are not copied, and
+    the spectra whose tables share the same wavelength array also share a
+    single spectral axis built on it, and a single WCS.
+
     Parameters
     ----------
     data : dict
@@ -386,17 +481,286 @@ def _get_spectra(data):
         'Spectrum1D' objects containing the flux and wavelength data.
     """
 
+    axes = {}
     spectra = {}
-    for key, value in data.items():
-        wavelength = value[value.colnames[0]]
-        flux = value[value.colnames[1]]
-        spectra[key] = Spectrum1D(
-            flux=flux * u.dimensionless_unscaled, spectral_axis=wavelength
-        )
+    with profiling.stage("read_fisa", "spectra") as current:
+        for key, value in data.items():
+            wavelength = value[value.colnames[0]]
+            flux = value[value.colnames[1]]
+
+            # tables built on the same wavelength array share their memory
+            grid = (
+                wavelength.value.__array_interface__["data"][0],
+                len(value),
+            )
+            if grid not in axes:
+                spectral_axis = SpectralAxis(wavelength, copy=False)
+                wcs = gwcs_from_array(spectral_axis, spectral_axis.shape)
+                axes[grid] = spectral_axis, wcs
+            spectral_axis, wcs = axes[grid]
+
+            spectra[key] = Spectrum1D(
+                flux=u.Quantity(flux, u.dimensionless_unscaled, copy=False),
+                spectral_axis=spectral_axis,
+                wcs=wcs,
+            )
+            current.count(rows=len(value))
 
     return spectra
 
 
+def _iter_block_chunks(buffer, start, stop, name, chunk_pixels):
+    """
+    Decodes a spectral block of a FISA file in windows of about
+    'chunk_pixels' lines and yields it in chunks of exactly 'chunk_pixels'
+    pixels (the last one may be shorter).
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the FISA file.
+    start, stop : int
+        Byte span of the block (see 'buffers.iter_blocks').
+    name : str
+        Name of the spectrum, used in the error message.
+    chunk_pixels : int
+        Number of pixels of each chunk.
+
+    Yields
+    ------
+    numpy.ndarray
+        Array of shape (2, n_pixels) with the wavelength and flux rows.
+    """
+    # the window size is estimated from the length of the first line
+    line_size = (buffer.find(b"\n", start, stop) + 1 or stop) - start
+    window = chunk_pixels * line_size
+
+    pending = np.empty((2, 0))
+    while start < stop:
+        end = min(start + window, stop)
+        if end < stop:
+            end = buffer.find(b"\n", end - 1, stop) + 1 or stop
+
+        columns = buffers.decode_floats(buffer, start, end, name=name)
+        if pending.shape[1]:
+            columns = np.concatenate([pending, columns], axis=1)
+
+        while columns.shape[1] >= chunk_pixels:
+            yield columns[:, :chunk_pixels]
+            columns = columns[:, chunk_pixels:]
+
+        pending, start = columns, end
+
+    if pending.shape[1]:
+        yield pending
+
+
+def iter_fisa_blocks(path_or_buffer, *, chunk_pixels=100_000):
+    """
+    Iterates over the spectral blocks of a FISA file in chunks of pixels,
+    without loading any whole block.
+
+    The file is mapped and each block is decoded one window at a time, so
+    the memory used does not grow with the size of the file. Reductions over
+    the spectra (S/N, band fluxes, resampling, ...) can be computed chunk
+    by chunk.
+
+    Parameters
+    ----------
+    path_or_buffer : str, path-like, bytes or file-like
+        The FISA file, as accepted by 'read_fisa'. Compressed files and
+        streams are decompressed into memory first (see
+        'buffers.open_mapped'); plain files are not.
+    chunk_pixels : int, optional
+        Number of pixels of each chunk. The last chunk of each block may be
+        shorter.
+        (default: 100000)
+
+    Yields
+    ------
+    tuple
+        A tuple ('spectrum_name', 'wavelength_chunk', 'flux_chunk'), with
+        the name of the spectrum as in 'SpectralSummary.data' and two
+        float64 arrays, in the order of the file.
+
+    Raises
+    ------
+    ValueError
+        If 'chunk_pixels' is not positive or an element of a block cannot
+        be converted to a number.
+    """
+    if chunk_pixels < 1:
+        raise ValueError("'chunk_pixels' must be a positive number")
+
+    with buffers.open_mapped(path_or_buffer) as buffer:
+        header_lines, data_start = _split_fisa(buffer)
+        tab_names = _process_header(header_lines)["spectra_names"]
+
+        # the blocks are searched as they are consumed; closing the search
+        # releases the map
+        spans = buffers.iter_blocks(buffer, data_start)
+        with contextlib.closing(spans):
+            for name, (start, stop) in zip(tab_names, spans):
+                for wavelength, flux in _iter_block_chunks(
+                    buffer, start, stop, name, chunk_pixels
+                ):
+                    yield name, wavelength, flux
+
+
+def resolve_fisa_templates(
+    templates,
+    *,
+    age_map=None,
+    error_age_map=None,
+    z_map=None,
+    errors="raise",
+):
+    """
+    Resolves the age, age error and metallicity of many adopted templates
+    at once, e.g. to re-apply an updated template calibration to a catalog
+    built by 'scan_fisa_headers' without reading any spectrum again.
+
+    The templates are dictionary-encoded ('pandas.factorize'), so each map
+    is looked up once per distinct template and the results are expanded to
+    all the rows in a single vectorized step.
+
+    Parameters
+    ----------
+    templates : array-like of str
+        Adopted templates, as full paths (the 'adopted_template' header
+        value) or as names (e.g. "G2"). Missing values give NaN.
+    age_map, error_age_map, z_map : dict or None, optional
+        Mapping dictionaries of the templates, as in 'read_fisa'.
+        If None, the FISA_DEFAULT_* maps are used.
+    errors : {"raise", "coerce"}, optional
+        If "raise", templates missing in any map raise a single error
+        listing all of them. If "coerce", they give NaN.
+        (default: "raise")
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per template, with the index of 'templates' if it is a
+        'pandas.Series', and the columns 'name_template', 'age', 'err_age'
+        and 'z_value'.
+
+    Raises
+    ------
+    ValueError
+        If 'errors' is "raise" and some templates are missing in the maps,
+        or if 'errors' is not a valid option.
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError(f"Invalid errors option: '{errors}'")
+
+    age_map = FISA_DEFAULT_AGE_MAP if age_map is None else age_map
+    error_age_map = (
+        FISA_DEFAULT_ERROR_AGE_MAP if error_age_map is None else error_age_map
+    )
+    z_map = FISA_DEFAULT_Z_MAP if z_map is None else z_map
+
+    if not isinstance(templates, pd.Series):
+        templates = pd.Series(templates, dtype=object)
+    codes, uniques = pd.factorize(templates)
+
+    # same rule as '_get_name_template', over the distinct templates only
+    names = (
+        pd.Index(uniques, dtype=object)
+        .str.rsplit("/", n=1)
+        .str[-1]
+        .str.split(".")
+        .str[0]
+    )
+
+    resolved = {"name_template": np.asarray(names, dtype=object)}
+    missing = []
+    for column, mapping, label, map_name in (
+        ("age", age_map, "age", "age_map"),
+        ("err_age", error_age_map, "error age", "error_age_map"),
+        ("z_value", z_map, "metallicity", "z_map"),
+    ):
+        found = names.isin(list(mapping))
+        if not found.all():
+            absent = ", ".join(f"'{name}'" for name in names[~found].unique())
+            missing.append(
+                f"Missing {label} mapping for templates {absent} "
+                f"in {map_name}."
+            )
+        resolved[column] = np.asarray(names.map(mapping), dtype=float)
+
+    if missing and errors == "raise":
+        raise ValueError(" ".join(missing))
+
+    return pd.DataFrame(
+        {
+            column: pd.api.extensions.take(values, codes, allow_fill=True)
+            for column, values in resolved.items()
+        },
+        index=templates.index,
+    )
+
+
+def scan_fisa_headers(
+    paths, *, age_map=None, error_age_map=None, rv=3.1, z_map=None
+):
+    """
+    Reads only the header of many FISA files and collects it in one table,
+    without decoding their spectral blocks.
+
+    Each file is read until its first data line (plain files are mapped, so
+    only the pages of the header are touched). The header lines are
+    processed by '_process_header' and the adopted template is resolved
+    through the template maps, as 'read_fisa' does.
+
+    Parameters
+    ----------
+    paths : str, path-like or iterable of them
+        A directory (all its '*.fisa' files), a glob expression, a single
+        file or an iterable of files.
+    age_map, error_age_map, z_map : dict or None, optional
+        Mapping dictionaries of the templates, as in 'read_fisa'.
+        If None, the FISA_DEFAULT_* maps are used.
+    rv : float, optional
+        Reddening parameter (R_v) used for 'av_value'.
+        (default: 3.1)
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per file, indexed by path, with the keys of
+        'SpectralSummary.header' ('fisa_version', 'date_time', 'reddening',
+        'adopted_template', 'normalization_point', 'spectra_names') and the
+        columns 'name_template', 'age', 'err_age', 'z_value' and 'av_value'.
+        Templates missing in a map give NaN (see
+        'resolve_fisa_templates').
+    """
+    index, records = [], []
+    for path in buffers.resolve_paths(paths, "*.fisa"):
+        with buffers.open_mapped(path) as buffer:
+            header_lines, _ = _split_fisa(buffer)
+        index.append(str(path))
+        records.append(_process_header(header_lines))
+
+    headers = pd.DataFrame.from_records(
+        records,
+        index=pd.Index(index, name="path"),
+        columns=FISA_HEADER_KEYS,
+    )
+
+    resolved = resolve_fisa_templates(
+        headers["adopted_template"],
+        age_map=age_map,
+        error_age_map=error_age_map,
+        z_map=z_map,
+        errors="coerce",
+    )
+    headers = headers.join(resolved)
+    headers["av_value"] = headers["reddening"] * rv
+
+    return headers
+
+
+@cache.cached_reader
 def read_fisa(
     path_or_buffer,
     *,
@@ -412,8 +776,13 @@ def read_fisa(
 
     Parameters
     ----------
-    path_or_buffer : str
-        Path and name of the FISA file to read.
+    path_or_buffer : str, path-like, bytes or file-like
+        Path and name of the FISA file to read, its content, or an object
+        with a 'read' method (an open file, a pipe, ...). Content compressed
+        with gzip, bzip2 or xz is decompressed while it is read. Plain files
+        are memory-mapped, but streams and compressed content are copied
+        whole into memory (see 'buffers._spool'), so reading them takes as
+        much memory as the decompressed file.
 
     age_map : dict or None, optional
         Mapping dictionary for age values.
@@ -433,6 +802,11 @@ def read_fisa(
     -------
     SpectralSummary
         An object containing encapsulated data extracted from the FISA file.
+        Its 'extra_info' holds the shared wavelength grid of the spectra
+        ('wavelength', in Angstroms), their fluxes on that grid as the rows
+        of one matrix ('flux_matrix') and the name of each row
+        ('matrix_names'). The tables and spectra of those spectra are views
+        of these arrays.
     dict
         A dictionary with the following keys:
 
@@ -459,48 +833,44 @@ def read_fisa(
 
     obj_name = object_name
 
-    header_lines, spectra_blocks = [], []
-    current_spectrum = []
-
-    with open(path_or_buffer, "r") as fp:
-        for line in fp:
-            if line.startswith(" #"):
-                header_lines.append(line.strip())
-            elif line.strip():
-                current_spectrum.append(line)
-            elif current_spectrum and not line.strip():
-                spectra_blocks.append(current_spectrum)
-                current_spectrum = []
-
-    if current_spectrum:
-        spectra_blocks.append(current_spectrum)
-
-    header = _process_header(header_lines)
-    data = _process_blocks(spectra_blocks, header.get("spectra_names"))
-
-    str_template = _get_str_template(header)
-    name_template = _get_name_template(header)
-
-    try:
-        age = age_map[name_template]
-    except KeyError:
-        raise ValueError(
-            f"Missing age mapping for template '{name_template}' "
-            "in age_map."
-        )
+    with buffers.open_mapped(path_or_buffer) as buffer:
+        with profiling.stage("read_fisa", "split") as current:
+            header_lines, data_start = _split_fisa(buffer)
+            spans = list(buffers.iter_blocks(buffer, data_start))
+            current.count(nbytes=len(buffer), rows=len(header_lines))
 
-    err_age = error_age_map[name_template]
-    reddening_value, av_value = _get_reddening(header, rv)
-    normalization_point = header["normalization_point"]
+        with profiling.stage("read_fisa", "header") as current:
+            header = _process_header(header_lines)
+            current.count(rows=len(header_lines))
 
-    try:
-        z_value = z_map[name_template]
-    except KeyError:
-        raise ValueError(
-            f"Missing metallicity mapping for template '{name_template}' "
-            "in z_map."
+        data, wavelength, flux_matrix, matrix_names = _process_blocks(
+            buffer, spans, header.get("spectra_names")
         )
 
+    with profiling.stage("read_fisa", "properties"):
+        str_template = _get_str_template(header)
+        name_template = _get_name_template(header)
+
+        try:
+            age = age_map[name_template]
+        except KeyError:
+            raise ValueError(
+                f"Missing age mapping for template '{name_template}' "
+                "in age_map."
+            )
+
+        err_age = error_age_map[name_template]
+        reddening_value, av_value = _get_reddening(header, rv)
+        normalization_point = header["normalization_point"]
+
+        try:
+            z_value = z_map[name_template]
+        except KeyError:
+            raise ValueError(
+                f"Missing metallicity mapping for template '{name_template}' "
+                "in z_map."
+            )
+
     spectra = _get_spectra(data)
 
     extra_info = {
@@ -509,6 +879,9 @@ def read_fisa(
         "age_map": age_map,
         "error_age_map": error_age_map,
         "z_map": z_map,
+        "wavelength": wavelength,
+        "flux_matrix": flux_matrix,
+        "matrix_names": matrix_names,
     }
 
     return core.SpectralSummary(
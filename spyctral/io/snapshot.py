@@ -0,0 +1,677 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Binary snapshots of 'SpectralSummary' objects.
+
+A snapshot is made of two files:
+
+- The container ('path'): the raw bytes of every array of the summary
+  (table columns, spectra, data frames), each one aligned to
+  'SNAPSHOT_ALIGNMENT' bytes.
+- The side-car ('path' + '.json'): the header, the scalars, the extra
+  information and the description (dtype, shape and offset) of each array.
+  Arrays that are views of another one (e.g. the rows of a matrix) are
+  stored as views of it: their offset, shape and strides inside it.
+
+Loading maps the container once and every array is a view of the map, so
+nothing is parsed nor copied. Tables, spectra and data frames are rebuilt
+the first time they are accessed.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import datetime as dt
+import functools
+import json
+import math
+import mmap
+import os
+import pathlib
+import uuid
+
+import astropy.units as u
+from astropy.table import QTable
+
+import numpy as np
+
+import pandas as pd
+
+from specutils import Spectrum1D
+from specutils.spectra.spectral_axis import SpectralAxis
+from specutils.utils.wcs_utils import gwcs_from_array
+
+from spyctral.core import core
+from spyctral.utils.bunch import Lazy
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+#: Identifier and version of the side-car format.
+SNAPSHOT_FORMAT = "spyctral-snapshot"
+SNAPSHOT_VERSION = 2
+
+#: Alignment, in bytes, of each array in the container.
+SNAPSHOT_ALIGNMENT = 64
+
+#: Extension of the side-car file.
+SNAPSHOT_SIDECAR_SUFFIX = ".json"
+
+# Attributes of 'SpectralSummary' stored as plain values.
+_SCALARS = (
+    "obj_name",
+    "age",
+    "err_age",
+    "reddening",
+    "av_value",
+    "normalization_point",
+    "z_value",
+)
+
+# Attributes of 'SpectralSummary' whose values are rebuilt on first access.
+_BUNCHES = ("header", "data", "spectra", "extra_info")
+
+# Tags of the encoded values that hold arrays.
+_LAZY_TAGS = ("__qtable__", "__spectrum1d__", "__dataframe__", "__array__")
+
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+
+def _byte_bounds(array):
+    """Returns the first and one past the last byte used by an array."""
+    low = high = array.__array_interface__["data"][0]
+    for size, stride in zip(array.shape, array.strides):
+        if stride < 0:
+            low += (size - 1) * stride
+        else:
+            high += (size - 1) * stride
+    return low, high + array.itemsize
+
+
+class _ArrayWriter:
+    """Collects the arrays of a summary while it is encoded.
+
+    Arrays that are views of the same memory (e.g. a spectrum built on the
+    columns of a table) are stored once, and arrays inside the memory of a
+    contiguous one (e.g. the rows of a matrix) are stored as views of it.
+    With 'by_content', arrays with the same dtype, shape and values are
+    stored once too, and 'pack' marks them read-only, as they did not share
+    memory before.
+
+    The references returned by 'add' are completed when the arrays are
+    written or packed, once all of them are known.
+    """
+
+    def __init__(self, *, by_content=False):
+        self.arrays = []
+        self._pending = []
+        self._refs = {}
+        self._bases = []
+        self._contents = {} if by_content else None
+        self._merged = set()
+
+    def add(self, array):
+        """Registers an array and returns its reference in the side-car."""
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            if not all(isinstance(v, str) for v in array.flat):
+                raise ValueError(
+                    "Cannot save an object array that is not made of strings"
+                )
+            array = array.astype(str)
+
+        ref = {"__array__": None}
+        self._pending.append((array, ref))
+        return ref
+
+    def _resolve(self):
+        """Stores the registered arrays, the largest first so that they
+        hold the smaller ones, and completes their references."""
+        pending = sorted(self._pending, key=lambda item: -item[0].nbytes)
+        self._pending = []
+        for array, ref in pending:
+            ref.update(self._locate(array))
+
+    def _locate(self, array):
+        """Returns the reference of an array, storing it if needed."""
+        key = (
+            array.__array_interface__["data"][0],
+            array.shape,
+            array.strides,
+            array.dtype.str,
+        )
+        if key in self._refs:
+            return {"__array__": self._refs[key]}
+
+        view = self._find_view(array)
+        if view is not None:
+            return view
+
+        n_arrays = len(self.arrays)
+        index = self._refs[key] = self._add_content(array)
+        if len(self.arrays) > n_arrays and array.flags.c_contiguous:
+            self._bases.append(index)
+        return {"__array__": index}
+
+    def _find_view(self, array):
+        """Returns the reference of an array as a view of a stored one
+        whose memory holds it, or None."""
+        if not array.size:
+            return None
+        low, high = _byte_bounds(array)
+        start = array.__array_interface__["data"][0]
+        for index in self._bases:
+            base = self.arrays[index]
+            base_low, base_high = _byte_bounds(base)
+            if (
+                base.dtype == array.dtype
+                and base_low <= low
+                and high <= base_high
+                and (start - base_low) % array.itemsize == 0
+            ):
+                view = {
+                    "offset": start - base_low,
+                    "shape": list(array.shape),
+                    "strides": list(array.strides),
+                }
+                return {"__array__": index, "view": view}
+        return None
+
+    def _add_content(self, array):
+        """Stores an array not seen yet and returns its index."""
+        if self._contents is not None:
+            content = (array.dtype.str, array.shape, hash(array.tobytes()))
+            candidates = self._contents.setdefault(content, [])
+            for ref in candidates:
+                if np.array_equal(self.arrays[ref], array):
+                    self._merged.add(ref)
+                    return ref
+            candidates.append(len(self.arrays))
+
+        self.arrays.append(array)
+        return len(self.arrays) - 1
+
+    def _layout(self):
+        """Returns the description of each array and the total size."""
+        self._resolve()
+        specs, offset = [], 0
+        for array in self.arrays:
+            offset += -offset % SNAPSHOT_ALIGNMENT
+            specs.append(
+                {
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape),
+                    "offset": offset,
+                }
+            )
+            offset += array.nbytes
+        return specs, offset
+
+    def write(self, fp):
+        """Writes the arrays to 'fp' and returns their descriptions."""
+        specs, _ = self._layout()
+        position = 0
+        for array, spec in zip(self.arrays, specs):
+            fp.write(b"\0" * (spec["offset"] - position))
+            np.ascontiguousarray(array).tofile(fp)
+            position = spec["offset"] + array.nbytes
+        return specs
+
+    def pack(self):
+        """Copies the arrays into a single buffer, with the same layout as
+        'write', and returns it with their descriptions."""
+        specs, size = self._layout()
+        for ref in self._merged:
+            specs[ref]["readonly"] = True
+        buffer = bytearray(size)
+        for array, spec in zip(self.arrays, specs):
+            if array.size:
+                np.frombuffer(
+                    buffer,
+                    dtype=array.dtype,
+                    count=array.size,
+                    offset=spec["offset"],
+                ).reshape(array.shape)[...] = array
+        return buffer, specs
+
+
+def _encode_index(index, writer):
+    """Encodes the index of a data frame."""
+    if isinstance(index, pd.RangeIndex):
+        return {
+            "range": [index.start, index.stop, index.step],
+            "name": _encode(index.name, writer),
+        }
+    return {
+        "data": writer.add(index.to_numpy()),
+        "dtype": str(index.dtype),
+        "name": _encode(index.name, writer),
+    }
+
+
+def _encode(value, writer):
+    """
+    Converts a value into JSON-compatible objects, moving its arrays to
+    'writer'.
+
+    Parameters
+    ----------
+    value : object
+        Value to encode.
+    writer : _ArrayWriter
+        Collector of the arrays.
+
+    Returns
+    -------
+    object
+        JSON-compatible object. Values that JSON cannot represent are
+        tagged dictionaries (e.g. '{"__tuple__": [...]}').
+
+    Raises
+    ------
+    ValueError
+        If the type of the value is not supported.
+    """
+    if value is None or type(value) in (bool, int, float, str):
+        return value
+
+    if isinstance(value, np.generic):
+        return {"__numpy__": value.dtype.str, "value": value.item()}
+
+    if isinstance(value, dt.datetime):
+        return {"__datetime__": value.isoformat()}
+
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(v, writer) for v in value]}
+
+    if isinstance(value, list):
+        return [_encode(v, writer) for v in value]
+
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise ValueError("Cannot save a dictionary with non-string keys")
+        return {"__dict__": {k: _encode(v, writer) for k, v in value.items()}}
+
+    if isinstance(value, np.ndarray) and not isinstance(value, u.Quantity):
+        return writer.add(value)
+
+    if isinstance(value, QTable):
+        columns = []
+        for name in value.colnames:
+            column = value[name]
+            if isinstance(column, u.Quantity):
+                encoded = {
+                    "data": writer.add(column.value),
+                    "unit": column.unit.to_string(),
+                }
+            else:
+                encoded = {"data": writer.add(column.data), "unit": None}
+            columns.append({"name": name, **encoded})
+        return {
+            "__qtable__": {
+                "columns": columns,
+                "meta": _encode(dict(value.meta), writer),
+            }
+        }
+
+    if isinstance(value, Spectrum1D):
+        return {
+            "__spectrum1d__": {
+                "flux": writer.add(value.flux.value),
+                "flux_unit": value.flux.unit.to_string(),
+                "spectral_axis": writer.add(value.spectral_axis.value),
+                "spectral_axis_unit": value.spectral_axis.unit.to_string(),
+            }
+        }
+
+    if isinstance(value, pd.DataFrame):
+        return {
+            "__dataframe__": {
+                "columns": [_encode(c, writer) for c in value.columns],
+                "data": [
+                    writer.add(value.iloc[:, i].to_numpy())
+                    for i in range(value.shape[1])
+                ],
+                "dtypes": [str(dtype) for dtype in value.dtypes],
+                "index": _encode_index(value.index, writer),
+            }
+        }
+
+    raise ValueError(f"Cannot save values of type {type(value).__name__!r}")
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+
+class _ArrayReader:
+    """Gives the arrays of a container as views of its memory.
+
+    The buffer is either a bytearray (see '_ArrayWriter.pack') or the map
+    of a container, opened copy-on-write: the arrays can be modified, but
+    the changes never reach the file. The arrays whose description is
+    marked "readonly" cannot be modified.
+    """
+
+    def __init__(self, buffer, specs):
+        self._buffer = buffer
+        self._specs = specs
+        self._axes = {}
+
+    @classmethod
+    def from_file(cls, path, specs):
+        """Maps a container and gives its arrays."""
+        with open(path, "rb") as fp:
+            try:
+                buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_COPY)
+            except ValueError:  # empty container, no arrays
+                buffer = bytearray()
+        return cls(buffer, specs)
+
+    def array(self, ref):
+        """Returns the array of a reference."""
+        spec = self._specs[ref["__array__"]]
+        dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+        count = math.prod(shape)
+        if not count:
+            return np.empty(shape, dtype=dtype)
+        array = np.frombuffer(
+            self._buffer, dtype=dtype, count=count, offset=spec["offset"]
+        )
+        array.flags.writeable = not spec.get("readonly", False)
+
+        view = ref.get("view")
+        if view is None:
+            return array.reshape(shape)
+        return np.ndarray(
+            view["shape"],
+            dtype=dtype,
+            buffer=array,
+            offset=view["offset"],
+            strides=view["strides"],
+        )
+
+    def spectral_axis(self, ref, unit):
+        """Returns the spectral axis of a reference and its WCS, shared by
+        the spectra stored on the same array."""
+        key = (json.dumps(ref, sort_keys=True), unit)
+        if key not in self._axes:
+            spectral_axis = SpectralAxis(
+                u.Quantity(self.array(ref), unit, copy=False), copy=False
+            )
+            wcs = gwcs_from_array(spectral_axis, spectral_axis.shape)
+            self._axes[key] = spectral_axis, wcs
+        return self._axes[key]
+
+
+def _decode_index(value, reader):
+    """Decodes the index of a data frame."""
+    name = _decode(value["name"], reader)
+    if "range" in value:
+        return pd.RangeIndex(*value["range"], name=name)
+    return pd.Index(
+        reader.array(value["data"]), dtype=value["dtype"], name=name
+    )
+
+
+def _decode(value, reader):
+    """
+    Rebuilds a value encoded by '_encode'.
+
+    Parameters
+    ----------
+    value : object
+        JSON-compatible object.
+    reader : _ArrayReader
+        Source of the arrays.
+
+    Returns
+    -------
+    object
+        The original value.
+    """
+    if isinstance(value, list):
+        return [_decode(v, reader) for v in value]
+
+    if not isinstance(value, dict):
+        return value
+
+    if "__numpy__" in value:
+        return np.dtype(value["__numpy__"]).type(value["value"])
+
+    if "__datetime__" in value:
+        return dt.datetime.fromisoformat(value["__datetime__"])
+
+    if "__tuple__" in value:
+        return tuple(_decode(v, reader) for v in value["__tuple__"])
+
+    if "__dict__" in value:
+        return {k: _decode(v, reader) for k, v in value["__dict__"].items()}
+
+    if "__array__" in value:
+        return reader.array(value)
+
+    if "__qtable__" in value:
+        columns, names = [], []
+        for column in value["__qtable__"]["columns"]:
+            data = reader.array(column["data"])
+            if column["unit"] is not None:
+                data = u.Quantity(data, column["unit"], copy=False)
+            columns.append(data)
+            names.append(column["name"])
+        table = QTable(columns, names=names, copy=False)
+        table.meta.update(_decode(value["__qtable__"]["meta"], reader))
+        return table
+
+    if "__spectrum1d__" in value:
+        spectrum = value["__spectrum1d__"]
+        flux = u.Quantity(
+            reader.array(spectrum["flux"]), spectrum["flux_unit"], copy=False
+        )
+        spectral_axis, wcs = reader.spectral_axis(
+            spectrum["spectral_axis"], spectrum["spectral_axis_unit"]
+        )
+        return Spectrum1D(flux=flux, spectral_axis=spectral_axis, wcs=wcs)
+
+    if "__dataframe__" in value:
+        frame = value["__dataframe__"]
+        columns = [_decode(c, reader) for c in frame["columns"]]
+        data = {i: reader.array(ref) for i, ref in enumerate(frame["data"])}
+        df = pd.DataFrame(data, index=_decode_index(frame["index"], reader))
+        # only text columns come back with another dtype (fixed-width)
+        changed = {
+            i: dtype
+            for i, (dtype, current) in enumerate(
+                zip(frame["dtypes"], df.dtypes)
+            )
+            if str(current) != dtype
+        }
+        df = df.astype(changed) if changed else df
+        df.columns = columns
+        return df
+
+    raise ValueError(f"Unknown value in snapshot: {sorted(value)}")
+
+
+def _decode_lazy(value, reader):
+    """Decodes a value, deferring the ones that hold arrays."""
+    if isinstance(value, dict) and any(tag in value for tag in _LAZY_TAGS):
+        return Lazy(functools.partial(_decode, value, reader))
+    return _decode(value, reader)
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+def _sidecar_path(path):
+    """Returns the path of the side-car of a container."""
+    return pathlib.Path(str(path) + SNAPSHOT_SIDECAR_SUFFIX)
+
+
+def save_snapshot(summary, path):
+    """
+    Saves a 'SpectralSummary' as a binary snapshot.
+
+    Parameters
+    ----------
+    summary : core.SpectralSummary
+        The summary to save, e.g. as returned by 'read_starlight' or
+        'read_fisa'. Values not yet loaded (see 'Lazy') are computed.
+    path : str or path-like
+        Path of the container. The side-car is written next to it, with
+        the '.json' suffix added.
+
+        Both files are written to temporary files in the same directory
+        that are then renamed over them, the container first and the
+        side-car last, so an existing snapshot is never left half written
+        and the new side-car only appears once its container is complete.
+
+    Returns
+    -------
+    pathlib.Path
+        The path of the container.
+
+    Raises
+    ------
+    ValueError
+        If the summary holds a value of an unsupported type.
+    """
+    path = pathlib.Path(path)
+    writer = _ArrayWriter()
+
+    document = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "scalars": {name: getattr(summary, name) for name in _SCALARS},
+    }
+    for name in _BUNCHES:
+        bunch = getattr(summary, name)
+        document[name] = {k: _encode(v, writer) for k, v in bunch.items()}
+
+    sidecar = _sidecar_path(path)
+    tag = uuid.uuid4().hex
+    tmp_path = path.with_name(f".{path.name}.{tag}.tmp")
+    tmp_sidecar = sidecar.with_name(f".{sidecar.name}.{tag}.tmp")
+    try:
+        with open(tmp_path, "wb") as fp:
+            document["arrays"] = writer.write(fp)
+
+        with open(tmp_sidecar, "w") as fp:
+            json.dump(document, fp)
+
+        os.replace(tmp_path, path)
+        os.replace(tmp_sidecar, sidecar)
+    except BaseException:
+        for tmp in (tmp_path, tmp_sidecar):
+            tmp.unlink(missing_ok=True)
+        raise
+
+    return path
+
+
+def load_snapshot(path):
+    """
+    Loads a 'SpectralSummary' saved by 'save_snapshot'.
+
+    The container is memory-mapped and the tables, spectra and data frames
+    are rebuilt on first access, on top of the mapped arrays.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Path of the container.
+
+    Returns
+    -------
+    core.SpectralSummary
+        The saved summary.
+
+    Raises
+    ------
+    ValueError
+        If the side-car is not a Spyctral snapshot or its version is not
+        supported.
+    """
+    with open(_sidecar_path(path)) as fp:
+        document = json.load(fp)
+
+    if document.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"'{path}' is not a Spyctral snapshot")
+    if document.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version: {document.get('version')}"
+        )
+
+    reader = _ArrayReader.from_file(path, document["arrays"])
+
+    fields = dict(document["scalars"])
+    for name in _BUNCHES:
+        fields[name] = {
+            k: _decode_lazy(v, reader) for k, v in document[name].items()
+        }
+
+    return core.SpectralSummary(**fields)
+
+
+def pack_summary(summary):
+    """
+    Copies a 'SpectralSummary' into a compact in-memory layout.
+
+    The arrays of its tables, spectra, data frames and arrays are copied
+    into a single buffer, where the arrays with the same values (e.g. the
+    wavelengths of several tables) are stored once. The copy
+    holds them encoded as in a snapshot, and the tables, spectra and data
+    frames are rebuilt on first access as views of the buffer. This takes
+    much less memory than the objects themselves while they are not
+    accessed.
+
+    Values not loaded yet (see 'Lazy') are computed, as in 'save_snapshot',
+    so the copy does not keep the original objects alive. Values that a
+    snapshot cannot hold are kept as they are.
+
+    Parameters
+    ----------
+    summary : core.SpectralSummary
+        The summary to copy.
+
+    Returns
+    -------
+    core.SpectralSummary
+        The compact copy. The arrays of its values are views of the
+        buffer. The arrays stored once for several values that did not
+        share memory in 'summary' are read-only, so changing one of them
+        cannot change the others.
+    """
+    writer = _ArrayWriter(by_content=True)
+
+    fields = {name: getattr(summary, name) for name in _SCALARS}
+    encoded = []
+    for name in _BUNCHES:
+        fields[name] = dict(getattr(summary, name).items())
+        for key, value in fields[name].items():
+            try:
+                encoded.append((name, key, _encode(value, writer)))
+            except ValueError:
+                continue
+
+    reader = _ArrayReader(*writer.pack())
+    for name, key, value in encoded:
+        fields[name][key] = _decode_lazy(value, reader)
+
+    return core.SpectralSummary(**fields)
@@ -10,20 +10,31 @@
 # IMPORTS
 # =============================================================================
 
+import concurrent.futures as cf
+import datetime as dt
+import functools
+import io
+import os
 import re
+import warnings
 
 import astropy.units as u
 from astropy.table import QTable
 
-import dateutil.parser
+import attrs
 
 import numpy as np
 
 import pandas as pd
 
 from specutils import Spectrum1D
+from specutils.spectra.spectral_axis import SpectralAxis
+from specutils.utils.wcs_utils import gwcs_from_array
 
+from spyctral import cache, profiling
 from spyctral.core import core
+from spyctral.utils import buffers
+from spyctral.utils.bunch import Lazy
 
 
 # =============================================================================
@@ -35,14 +46,306 @@ SL_GET_TITLE_VALUE = re.compile(r"\[")
 SL_REPLACE_AND = re.compile(r"&")
 SL_GET_MULTIPLE_VALUES = re.compile(r",")
 SL_GET_DATE = re.compile(r"\b\d{2}/[a-zA-Z]{3}/\d{4}\b")
+
+# Number of each English month abbreviation of the dates. A fixed table,
+# as 'strptime' reads the abbreviations of the current locale.
+SL_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        (
+            "jan",
+            "feb",
+            "mar",
+            "apr",
+            "may",
+            "jun",
+            "jul",
+            "aug",
+            "sep",
+            "oct",
+            "nov",
+            "dec",
+        ),
+        start=1,
+    )
+}
 PATRON = re.compile(r"#(.*?)(?:(?=\n)|$)")
 
+# Markers that open each section of a Starlight output file.
+SL_SECTION_BEST_MODEL = b"## Synthesis Results - Best model ##"
+SL_SECTION_CHAINS = b"## Synthesis Results - Average & Chains ##"
+SL_SECTION_SPECTRUM = b"## Synthetic spectrum (Best Model) ##"
+
+# Tables found inside each section, in the order they appear in the file.
+SL_SECTION_TABLES = {
+    SL_SECTION_BEST_MODEL: ("synthetic_results",),
+    SL_SECTION_CHAINS: (
+        "results_average_chains_xj",
+        "results_average_chains_mj",
+        "results_average_chains_Av_chi2_mass",
+    ),
+    SL_SECTION_SPECTRUM: ("synthetic_spectrum",),
+}
+
+# A table ends before an empty line, a header line ('... [tag]') or a
+# comment line ('# ...').
+SL_TABLE_END = re.compile(rb"\n(?=[ \t\r]*(?:\n|$)|[^\n]*\[|#)")
+
+# Columns of the 'synthetic_results' table that hold text instead of numbers.
+SL_STRING_COLUMNS = ("component_j",)
+
+# Tables that 'read_starlight' builds on first access when 'lazy=True'.
+SL_LAZY_TABLES = (
+    "results_average_chains_xj",
+    "results_average_chains_mj",
+    "results_average_chains_Av_chi2_mass",
+    "synthetic_spectrum",
+)
+
+# Values of each summary returned by 'read_starlight_many(compact=True)'.
+SL_COMPACT_COLUMNS = (
+    "path",
+    "obj_name",
+    "age",
+    "err_age",
+    "average_log_age",
+    "z_value",
+    "reddening",
+    "av_value",
+    "normalization_point",
+)
+
+# Spectra built from the 'synthetic_spectrum' table.
+SL_SPECTRA_NAMES = (
+    "synthetic_spectrum",
+    "observed_spectrum",
+    "residual_spectrum",
+)
+
+
+# Grammar of the header lines of a Starlight file ('<values> [<tag>]').
+# Each known tag (with its whitespace collapsed) maps to the keys and types
+# of the values written before it. Lines with other tags, or whose values
+# do not match the expected types, go through '_proces_header_line'.
+SL_HEADER_LINE = re.compile(r"(?P<values>[^\[]*)\[(?P<tag>[^\]]*)\]")
+
+SL_HEADER_TAGS = {
+    "arq_obs": (("arq_obs", str),),
+    "arq_base": (("arq_base", str),),
+    "arq_masks": (("arq_masks", str),),
+    "arq_config": (("arq_config", str),),
+    "N_base": (("N_base", float),),
+    "N_YAV_components = # of components with extra extinction!": (
+        ("N_YAV_components", float),
+    ),
+    "i_FitPowerLaw (1/0 = Yes/No)": (("i_FitPowerLaw", float),),
+    "alpha_PowerLaw": (("alpha_PowerLaw", float),),
+    "red_law_option": (("red_law_option", str),),
+    "q_norm = A(l_norm)/A(V)": (("q_norm", float),),
+    "l_ini (A)": (("l_ini", float),),
+    "l_fin (A)": (("l_fin", float),),
+    "dl (A)": (("dl", float),),
+    "l_norm (A) - for base": (("l_norm", float),),
+    "llow_norm (A) - window for f_obs": (("llow_norm", float),),
+    "lupp_norm (A) - window for f_obs": (("lupp_norm", float),),
+    "fobs_norm (in input units)": (("fobs_norm", float),),
+    "llow_SN (A) - window for S/N": (("llow_SN", float),),
+    "lupp_SN (A) - window for S/N": (("lupp_SN", float),),
+    "S/N in S/N window": (("S_N_in_S_N_window", float),),
+    "S/N in norm. window": (("S_N_in_norm_window", float),),
+    "S/N_err in S/N window": (("S_N_err_in_S_N_window", float),),
+    "S/N_err in norm. window": (("S_N_err_in_norm_window", float),),
+    "fscale_chi2": (("fscale_chi2", float),),
+    "idum_orig": (("idum_orig", float),),
+    "NOl_eff": (("NOl_eff", float),),
+    "Nl_eff": (("Nl_eff", float),),
+    "Ntot_cliped & clip_method": (
+        ("Ntot_cliped", float),
+        ("clip_method", str),
+    ),
+    "Nglobal_steps": (("Nglobal_steps", float),),
+    "N_chains": (("N_chains", float),),
+    "NEX0s_base = N_base in EX0s-fits": (("NEX0s_base", float),),
+    "Clip-Bug, RC-Crash & Burn-In warning-flags, n_censored_weights, "
+    "wei_nsig_threshold & wei_limit": (
+        ("Clip_Bug", float),
+        ("RC_Crash", float),
+        ("Burn_In", float),
+        ("n_censored_weights", float),
+        ("wei_nsig_threshold", float),
+        ("wei_limit", "float_or_str"),
+    ),
+    "idt_all, wdt_TotTime, wdt_UsrTime & wdt_SysTime (sec)": (
+        ("idt_all", float),
+        ("wdt_TotTime", float),
+        ("wdt_UsrTime", float),
+        ("wdt_SysTime", float),
+    ),
+    "chi2/Nl_eff": (("chi2_Nl_eff", float),),
+    "adev (%)": (("adev", float),),
+    "sum-of-x (%)": (("sum_of_x", float),),
+    "Flux_tot (units of input spectrum!)": (("Flux_tot", float),),
+    "Mini_tot (???)": (("Mini_tot", float),),
+    "Mcor_tot (???)": (("Mcor_tot", float),),
+    "v0_min (km/s)": (("v0_min", float),),
+    "vd_min (km/s)": (("vd_min", float),),
+    "AV_min (mag)": (("AV_min", float),),
+    "YAV_min (mag)": (("YAV_min", float),),
+    "v0_min (km/s) before EX0s...": (("v0_min", float),),
+    "vd_min (km/s) before EX0s...": (("vd_min", float),),
+    "Nl_obs": (("Nl_obs", float),),
+}
+
+# Pattern of each type of value. Texts must have a letter and numbers use an
+# upper case exponent, the same rules followed by '_proces_header_line'.
+# "float_or_str" values are numbers, or texts without digits such as 'NAN'.
+SL_HEADER_TYPES = {
+    float: r"[-+]?(?:\d+\.?\d*|\.\d+)(?:E[-+]?\d+)?",
+    str: r"[\w.@+]*[A-Za-z][\w.@+]*",
+    "float_or_str": r"[-+]?(?:\d+\.?\d*|\.\d+)(?:E[-+]?\d+)?|[A-Za-z]+",
+}
+
+
+def _compile_header_grammar(tags, types):
+    """
+    Compiles the header grammar. For every tag, one regex that matches all
+    the values of the line, and one converter per value.
+
+    Parameters
+    ----------
+    tags : dict
+        Keys and types of the values of each tag (see 'SL_HEADER_TAGS').
+    types : dict
+        Regex of each type of value (see 'SL_HEADER_TYPES').
+
+    Returns
+    -------
+    dict
+        Tuple '(keys, converters, regex)' keyed by tag.
+    """
+    grammar = {}
+    for tag, layout in tags.items():
+        keys = tuple(key for key, _ in layout)
+        converters = tuple(
+            _float_or_str if kind == "float_or_str" else kind
+            for _, kind in layout
+        )
+        values = r"\s+".join(f"({types[kind]})" for _, kind in layout)
+        grammar[tag] = keys, converters, re.compile(rf"\s*{values}\s*")
+
+    return grammar
+
+
+def _float_or_str(value):
+    """Converts a header value to float, unless it has no digits."""
+    return float(value) if re.search(r"[0-9]", value) else value
+
+
+SL_HEADER_GRAMMAR = _compile_header_grammar(SL_HEADER_TAGS, SL_HEADER_TYPES)
+
+
+def _parse_date(date):
+    """
+    Parses a date of a Starlight header ('dd/Mon/yyyy', e.g. '01/Apr/2007')
+    with English month abbreviations, whatever the locale.
+
+    Parameters
+    ----------
+    date : str
+        The date, as matched by 'SL_GET_DATE'.
+
+    Returns
+    -------
+    datetime.datetime
+        The date, at midnight.
+
+    Raises
+    ------
+    ValueError
+        If the month is not an English month abbreviation.
+    """
+    day, month, year = date.split("/")
+    number = SL_MONTHS.get(month.lower())
+    if number is None:
+        raise ValueError(f"Unknown month in the date '{date}'")
+    return dt.datetime(int(year), number, int(day))
+
+
+def _proces_header_line(sl, head_dict):
+    """
+    Extracts the parameters and values of one header line of a Starlight
+    file, without any knowledge about its tag. This is the generic path of
+    '_proces_header', used for the tags missing in 'SL_HEADER_TAGS'.
+
+    Parameters
+    ----------
+    sl : str
+        Header line.
+    head_dict : dict
+        Dictionary where the extracted values are stored.
+    """
+    date = SL_GET_DATE.search(sl)
+    if date:
+        head_dict["Date"] = _parse_date(date[0])
+
+    sl = re.sub(
+        r"\s{2,}", " ", sl.replace("&", ",").replace("]\n", "")
+    ).replace("/", "_")
+
+    # Handles string with multiple values on the same line.
+    # They are idenfied by havin a ','
+    if re.findall(SL_GET_MULTIPLE_VALUES, sl):
+        starline_values = (
+            sl.split("[")[0].strip().split(" ")
+        )  # keeps the values
+        starline_var = sl.split("[")[1].split(
+            ","
+        )  # keeps the names of the variables
+
+        for pos, val in enumerate(starline_values):
+            if bool(re.search(r"[0-9]", val)):  # filters for numeric values
+                head_dict[
+                    starline_var[pos].strip().split(" ")[0].replace("-", "_")
+                ] = float(val)
+            else:
+                head_dict[
+                    starline_var[pos].strip().split(" ")[0].replace("-", "_")
+                ] = val
+
+    # Handles string with S/N titles that repeats
+    # overlaps if not handled.
+    elif re.findall(r"\[S_N", sl):
+        starline_list = sl.split("[")
+        head_dict[
+            starline_list[1].replace(" ", "_").replace(".", "").strip()
+        ] = float(starline_list[0])
+
+    # saves all the other values
+    # that not contain any special exception
+    else:
+        starline_list = sl.replace("-", "_").replace("#", "").split("[")
+        if bool(re.search(r"[0-9]", starline_list[0])) and not bool(
+            re.search(r"[a-z]", starline_list[0])
+        ):  # filters for numeric values
+            head_dict[starline_list[1].split(" ")[0]] = float(
+                starline_list[0].replace("_", "-").strip()
+            )
+        else:
+            head_dict[starline_list[1].split(" ")[0]] = starline_list[
+                0
+            ].strip()
+
 
 def _proces_header(header_ln):
     """
     Receives a list of header lines from a Starlight file and returns a
     dictionary with the extracted parameters and values.
 
+    Each line is matched once by 'SL_HEADER_LINE'. When its tag is in the
+    compiled grammar ('SL_HEADER_GRAMMAR') and its values have the expected
+    types, they are converted directly. Any other line is processed by
+    '_proces_header_line'.
+
     Parameters
     ----------
     header_ln : list
@@ -57,146 +360,211 @@ def _proces_header(header_ln):
 
     head_dict = {}
     for sl in header_ln:
-        if re.findall(SL_GET_DATE, sl):
-            head_dict["Date"] = dateutil.parser.parse(
-                re.findall(SL_GET_DATE, sl)[0]
-            )
+        match = SL_HEADER_LINE.match(sl)
+        rule = match and SL_HEADER_GRAMMAR.get(" ".join(match["tag"].split()))
+        values = rule and rule[2].fullmatch(match["values"])
+        if not values:
+            _proces_header_line(sl, head_dict)
+            continue
 
-        sl = re.sub(
-            r"\s{2,}", " ", sl.replace("&", ",").replace("]\n", "")
-        ).replace("/", "_")
-
-        # Handles string with multiple values on the same line.
-        # They are idenfied by havin a ','
-        if re.findall(SL_GET_MULTIPLE_VALUES, sl):
-            starline_values = (
-                sl.split("[")[0].strip().split(" ")
-            )  # keeps the values
-            starline_var = sl.split("[")[1].split(
-                ","
-            )  # keeps the names of the variables
-
-            for pos, val in enumerate(starline_values):
-                if bool(
-                    re.search(r"[0-9]", val)
-                ):  # filters for numeric values
-                    head_dict[
-                        starline_var[pos]
-                        .strip()
-                        .split(" ")[0]
-                        .replace("-", "_")
-                    ] = float(val)
-                else:
-                    head_dict[
-                        starline_var[pos]
-                        .strip()
-                        .split(" ")[0]
-                        .replace("-", "_")
-                    ] = val
-
-        # Handles string with S/N titles that repeats
-        # overlaps if not handled.
-        elif re.findall(r"\[S_N", sl):
-            starline_list = sl.split("[")
-            head_dict[
-                starline_list[1].replace(" ", "_").replace(".", "").strip()
-            ] = float(starline_list[0])
-
-        # saves all the other values
-        # that not contain any special exception
-        else:
-            starline_list = sl.replace("-", "_").replace("#", "").split("[")
-            if bool(re.search(r"[0-9]", starline_list[0])) and not bool(
-                re.search(r"[a-z]", starline_list[0])
-            ):  # filters for numeric values
-                head_dict[starline_list[1].split(" ")[0]] = float(
-                    starline_list[0].replace("_", "-").strip()
-                )
-            else:
-                head_dict[starline_list[1].split(" ")[0]] = starline_list[
-                    0
-                ].strip()
+        keys, converters, _ = rule
+        for key, convert, value in zip(keys, converters, values.groups()):
+            head_dict[key] = convert(value)
 
     return head_dict
 
 
-def _is_float(element: any) -> bool:
+def _split_starlight(buffer):
     """
-    Checks whether a given element can be converted to a floating-point number.
+    Splits a Starlight file in a single pass over its small sections,
+    collecting the header lines and the byte span of the rows of each table.
+
+    The sections are identified by their markers (see 'SL_SECTION_TABLES').
+    The end of each table is found by a byte search ('SL_TABLE_END'), so
+    its rows are never split into lines. The synthetic spectrum runs until
+    the end of the file, so the search stops at its first row.
 
     Parameters
     ----------
-    element : any
-        Element to check.
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file (see 'buffers.open_mapped').
 
     Returns
     -------
-    bool
-        'True' if the element can be converted to a floating-point number,
-        'False' otherwise.
+    tuple
+        A tuple containing:
+
+        - **'header_lines'** (*list of str*): Lines with a '[...]' tag.
+        - **'block_titles'** (*dict*): Title line ('# ...') of each table,
+            keyed by table name.
+        - **'spans'** (*dict*): Byte span '(start, stop)' of the rows of
+            each table, keyed by table name.
     """
-    # If you expect None to be passed:
-    if element is None:
-        return False
-    try:
-        float(element)
-        return True
-    except ValueError:
-        return False
+    header_lines, block_titles, spans = [], {}, {}
+    pending = ()
+    start, end = 0, len(buffer)
+
+    while start < end:
+        stop = buffer.find(b"\n", start, end) + 1 or end
+        sl = buffer[start:stop]
+
+        if b"[" in sl:
+            header_lines.append(sl.decode().replace("\r\n", "\n"))
+        elif sl.startswith(b"##"):
+            for marker, names in SL_SECTION_TABLES.items():
+                if sl.startswith(marker):
+                    pending = names
+                    break
+        elif sl.startswith(b"#"):
+            if pending:
+                block_titles[pending[0]] = sl.decode()
+        elif pending and not sl.isspace():
+            # first row of the next table of the current section
+            name, pending = pending[0], pending[1:]
+            if name == "synthetic_spectrum":
+                spans[name] = (start, end)
+                break
+            table_end = SL_TABLE_END.search(buffer, start, end)
+            stop = end if table_end is None else table_end.start() + 1
+            spans[name] = (start, stop)
+
+        start = stop
+
+    return header_lines, block_titles, spans
+
+
+def _build_from_file(build, identity, span):
+    """
+    Builds a table from the rows stored at a byte span of a Starlight file.
 
+    Compressed files are decompressed again on each call.
 
-def _proces_tables(block_lines):
+    Parameters
+    ----------
+    build : callable
+        Function that builds the table from a buffer and a span.
+    identity : tuple
+        Identity of the Starlight file when it was read
+        (see 'buffers.file_identity').
+    span : tuple of int
+        Byte span of the rows, as recorded by '_split_starlight'.
+
+    Returns
+    -------
+    QTable
+        The table returned by 'build'.
+
+    Raises
+    ------
+    ValueError
+        If the file was modified or replaced since it was read, so the span
+        may no longer point to the rows of the table.
     """
-    Processes the data block lines of a Starlight file and returns a dictionary
-    with four structured tables containing key information, such as the
-    synthetic spectrum and results.
+    path = identity[0]
+    if buffers.file_identity(path) != identity:
+        raise ValueError(
+            f"The Starlight file '{path}' changed since it was read; "
+            "read it again to access its tables"
+        )
+    with buffers.open_mapped(path) as buffer:
+        return build(buffer, span)
+
+
+def _decode_block(buffer, span, name, *, usecols=None, dtype=np.float64):
+    """
+    Decodes the rows of a Starlight table in a single NumPy call.
+
+    All-numeric tables are parsed straight from the bytes of the region
+    (see 'buffers.decode_floats'). Selecting columns or decoding text goes
+    through 'numpy.loadtxt'.
 
     Parameters
     ----------
-    block_lines : list of str
-        List of strings representing the data block lines.
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file.
+    span : tuple of int
+        Byte span of the rows of the table.
+    name : str
+        Name of the table, used in the error message.
+    usecols : sequence of int, optional
+        Columns to decode. Default: all of them.
+    dtype : data-type, optional
+        Type of the decoded values.
+        Default: float64.
 
     Returns
     -------
-    dict
-        A dictionary with the following keys and values:
-        - **"synthetic_spectrum"** (*QTable*): Table with the columns "l_obs",
-            "f_obs", "f_syn", and "weights".
-        - **"synthetic_results"** (*QTable*): Table with synthetic results.
-        - **"results_average_chains_xj"** (*QTable*): Table with averages of
-            x_j chains.
-        - **"results_average_chains_mj"** (*QTable*): Table with averages of
-            m_j chains.
-        - **"results_average_chains_Av_chi2_mass"** (*QTable*): Table with
-            average values of Av, chi^2, and mass.
+    numpy.ndarray
+        Array of shape (n_columns, n_rows). Each row of the array is one
+        column of the table, stored contiguously.
+
+    Raises
+    ------
+    ValueError
+        If an element of the table cannot be converted to 'dtype'.
+    """
+    start, stop = span
+    with profiling.stage("read_starlight", "decode") as current:
+        if usecols is None and dtype is np.float64:
+            values = buffers.decode_floats(buffer, start, stop, name=name)
+        else:
+            values = _load_block(buffer, span, name, usecols, dtype)
+        current.count(nbytes=stop - start, rows=values.shape[1])
+
+    return values
+
+
+def _load_block(buffer, span, name, usecols, dtype):
+    """Decodes the rows of a table with 'numpy.loadtxt'."""
+    start, stop = span
+    try:
+        values = np.loadtxt(
+            io.BytesIO(buffer[start:stop]),
+            dtype=dtype,
+            usecols=usecols,
+            ndmin=2,
+            comments=None,
+        )
+    except ValueError as err:
+        raise ValueError(
+            f"Element in '{name}' table cannot be converted to a number: "
+            f"{err}"
+        ) from None
+
+    return np.ascontiguousarray(values.T)
+
+
+def _make_qtable(columns, **kwargs):
+    """Builds a 'QTable' over the columns, without copying them."""
+    with profiling.stage("read_starlight", "qtable") as current:
+        table = QTable(columns, copy=False, **kwargs)
+        current.count(rows=len(table))
+    return table
+
+
+def _make_synthetic_results(buffer, span, title):
+    """
+    Builds the 'synthetic_results' table of a Starlight file.
+
+    The column names and the '%' units are taken from the title of the
+    table. The columns listed in 'SL_STRING_COLUMNS' are kept as strings.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file.
+    span : tuple of int
+        Byte span of the rows of the table.
+    title : str
+        Title line of the table ('# j x_j(%) ...').
+
+    Returns
+    -------
+    QTable
+        Table with one column per SSP property.
     """
-    block_titles = []
-    blocks = []
-    tab = []
-    for sl in block_lines:
-        # procces the tables.
-        if (
-            re.search(SL_GET_TITLE_VALUE, sl) is None
-            and re.match("##", sl) is None
-        ):
-            # Filters the titles of the tables.
-            if re.search(r"# ", sl):
-                block_titles.append(sl)
-            # Filters the empty spaces
-            elif len(sl) > 1:
-                sl = re.sub(r"\s{2,}", " ", sl.strip())
-                tab.append(sl.split(" "))
-
-            # Generates a block for each empty line that founds
-            # and if the block is larger it appends it
-            else:
-                if len(tab) >= 1:
-                    blocks.append(tab)
-                    tab = []
-    blocks.append(tab)
-    tab = []
     first_title = (
-        re.sub(r"\s{2,}", " ", block_titles[0][1:])
+        re.sub(r"\s{2,}", " ", title[1:])
         .replace(".", "")
         .replace("?", "")
         .strip()
@@ -219,49 +587,197 @@ def _proces_tables(block_lines):
         else:
             unities.append("")
 
-    # Check if elements are numbers.
-    for ibl, lin in enumerate(blocks):
-        for i, row in enumerate(blocks[ibl]):
-            converted_row = []
-            for item in row:
-                try:
-                    # Convert if the numbers are floats.
-                    if _is_float(item): 
-                        converted_item = float(item)
-
-                except ValueError:
-                     # If it cannot be converted,
-                     # keep the original value.
-                    raise ValueError(
-                        f"Element at position ({i})"
-                        " in 'synthetic_spectrum' table cannot "
-                        "  be converted to a number."
-                    )
-                converted_row.append(converted_item)
-            blocks[ibl][i] = converted_row
-
-    # Create the 'synthetic_spectrum' table with dimensional units.
-    synthetic_spectrum_table = QTable(
-        rows=blocks[4], names=["l_obs", "f_obs", "f_syn", "weights"]
+    # The numeric and the string columns of the results are decoded apart
+    str_cols = [
+        i for i, title in enumerate(clean_title) if title in SL_STRING_COLUMNS
+    ]
+    num_cols = [i for i in range(len(clean_title)) if i not in str_cols]
+    columns = dict(
+        zip(
+            num_cols,
+            _decode_block(buffer, span, "synthetic_results", usecols=num_cols),
+        )
     )
-    
-    # Change: Add units to the 'l_obs' column.
-    synthetic_spectrum_table["l_obs"].unit = u.AA
-
-    spectra_dict = {
-        # Change: Use the table with units.
-        "synthetic_spectrum": synthetic_spectrum_table,
-        "synthetic_results": QTable(
-            rows=blocks[0], names=clean_title, units=unities
+    if str_cols:
+        columns.update(
+            zip(
+                str_cols,
+                _decode_block(
+                    buffer,
+                    span,
+                    "synthetic_results",
+                    usecols=str_cols,
+                    dtype=str,
+                ),
+            )
+        )
+
+    return _make_qtable(
+        [columns[i] for i in range(len(clean_title))],
+        names=clean_title,
+        units=unities,
+    )
+
+
+def _make_synthetic_spectrum(buffer, span):
+    """
+    Builds the 'synthetic_spectrum' table of a Starlight file.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file.
+    span : tuple of int
+        Byte span of the rows of the table.
+
+    Returns
+    -------
+    QTable
+        Table with the columns "l_obs" (in Angstrom), "f_obs", "f_syn" and
+        "weights".
+    """
+    l_obs, f_obs, f_syn, weights = _decode_block(
+        buffer, span, "synthetic_spectrum"
+    )
+
+    return _make_qtable(
+        [u.Quantity(l_obs, u.AA, copy=False), f_obs, f_syn, weights],
+        names=["l_obs", "f_obs", "f_syn", "weights"],
+    )
+
+
+def _make_chains_table(buffer, span, name):
+    """
+    Builds one of the 'results_average_chains_xj' or
+    'results_average_chains_mj' tables of a Starlight file.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file.
+    span : tuple of int
+        Byte span of the rows of the table.
+    name : str
+        Name of the table, used in the error message.
+
+    Returns
+    -------
+    QTable
+        Table with the columns "col0", "col1", ...
+    """
+    return _make_qtable(list(_decode_block(buffer, span, name)))
+
+
+def _make_av_chi2_mass(buffer, span):
+    """
+    Builds the 'results_average_chains_Av_chi2_mass' table of a Starlight
+    file.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file. Each row of the table starts with its
+        label (AV, chi2 or Mass) followed by one value per solution.
+    span : tuple of int
+        Byte span of the rows of the table.
+
+    Returns
+    -------
+    QTable
+        Table with the columns "AV", "ch2" and "Mass", and one row per
+        solution.
+    """
+    # The first column only holds the labels.
+    start, stop = span
+    first_row_end = buffer.find(b"\n", start, stop) + 1 or stop
+    first_row = buffer[start:first_row_end]
+    av_chi2_mass = _decode_block(
+        buffer,
+        span,
+        "results_average_chains_Av_chi2_mass",
+        usecols=range(1, len(first_row.split())),
+    )
+
+    return _make_qtable(list(av_chi2_mass.T), names=["AV", "ch2", "Mass"])
+
+
+def _proces_tables(buffer, block_titles, spans, path=None, lazy=()):
+    """
+    Processes the data blocks of a Starlight file and returns a dictionary
+    with four structured tables containing key information, such as the
+    synthetic spectrum and results.
+
+    Each block is decoded at once into float64 columns, except the columns
+    listed in 'SL_STRING_COLUMNS', which are kept as strings.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Content of the Starlight file.
+    block_titles : dict
+        Title line of each table, keyed by table name.
+    spans : dict
+        Byte span of the rows of each table, keyed by table name
+        (see '_split_starlight').
+    path : str, optional
+        Path to the Starlight file. Only used with 'lazy'.
+    lazy : container of str, optional
+        Names of the tables returned as 'Lazy' values, which map 'path'
+        again (or keep 'buffer' when there is no path) and decode their rows
+        on first access. The identity of the file is recorded now and
+        checked then (see '_build_from_file').
+
+    Returns
+    -------
+    dict
+        A dictionary with the following keys and values:
+        - **"synthetic_spectrum"** (*QTable*): Table with the columns "l_obs",
+            "f_obs", "f_syn", and "weights".
+        - **"synthetic_results"** (*QTable*): Table with synthetic results.
+        - **"results_average_chains_xj"** (*QTable*): Table with averages of
+            x_j chains.
+        - **"results_average_chains_mj"** (*QTable*): Table with averages of
+            m_j chains.
+        - **"results_average_chains_Av_chi2_mass"** (*QTable*): Table with
+            average values of Av, chi^2, and mass.
+
+    Raises
+    ------
+    ValueError
+        If a numeric element of a table cannot be converted to a number.
+    """
+    builders = {
+        "synthetic_spectrum": _make_synthetic_spectrum,
+        "synthetic_results": functools.partial(
+            _make_synthetic_results,
+            title=block_titles.get("synthetic_results"),
         ),
-        "results_average_chains_xj": QTable(rows=blocks[1]),
-        "results_average_chains_mj": QTable(rows=blocks[2]),
-        "results_average_chains_Av_chi2_mass": QTable(
-            rows=np.array(blocks[3]).T[1:],
-            names=["AV", "ch2", "Mass"],
+        "results_average_chains_xj": functools.partial(
+            _make_chains_table, name="results_average_chains_xj"
         ),
+        "results_average_chains_mj": functools.partial(
+            _make_chains_table, name="results_average_chains_mj"
+        ),
+        "results_average_chains_Av_chi2_mass": _make_av_chi2_mass,
     }
 
+    identity = buffers.file_identity(path) if lazy and path else None
+
+    spectra_dict = {}
+    for name, build in builders.items():
+        if name in lazy and path is None:
+            spectra_dict[name] = Lazy(
+                functools.partial(build, buffer, spans[name])
+            )
+        elif name in lazy:
+            spectra_dict[name] = Lazy(
+                functools.partial(
+                    _build_from_file, build, identity, spans[name]
+                )
+            )
+        else:
+            spectra_dict[name] = build(buffer, spans[name])
+
     return spectra_dict
 
 
@@ -280,23 +796,22 @@ def _get_ssp_contributions(tables_dict, xj_percent):
 
     Returns
     -------
-    pandas.DataFrame
-        DataFrame with the filtered and normalized SSP contributions. Includes
-        columns like "x_j" (normalized percentages) and "age_j"
+    numpy.ndarray
+        Structured array with the filtered and normalized SSP contributions,
+        one record per SSP and one field per column of the table. Includes
+        fields like "x_j" (normalized percentages) and "age_j"
         (stellar population ages).
     """
 
-    ssps_vector = tables_dict["synthetic_results"]
-    ssps_vector = (
-        ssps_vector.to_pandas()
-    )  # Convert QTable to a Pandas DataFrame.
+    table = tables_dict["synthetic_results"]
 
-    # Convert all columns to floats.
-    ssps_vector = ssps_vector.apply(pd.to_numeric, errors="coerce")
+    # The columns are copied without their units into one record array.
+    dtype = [(name, table[name].dtype) for name in table.colnames]
+    ssps_vector = np.empty(len(table), dtype=dtype)
+    for name in table.colnames:
+        ssps_vector[name] = table[name].value
 
-    ssps_vector = ssps_vector[ssps_vector["x_j"] > xj_percent].reset_index(
-        drop=True
-    )
+    ssps_vector = ssps_vector[ssps_vector["x_j"] > xj_percent]
     ssps_vector["x_j"] = (ssps_vector["x_j"] * 100) / ssps_vector["x_j"].sum()
 
     return ssps_vector
@@ -309,9 +824,9 @@ def _get_age(ssps_vector, age_decimals):
 
     Parameters
     ----------
-    ssps_vector : pandas.DataFrame
-        DataFrame containing SSP contributions.  Must include the columns
-        "x_j" (normalized contributions) and "age_j" (SSP ages).
+    ssps_vector : numpy.ndarray
+        Structured array containing SSP contributions. Must include the
+        fields "x_j" (normalized contributions) and "age_j" (SSP ages).
     age_decimals : int
         Number of decimals to round the calculated age.
 
@@ -321,9 +836,8 @@ def _get_age(ssps_vector, age_decimals):
         The weighted average age of the SSPs, rounded to the specified number
         of decimals.
     """
-    age = ((ssps_vector["x_j"] * ssps_vector["age_j"]).sum()) / (
-        ssps_vector["x_j"].sum()
-    )
+    x_j = ssps_vector["x_j"]
+    age = (x_j * ssps_vector["age_j"]).sum() / x_j.sum()
 
     age = round(age, age_decimals)
 
@@ -338,9 +852,9 @@ def _get_log_age(ssps_vector, age_decimals):
 
     Parameters
     ----------
-    ssps_vector : pandas.DataFrame
-        DataFrame containing SSP contributions. Must include the columns
-        "x_j" (normalized contributions) and "age_j" (SSP ages).
+    ssps_vector : numpy.ndarray
+        Structured array containing SSP contributions. Must include the
+        fields "x_j" (normalized contributions) and "age_j" (SSP ages).
     age_decimals : int
         Number of decimals to round the calculated logarithm of the age.
 
@@ -351,9 +865,8 @@ def _get_log_age(ssps_vector, age_decimals):
         rounded to the specified number of decimal places.
     """
 
-    l_age = ((ssps_vector["x_j"] * np.log10(ssps_vector["age_j"])).sum()) / (
-        ssps_vector["x_j"].sum()
-    )
+    x_j = ssps_vector["x_j"]
+    l_age = (x_j * np.log10(ssps_vector["age_j"])).sum() / x_j.sum()
 
     l_age = round(l_age, age_decimals)
 
@@ -368,9 +881,9 @@ def _get_error_age(ssps_vector, age, age_decimals):
 
     Parameters
     ----------
-    ssps_vector : pandas.DataFrame
-        DataFrame containing SSP contributions. Must include the columns "x_j"
-        (normalized contributions) and "age_j" (SSP ages).
+    ssps_vector : numpy.ndarray
+        Structured array containing SSP contributions. Must include the
+        fields "x_j" (normalized contributions) and "age_j" (SSP ages).
     age : float
         Calculated weighted average age.
     age_decimals : int
@@ -438,9 +951,10 @@ def _get_metallicity(ssps_vector, z_decimals):
 
     Parameters
     ----------
-    ssps_vector : pandas.DataFrame
-        DataFrame containing SSP contributions. Must include the columns "x_j"
-        (normalized contributions) and "Z_j" (SSP metallicities).
+    ssps_vector : numpy.ndarray
+        Structured array containing SSP contributions. Must include the
+        fields "x_j" (normalized contributions) and "Z_j" (SSP
+        metallicities).
     z_decimals : int
         Number of decimals to round the calculated metallicity value.
 
@@ -451,9 +965,8 @@ def _get_metallicity(ssps_vector, z_decimals):
         of decimal places.
     """
 
-    z_value = ((ssps_vector["x_j"] * ssps_vector["Z_j"])).sum() / ssps_vector[
-        "x_j"
-    ].sum()
+    x_j = ssps_vector["x_j"]
+    z_value = (x_j * ssps_vector["Z_j"]).sum() / x_j.sum()
     z_value = round(z_value, z_decimals)
 
     return z_value
@@ -466,9 +979,10 @@ def _get_z_values(ssps_vector):
 
     Parameters
     ----------
-    ssps_vector : pandas.DataFrame
-        DataFrame containing SSP contributions. Must include the columns "x_j"
-        (normalized contributions) and "Z_j" (SSP metallicities).
+    ssps_vector : numpy.ndarray
+        Structured array containing SSP contributions. Must include the
+        fields "x_j" (normalized contributions) and "Z_j" (SSP
+        metallicities).
 
     Returns
     -------
@@ -478,11 +992,11 @@ def _get_z_values(ssps_vector):
         - **'z_ssp_max'** (*float*): Maximum metallicity value.
         - **'z_ssp_min'** (*float*): Minimum metallicity value.
     """
-    max_xj_index = ssps_vector["x_j"].idxmax()
-    min_xj_index = ssps_vector["x_j"].idxmin()
+    max_xj_index = ssps_vector["x_j"].argmax()
+    min_xj_index = ssps_vector["x_j"].argmin()
 
-    z_ssp_max = float(ssps_vector.loc[max_xj_index, "Z_j"])
-    z_ssp_min = float(ssps_vector.loc[min_xj_index, "Z_j"])
+    z_ssp_max = float(ssps_vector["Z_j"][max_xj_index])
+    z_ssp_min = float(ssps_vector["Z_j"][min_xj_index])
 
     z_values = {"z_ssp_max": z_ssp_max, "z_ssp_min": z_ssp_min}
 
@@ -554,9 +1068,9 @@ def _get_starlight_extra_info(ssps_vector, header_info):
 
     Parameters
     ----------
-    ssps_vector : pandas.DataFrame
-        DataFrame containing SSP contributions. Includes columns like "x_j"
-        (normalized contributions) and "Z_j" (metallicities).
+    ssps_vector : numpy.ndarray
+        Structured array containing SSP contributions. Includes fields like
+        "x_j" (normalized contributions) and "Z_j" (metallicities).
     header_info : dict
         Dictionary containing the Starlight file header information. Must
         include keys such as "v0_min", "vd_min", "chi2_Nl_eff", and "adev".
@@ -594,11 +1108,45 @@ def _get_starlight_extra_info(ssps_vector, header_info):
     return starlight_particular_info
 
 
+def _make_residual_spectrum(qtable, spectral_axis, wcs):
+    """
+    Creates the residual spectrum, f_obs - f_syn, of a "synthetic_spectrum"
+    table.
+
+    Parameters
+    ----------
+    qtable : QTable
+        Table with the columns "f_obs" and "f_syn".
+    spectral_axis : SpectralAxis
+        Spectral axis shared with the other spectra of the table.
+    wcs : gwcs.WCS
+        World coordinates of 'spectral_axis', shared too.
+
+    Returns
+    -------
+    Spectrum1D
+        The residual spectrum.
+    """
+    # residual_flux = (flux_obs - flux_syn) / flux_obs
+    residual_flux = qtable["f_obs"].data - qtable["f_syn"].data
+
+    return Spectrum1D(
+        flux=u.Quantity(residual_flux, u.dimensionless_unscaled, copy=False),
+        spectral_axis=spectral_axis,
+        wcs=wcs,
+    )
+
+
 def _make_spectrum1d_from_qtable(qtable):
     """
     Creates 'Spectrum1D' objects from a 'QTable' containing data for
     synthetic, observed, and residual spectra.
 
+    The spectra are views of the table: the fluxes are its columns, not
+    copies, and the three spectra share a single spectral axis built on its
+    "l_obs" column, and a single WCS. The residual spectrum is the only one
+    that needs new memory, so it is computed the first time it is accessed.
+
     Parameters
     ----------
     qtable : QTable
@@ -617,32 +1165,31 @@ def _make_spectrum1d_from_qtable(qtable):
 
         - **'synthetic_spectrum'** (*Spectrum1D*): Synthetic spectrum.
         - **'observed_spectrum'** (*Spectrum1D*): Observed spectrum.
-        - **'residual_spectrum'** (*Spectrum1D*): Residual spectrum calculated
-            as (f_obs - f_syn) / f_obs.
+        - **'residual_spectrum'** (*Lazy*): Residual spectrum calculated
+            as f_obs - f_syn.
     """
+    with profiling.stage("read_starlight", "spectra") as current:
+        spectral_axis = SpectralAxis(qtable["l_obs"], copy=False)
+        wcs = gwcs_from_array(spectral_axis, spectral_axis.shape)
+
+        def view(name):
+            flux = qtable[name].data  # the column without units, not a copy
+            return Spectrum1D(
+                flux=u.Quantity(flux, u.dimensionless_unscaled, copy=False),
+                spectral_axis=spectral_axis,
+                wcs=wcs,
+            )
 
-    # Extract the necessary columns
-    wavelength = qtable["l_obs"]
-    flux_obs = qtable["f_obs"].data  # Extract data without units
-    flux_syn = qtable["f_syn"].data  # Extract data without units
-
-    # Calculate the residual flux
-    # residual_flux = (flux_obs - flux_syn) / flux_obs
-    residual_flux = flux_obs - flux_syn
-
-    # Create the Spectrum1D objects
-    spectra = {
-        "synthetic_spectrum": Spectrum1D(
-            flux=flux_syn * u.dimensionless_unscaled, spectral_axis=wavelength
-        ),
-        "observed_spectrum": Spectrum1D(
-            flux=flux_obs * u.dimensionless_unscaled, spectral_axis=wavelength
-        ),
-        "residual_spectrum": Spectrum1D(
-            flux=residual_flux * u.dimensionless_unscaled,
-            spectral_axis=wavelength,
-        ),
-    }
+        spectra = {
+            "synthetic_spectrum": view("f_syn"),
+            "observed_spectrum": view("f_obs"),
+            "residual_spectrum": Lazy(
+                functools.partial(
+                    _make_residual_spectrum, qtable, spectral_axis, wcs
+                )
+            ),
+        }
+        current.count(rows=len(qtable))
 
     return spectra
 
@@ -678,14 +1225,117 @@ def _get_spectra(data):
     return spectra
 
 
+def _build_spectra(data):
+    """
+    Builds the spectra of '_get_spectra' from a "synthetic_spectrum" table
+    that may be a 'Lazy' value.
+
+    Parameters
+    ----------
+    data : dict
+        Dictionary containing tabular data.
+
+    Returns
+    -------
+    dict
+        The 'Spectrum1D' objects, keyed by the names in 'SL_SPECTRA_NAMES'.
+    """
+    table = data["synthetic_spectrum"]
+    if isinstance(table, Lazy):
+        table = table()
+    return _make_spectrum1d_from_qtable(table)
+
+
+def _pick_spectrum(spectra, name):
+    """Returns one of the spectra built by a 'Lazy' '_build_spectra'."""
+    spectrum = spectra()[name]
+    return spectrum() if isinstance(spectrum, Lazy) else spectrum
+
+
+def _get_lazy_spectra(data):
+    """
+    Same as '_get_spectra', but the spectra are 'Lazy' values. The three
+    spectra are built together the first time one of them is accessed.
+
+    The 'Lazy' values only hold module functions, so the summary can be
+    pickled (e.g. to send it back from another process).
+
+    Parameters
+    ----------
+    data : dict
+        Dictionary containing tabular data. The "synthetic_spectrum" table
+        may itself be a 'Lazy' value.
+
+    Returns
+    -------
+    dict
+        A dictionary with the names in 'SL_SPECTRA_NAMES' as keys and
+        'Lazy' values that build each 'Spectrum1D'.
+    """
+    spectra = Lazy(functools.partial(_build_spectra, data))
+
+    return {
+        name: Lazy(functools.partial(_pick_spectrum, spectra, name))
+        for name in SL_SPECTRA_NAMES
+    }
+
+
+def scan_starlight_headers(paths):
+    """
+    Reads only the header of many Starlight files and collects it in one
+    table, without parsing the results tables nor the synthetic spectrum.
+
+    Each file is read until the first row of its synthetic spectrum. The
+    header lines are processed by '_proces_header', so the column names
+    are the same keys as in 'SpectralSummary.header'.
+
+    Parameters
+    ----------
+    paths : str, path-like or iterable of them
+        A directory (all its '*.out' files), a glob expression, a single
+        file or an iterable of files.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per file, indexed by path, and one column per header key
+        (e.g. 'AV_min', 'v0_min', 'vd_min', 'chi2_Nl_eff', 'adev',
+        'l_norm', 'S_N_in_S_N_window', 'arq_obs'). Numeric values are
+        float64, dates are datetime64 and texts are objects. Keys missing
+        in a file are NaN.
+    """
+    index, records = [], []
+    for path in buffers.resolve_paths(paths, "*.out"):
+        with buffers.open_mapped(path) as buffer:
+            header_lines, _, _ = _split_starlight(buffer)
+        index.append(str(path))
+        records.append(_proces_header(header_lines))
+
+    headers = pd.DataFrame.from_records(
+        records, index=pd.Index(index, name="path")
+    )
+
+    # Values like 'NAN' are kept as text by '_proces_header', so a column
+    # mixing them with numbers is converted to float.
+    for column in headers.select_dtypes(exclude=["number", "datetime"]):
+        try:
+            headers[column] = headers[column].astype(np.float64)
+        except (ValueError, TypeError):
+            pass
+
+    return headers
+
+
+@cache.cached_reader
 def read_starlight(
-    path,
+    path_or_buffer,
     *,
     xj_percent=5,
     age_decimals=2,
     rv=3.1,
     z_decimals=3,
     object_name="object_1",
+    lazy=False,
 ):
     """
     Processes a Starlight file, extracting the header, data tables, and
@@ -694,8 +1344,13 @@ def read_starlight(
 
     Parameters
     ----------
-    path : str
-        Path to the Starlight file to process.
+    path_or_buffer : str, path-like, bytes or file-like
+        Path to the Starlight file to process, its content, or an object
+        with a 'read' method (an open file, a pipe, ...). Content compressed
+        with gzip, bzip2 or xz is decompressed while it is read. Plain files
+        are memory-mapped, but streams and compressed content are copied
+        whole into memory (see 'buffers._spool'), so reading them takes as
+        much memory as the decompressed file.
     xj_percent : float, optional
         Minimum SSP contribution percentage to include in the calculation.
         Default: 5.
@@ -711,6 +1366,17 @@ def read_starlight(
     object_name : str, optional
         Name of the analyzed object.
         Default: "object_1".
+    lazy : bool, optional
+        If True, only the header and the 'synthetic_results' table are
+        parsed while reading, which is enough for all the scalar values.
+        The byte offsets of the other tables are stored and the tables
+        ('synthetic_spectrum' and the chains tables) and the spectra are
+        built from the file the first time they are accessed, which raises
+        a ValueError if the file was modified or replaced in between.
+        Compressed files are decompressed again for each of these tables.
+        Buffers and streams, which cannot be read again, are kept in memory
+        instead.
+        Default: False.
 
     Returns
     -------
@@ -722,45 +1388,63 @@ def read_starlight(
         - Key values such as age, metallicity, and reddening.
         - Processed tables with results.
     """
-    
+
     obj_name = object_name
 
-    header_lines, block_lines = [], []
-    with open(path) as starfile:
-        for d, starline in enumerate(starfile):
-            if re.findall(SL_GET_TITLE_VALUE, starline):
-                header_lines.append(starline)
-            else:
-                block_lines.append(starline)
+    path = (
+        path_or_buffer
+        if isinstance(path_or_buffer, (str, os.PathLike))
+        else None
+    )
+
+    with buffers.open_mapped(path_or_buffer) as buffer:
+        with profiling.stage("read_starlight", "split") as current:
+            header_lines, block_titles, spans = _split_starlight(buffer)
+            # the scan stops at the first row of the synthetic spectrum
+            scanned, _ = spans.get("synthetic_spectrum", (len(buffer), None))
+            current.count(nbytes=scanned, rows=len(header_lines))
 
-    header_info = _proces_header(header_lines)
+        tables_dict = _proces_tables(
+            buffer,
+            block_titles,
+            spans,
+            path,
+            lazy=SL_LAZY_TABLES if lazy else (),
+        )
 
-    tables_dict = _proces_tables(block_lines)
+    with profiling.stage("read_starlight", "header") as current:
+        header_info = _proces_header(header_lines)
+        current.count(rows=len(header_lines))
 
-    ssps_vector = _get_ssp_contributions(tables_dict, xj_percent)
+    with profiling.stage("read_starlight", "properties") as current:
+        ssps_vector = _get_ssp_contributions(tables_dict, xj_percent)
 
-    age = _get_age(ssps_vector, age_decimals)
+        age = _get_age(ssps_vector, age_decimals)
 
-    err_age = _get_error_age(ssps_vector, age, age_decimals)
+        err_age = _get_error_age(ssps_vector, age, age_decimals)
 
-    reddening_value, av_value = _get_reddening(header_info, rv)
+        reddening_value, av_value = _get_reddening(header_info, rv)
 
-    normalization_point = header_info["l_norm"]
+        normalization_point = header_info["l_norm"]
 
-    z_value = _get_metallicity(ssps_vector, z_decimals)
+        z_value = _get_metallicity(ssps_vector, z_decimals)
 
-    synthesis_info = _get_starlight_extra_info(ssps_vector, header_info)
+        synthesis_info = _get_starlight_extra_info(ssps_vector, header_info)
 
-    spectra = _get_spectra(tables_dict)
+        l_age = _get_log_age(ssps_vector, age_decimals)
 
-    l_age = _get_log_age(ssps_vector, age_decimals)
+        current.count(rows=len(tables_dict["synthetic_results"]))
+
+    spectra = (
+        _get_lazy_spectra(tables_dict) if lazy else _get_spectra(tables_dict)
+    )
 
     extra_info = {
         "xj_percent": xj_percent,
         "age_decimals": age_decimals,
         "rv": rv,
         "z_decimals": z_decimals,
-        "ssps_vector": ssps_vector,
+        "ssps_vector": Lazy(functools.partial(pd.DataFrame, ssps_vector)),
         "synthesis_info": synthesis_info,
         "average_log_age": l_age,
     }
@@ -778,3 +1462,488 @@ def read_starlight(
         spectra=spectra,
         extra_info=extra_info,
     )
+
+
+def _sweep_ssp_values(ssps, xj_percent, age_decimals, z_decimals):
+    """
+    Vectorized version of '_get_ssp_contributions', '_get_age',
+    '_get_error_age', '_get_log_age' and '_get_metallicity' over many
+    'xj_percent' cutoffs.
+
+    Parameters
+    ----------
+    ssps : QTable
+        The 'synthetic_results' table of a Starlight file.
+    xj_percent : numpy.ndarray
+        Minimum SSP contribution percentages, one per cutoff.
+    age_decimals : int
+        Number of decimals to round the age values.
+    z_decimals : int
+        Number of decimals to round the metallicity.
+
+    Returns
+    -------
+    dict
+        Arrays with one value per cutoff, keyed by "age", "err_age",
+        "average_log_age" and "z_value". A cutoff that leaves no SSP gives
+        NaN.
+    """
+    x_j = np.asarray(ssps["x_j"].value, dtype=np.float64)
+    age_j = np.asarray(ssps["age_j"].value, dtype=np.float64)
+    z_j = np.asarray(ssps["Z_j"].value, dtype=np.float64)
+
+    # One row per cutoff; the SSPs under the cutoff weight zero.
+    weights = np.where(x_j > xj_percent[:, np.newaxis], x_j, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weights = weights * 100 / weights.sum(axis=1, keepdims=True)
+        total = weights.sum(axis=1)
+
+        age = np.round((weights * age_j).sum(axis=1) / total, age_decimals)
+        variance = (weights * (age_j - age[:, np.newaxis]) ** 2).sum(axis=1)
+        err_age = np.round(np.sqrt(variance / total), age_decimals)
+        l_age = np.round(
+            (weights * np.log10(age_j)).sum(axis=1) / total, age_decimals
+        )
+        z_value = np.round((weights * z_j).sum(axis=1) / total, z_decimals)
+
+    return {
+        "age": age,
+        "err_age": err_age,
+        "average_log_age": l_age,
+        "z_value": z_value,
+    }
+
+
+def sweep_starlight(
+    summary_or_path,
+    *,
+    xj_percent=None,
+    rv=None,
+    age_decimals=None,
+    z_decimals=None,
+):
+    """
+    Recomputes the age, metallicity and reddening of a Starlight result for
+    a grid of 'xj_percent' and 'rv' values.
+
+    The 'synthetic_results' table is parsed once and the values of every
+    point of the grid are evaluated together with array operations, instead
+    of calling 'read_starlight' for each setting.
+
+    Parameters
+    ----------
+    summary_or_path : core.SpectralSummary or str
+        A summary returned by 'read_starlight', or the path to a Starlight
+        file, which is read with 'lazy=True'.
+    xj_percent : float or sequence of float, optional
+        Minimum SSP contribution percentages.
+        Default: the value used to build the summary.
+    rv : float or sequence of float, optional
+        Reddening parameters (R_v).
+        Default: the value used to build the summary.
+    age_decimals : int, optional
+        Number of decimals to round age calculations.
+        Default: the value used to build the summary.
+    z_decimals : int, optional
+        Number of decimal places to round metallicity calculations.
+        Default: the value used to build the summary.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per combination of 'xj_percent' and 'rv', with the columns
+        "xj_percent", "rv", "age", "err_age", "average_log_age", "z_value",
+        "reddening" and "av_value". Each value is the same that
+        'read_starlight' gives for that setting.
+    """
+    summary = summary_or_path
+    if not isinstance(summary, core.SpectralSummary):
+        summary = read_starlight(summary, lazy=True)
+
+    extra_info = summary.extra_info
+    xj_percent = np.atleast_1d(
+        extra_info["xj_percent"] if xj_percent is None else xj_percent
+    ).astype(np.float64)
+    rv = np.atleast_1d(extra_info["rv"] if rv is None else rv).astype(
+        np.float64
+    )
+    age_decimals = (
+        extra_info["age_decimals"] if age_decimals is None else age_decimals
+    )
+    z_decimals = extra_info["z_decimals"] if z_decimals is None else z_decimals
+
+    ssp_values = _sweep_ssp_values(
+        summary.data["synthetic_results"],
+        xj_percent,
+        age_decimals,
+        z_decimals,
+    )
+    av_value = float(summary.header["AV_min"])
+
+    # Every xj_percent cutoff is repeated for each rv value.
+    n_rv = len(rv)
+    sweep = {
+        "xj_percent": np.repeat(xj_percent, n_rv),
+        "rv": np.tile(rv, len(xj_percent)),
+    }
+    sweep.update(
+        (name, np.repeat(values, n_rv)) for name, values in ssp_values.items()
+    )
+    sweep["reddening"] = av_value / sweep["rv"]
+    sweep["av_value"] = np.full(len(sweep["rv"]), av_value)
+
+    return pd.DataFrame(sweep)
+
+
+def _chain_moments(x_j, age_j, z_j, xj_percent):
+    """
+    Weighted mean and spread of the age, log-age and metallicity of many
+    SSP population vectors at once.
+
+    The vectors are filtered and normalized as in '_get_ssp_contributions'.
+
+    Parameters
+    ----------
+    x_j : numpy.ndarray
+        Contributions, with shape (n_summaries, n_vectors, n_ssps). Padding
+        SSPs must be zero.
+    age_j, z_j : numpy.ndarray
+        Ages and metallicities of the SSPs, with shape
+        (n_summaries, 1, n_ssps). Padding ages must be positive.
+    xj_percent : numpy.ndarray
+        Minimum contribution of each summary, with shape (n_summaries, 1, 1).
+
+    Returns
+    -------
+    dict
+        Arrays with shape (n_summaries, n_vectors), keyed by "age",
+        "log_age" and "z_value" (weighted means) and by "age_var",
+        "log_age_var" and "z_value_var" (weighted variances). Vectors with
+        no SSP over the cutoff give NaN.
+    """
+    weights = np.where(x_j > xj_percent, x_j, 0.0)
+
+    moments = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weights = weights * 100 / weights.sum(axis=-1, keepdims=True)
+        total = weights.sum(axis=-1)
+
+        for name, values in (
+            ("age", age_j),
+            ("log_age", np.log10(age_j)),
+            ("z_value", z_j),
+        ):
+            mean = (weights * values).sum(axis=-1) / total
+            spread = (values - mean[..., np.newaxis]) ** 2
+            moments[name] = mean
+            moments[f"{name}_var"] = (weights * spread).sum(axis=-1) / total
+
+    return moments
+
+
+def summarize_starlight_chains(summaries, *, xj_percent=None):
+    """
+    Computes chain-based uncertainties of the age, log-age, metallicity and
+    extinction of one or many Starlight results.
+
+    Starlight writes the SSP contributions of the best model, their average
+    and the last values of each Markov chain ('results_average_chains_xj')
+    together with the AV of each of them
+    ('results_average_chains_Av_chi2_mass'). The age, log-age and Z of
+    every chain are obtained weighting the SSPs of 'synthetic_results' with
+    the chain contributions, as '_get_age' and '_get_metallicity' do for the
+    best model.
+
+    All the summaries are evaluated in a single array pass: the chains of
+    every summary are padded into one (n_summaries, n_chains, n_ssps)
+    array.
+
+    Starlight keeps only the last state of each chain, so the
+    Gelman-Rubin statistic, which needs the samples of every chain, cannot
+    be computed. The spread ratio sqrt(1 + B / W) is given instead as a
+    heuristic of the agreement between the chains: B is the variance of
+    the chain values and W is the weighted spread of the SSPs of each chain
+    solution (the one 'err_age' uses for the best model), averaged over the
+    chains. It is 1 when the chains agree exactly and grows as they drift
+    apart compared with the spread of their SSPs, but it is not a
+    convergence test. AV has no spread within a chain, so it has no ratio.
+
+    Parameters
+    ----------
+    summaries : core.SpectralSummary, str, path-like or iterable of them
+        Summaries returned by 'read_starlight', or Starlight files, which
+        are read with 'lazy=True': a directory (all its '*.out' files), a
+        glob expression, a single file or an iterable of files and
+        summaries.
+    xj_percent : float, optional
+        Minimum SSP contribution percentage to include in the calculation.
+        Default: the value used to build each summary.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per summary, with the columns "obj_name" and "n_chains"
+        and, for each of "age", "log_age", "z_value" and "av_value", the
+        columns "<name>_best" (best model), "<name>_mean", "<name>_std"
+        (standard deviation across chains), "<name>_min" and "<name>_max".
+        "age_spread_ratio", "log_age_spread_ratio" and
+        "z_value_spread_ratio" hold the spread ratios. Ages and
+        metallicities are not rounded.
+    """
+    if isinstance(summaries, core.SpectralSummary):
+        summaries = [summaries]
+
+    summaries = [
+        (
+            summary
+            if isinstance(summary, core.SpectralSummary)
+            else read_starlight(summary, lazy=True)
+        )
+        for summary in buffers.resolve_paths(summaries, "*.out")
+    ]
+
+    # Chain tables of every summary, as (n_ssps, n_columns) arrays, and the
+    # AV of the best model, the average and each chain.
+    chains_xj, chains_av = [], []
+    for summary in summaries:
+        table = summary.data["results_average_chains_xj"]
+        chains_xj.append(
+            np.column_stack([table[c].value for c in table.colnames])
+        )
+        table = summary.data["results_average_chains_Av_chi2_mass"]
+        chains_av.append(table["AV"].value)
+
+    n_summaries = len(summaries)
+    n_ssps = max((len(xj) for xj in chains_xj), default=0)
+    n_chains = np.array([xj.shape[1] - 3 for xj in chains_xj], dtype=int)
+    max_chains = max(n_chains, default=0)
+
+    # The first vector of each summary is the best model, then the chains.
+    # Missing SSPs have no contribution and missing chains are NaN.
+    x_j = np.zeros((n_summaries, max_chains + 1, n_ssps))
+    av = np.full((n_summaries, max_chains + 1), np.nan)
+    age_j = np.ones((n_summaries, 1, n_ssps))
+    z_j = np.zeros((n_summaries, 1, n_ssps))
+    percent = np.empty((n_summaries, 1, 1))
+
+    for i, (summary, xj, av_j) in enumerate(
+        zip(summaries, chains_xj, chains_av)
+    ):
+        n, chains = len(xj), slice(1, n_chains[i] + 1)
+        # column 1 is the best model, 2 the average and the rest the chains
+        x_j[i, 0, :n] = xj[:, 1]
+        x_j[i, chains, :n] = xj[:, 3:].T
+        av[i, 0] = av_j[0]
+        av[i, chains] = av_j[2:]
+
+        results = summary.data["synthetic_results"]
+        age_j[i, 0, :n] = results["age_j"].value
+        z_j[i, 0, :n] = results["Z_j"].value
+        percent[i] = (
+            summary.extra_info["xj_percent"]
+            if xj_percent is None
+            else xj_percent
+        )
+
+    moments = _chain_moments(x_j, age_j, z_j, percent)
+    moments["av_value"] = av
+
+    stats = {
+        "obj_name": [summary.obj_name for summary in summaries],
+        "n_chains": n_chains,
+    }
+    with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+        # summaries without valid chains give NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+
+        for name in ("age", "log_age", "z_value", "av_value"):
+            best, chains = moments[name][:, 0], moments[name][:, 1:]
+            stats[f"{name}_best"] = best
+            stats[f"{name}_mean"] = np.nanmean(chains, axis=1)
+            stats[f"{name}_std"] = np.nanstd(chains, axis=1, ddof=1)
+            stats[f"{name}_min"] = np.nanmin(chains, axis=1)
+            stats[f"{name}_max"] = np.nanmax(chains, axis=1)
+
+        for name in ("age", "log_age", "z_value"):
+            within = np.nanmean(moments[f"{name}_var"][:, 1:], axis=1)
+            between = stats[f"{name}_std"] ** 2
+            # chains that agree exactly have no spread at all
+            stats[f"{name}_spread_ratio"] = np.where(
+                between == 0, 1.0, np.sqrt(1 + between / within)
+            )
+
+    return pd.DataFrame(stats)
+
+
+def _pack_table(table):
+    """
+    Splits a table into its column names, arrays and units, which are much
+    cheaper to pickle than the 'QTable' itself.
+
+    Parameters
+    ----------
+    table : QTable or Lazy
+        A table of a summary. 'Lazy' tables are returned as they are.
+
+    Returns
+    -------
+    tuple or Lazy
+        '(names, arrays, units)' of the table.
+    """
+    if isinstance(table, Lazy):
+        return table
+    names = table.colnames
+    arrays = [np.asarray(table[name].value) for name in names]
+    units = [getattr(table[name], "unit", None) for name in names]
+    return names, arrays, units
+
+
+def _unpack_table(names, arrays, units):
+    """Builds back a table split by '_pack_table'."""
+    return QTable(arrays, names=names, units=units, copy=False)
+
+
+def _read_starlight_worker(path, compact, read_kwargs):
+    """
+    Reads one Starlight file in a worker process of 'read_starlight_many'.
+
+    The file is read with the caller's 'lazy' (with 'lazy=True' when
+    'compact', which only needs the scalar values), so the caches of the
+    readers are used as in 'read_starlight'. Unless the caller asked for
+    lazy summaries, every table is parsed (or loaded from the cache) here
+    and sent back as plain arrays (see '_pack_table'). 'Spectrum1D' objects
+    cannot be pickled, so the spectra are built in the calling process when
+    first accessed.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Path to the Starlight file.
+    compact : bool
+        If True, only the scalar values of the summary are returned.
+    read_kwargs : dict
+        Keyword arguments of 'read_starlight'.
+
+    Returns
+    -------
+    dict
+        The fields of the summary, with the tables packed and without the
+        spectra, or only its scalar values when 'compact'
+        (see 'SL_COMPACT_COLUMNS').
+    """
+    lazy = read_kwargs.get("lazy", False)
+    if compact:
+        read_kwargs = {**read_kwargs, "lazy": True}
+    summary = read_starlight(path, **read_kwargs)
+
+    if compact:
+        return {
+            "path": str(path),
+            "obj_name": summary.obj_name,
+            "age": summary.age,
+            "err_age": summary.err_age,
+            "average_log_age": summary.extra_info["average_log_age"],
+            "z_value": summary.z_value,
+            "reddening": summary.reddening,
+            "av_value": summary.av_value,
+            "normalization_point": summary.normalization_point,
+        }
+
+    if not lazy:
+        # summaries loaded from a cache build their values on access
+        for bunch in (summary.data, summary.extra_info):
+            for name in bunch:
+                bunch[name]  # builds the value and keeps it
+
+    fields = attrs.asdict(summary, recurse=False)
+    fields["data"] = {
+        name: _pack_table(table) for name, table in summary.data._data.items()
+    }
+    fields["header"] = dict(summary.header._data)
+    fields["extra_info"] = dict(summary.extra_info._data)
+    del fields["spectra"]
+
+    return fields
+
+
+def _unpack_summary(fields):
+    """
+    Builds the summary sent back by '_read_starlight_worker'. The tables
+    are built when first accessed, like the spectra.
+    """
+    data = {
+        name: (
+            table
+            if isinstance(table, Lazy)
+            else Lazy(functools.partial(_unpack_table, *table))
+        )
+        for name, table in fields["data"].items()
+    }
+    return core.SpectralSummary(
+        **{**fields, "data": data, "spectra": _get_lazy_spectra(data)}
+    )
+
+
+def read_starlight_many(
+    paths, *, workers=None, chunksize=1, compact=False, **read_kwargs
+):
+    """
+    Reads many Starlight files in parallel with a pool of processes.
+
+    Parameters
+    ----------
+    paths : str, path-like or iterable of them
+        A directory (all its '*.out' files), a glob expression, a single
+        file or an iterable of files.
+    workers : int, optional
+        Number of processes. With 1 the files are read in this process.
+        Default: the number of CPUs.
+    chunksize : int, optional
+        Number of files sent to a process at once. Larger values reduce
+        the communication between processes for large batches of small
+        files.
+        Default: 1.
+    compact : bool, optional
+        If True, only the scalar values of each summary are sent back from
+        the processes, and they are returned as one table.
+        Default: False.
+    **read_kwargs
+        Keyword arguments of 'read_starlight' (e.g. 'xj_percent', 'rv' or
+        'lazy').
+
+    Returns
+    -------
+    list of core.SpectralSummary or pandas.DataFrame
+        The summaries, in the same order as 'paths'. Their tables are parsed
+        by the processes, but the 'QTable' objects and the spectra are
+        built the first time they are accessed. The on-disk cache of the
+        readers (see 'spyctral.cache') is used by every process; the
+        in-memory cache only when the files are read in this process.
+        When 'compact', a table indexed by path with the columns
+        "obj_name", "age", "err_age", "average_log_age", "z_value",
+        "reddening", "av_value" and "normalization_point".
+    """
+    paths = buffers.resolve_paths(paths, "*.out")
+    read = functools.partial(
+        _read_starlight_worker, compact=compact, read_kwargs=read_kwargs
+    )
+
+    workers = os.cpu_count() if workers is None else workers
+    if workers == 1 or len(paths) <= 1:
+        results = list(map(read, paths))
+    else:
+        # the in-memory cache of a process would only hold what it reads,
+        # and its copies refer to values that cannot be sent back
+        with cf.ProcessPoolExecutor(
+            max_workers=workers, initializer=cache.disable_memory
+        ) as executor:
+            results = list(executor.map(read, paths, chunksize=chunksize))
+
+    if compact:
+        records = pd.DataFrame.from_records(
+            results, columns=SL_COMPACT_COLUMNS
+        )
+        return records.set_index("path")
+
+    return [_unpack_summary(fields) for fields in results]
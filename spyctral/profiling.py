@@ -0,0 +1,288 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Opt-in instrumentation of the stages of the Spyctral readers.
+
+While 'instrument' is active, 'read_starlight' and 'read_fisa' report the
+wall time, the bytes read and the rows parsed by each of their stages
+(splitting the file, parsing the header, decoding the tables, building the
+'QTable' objects, computing the properties and building the spectra). The
+reports are added up by reader and stage, so a batch of files gives one
+row per stage::
+
+    >>> import spyctral
+    >>> with spyctral.instrument() as profile:
+    ...     summaries = [spyctral.read_starlight(p) for p in paths]
+    >>> profile.to_dataframe()
+
+A callback receives every report as soon as it is made, e.g. to log it::
+
+    >>> with spyctral.instrument(on_stage=print):
+    ...     spyctral.read_fisa(path)
+
+When no instrument is active, each stage costs a function call that
+returns a shared no-op object. Only the stages run in this process are
+reported: the worker processes of 'read_starlight_many' are not
+instrumented. The tables and spectra of lazy summaries report their
+stages when they are built, if an instrument is active at that moment.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import contextlib
+import threading
+import time
+
+import attrs
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Profiles of the active instruments, innermost last (see 'instrument').
+_PROFILES = ()
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+@attrs.frozen
+class StageEvent:
+    """
+    Report of one run of a stage of a reader.
+
+    Attributes
+    ----------
+    reader : str
+        Name of the reader (e.g. "read_starlight").
+    stage : str
+        Name of the stage (e.g. "decode").
+    seconds : float
+        Wall time of the stage.
+    nbytes : int
+        Bytes of the input read by the stage.
+    rows : int
+        Rows (lines or table rows) parsed or produced by the stage.
+    """
+
+    reader: str
+    stage: str
+    seconds: float
+    nbytes: int = 0
+    rows: int = 0
+
+
+@attrs.define
+class StageStats:
+    """
+    Totals of the runs of a stage of a reader.
+
+    Attributes
+    ----------
+    calls : int
+        Number of runs.
+    seconds : float
+        Total wall time.
+    nbytes : int
+        Total bytes read.
+    rows : int
+        Total rows parsed.
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    nbytes: int = 0
+    rows: int = 0
+
+
+@attrs.define
+class Profile:
+    """
+    Totals of the stages reported while an instrument is active.
+
+    Attributes
+    ----------
+    on_stage : callable or None
+        Called with each 'StageEvent' as it is reported.
+    stages : dict
+        'StageStats' of each stage, keyed by '(reader, stage)' in the
+        order the stages were first reported.
+    """
+
+    on_stage: object = None
+    stages: dict = attrs.field(factory=dict)
+    _lock: threading.Lock = attrs.field(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+
+    def record(self, event):
+        """
+        Adds a report to the totals and passes it to 'on_stage'.
+
+        Parameters
+        ----------
+        event : StageEvent
+            The report.
+        """
+        with self._lock:
+            stats = self.stages.get((event.reader, event.stage))
+            if stats is None:
+                stats = self.stages[event.reader, event.stage] = StageStats()
+            stats.calls += 1
+            stats.seconds += event.seconds
+            stats.nbytes += event.nbytes
+            stats.rows += event.rows
+
+        if self.on_stage is not None:
+            self.on_stage(event)
+
+    def clear(self):
+        """Removes the totals."""
+        with self._lock:
+            self.stages.clear()
+
+    def to_dataframe(self):
+        """
+        Builds a table with the totals of each stage.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per stage, indexed by "reader" and "stage", with the
+            columns "calls", "seconds", "nbytes" and "rows".
+        """
+        import pandas as pd  # only needed for the report
+
+        with self._lock:
+            records = [
+                (reader, stage, s.calls, s.seconds, s.nbytes, s.rows)
+                for (reader, stage), s in self.stages.items()
+            ]
+        df = pd.DataFrame.from_records(
+            records,
+            columns=["reader", "stage", "calls", "seconds", "nbytes", "rows"],
+        )
+        return df.set_index(["reader", "stage"])
+
+
+class _Stage:
+    """Times a stage and reports it to the active profiles."""
+
+    __slots__ = ("_profiles", "_reader", "_name", "_start", "nbytes", "rows")
+
+    def __init__(self, profiles, reader, name):
+        self._profiles = profiles
+        self._reader = reader
+        self._name = name
+        self.nbytes = self.rows = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        event = StageEvent(
+            reader=self._reader,
+            stage=self._name,
+            seconds=time.perf_counter() - self._start,
+            nbytes=self.nbytes,
+            rows=self.rows,
+        )
+        for profile in self._profiles:
+            profile.record(event)
+        return False
+
+    def count(self, *, nbytes=0, rows=0):
+        """Adds bytes read and rows parsed to the report of the stage."""
+        self.nbytes += nbytes
+        self.rows += rows
+
+
+class _NullStage:
+    """Stage returned while no instrument is active. Does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def count(self, *, nbytes=0, rows=0):
+        """Does nothing."""
+
+
+_NULL_STAGE = _NullStage()
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+def stage(reader, name):
+    """
+    Context manager that reports a stage of a reader to the active
+    instruments::
+
+        with profiling.stage("read_fisa", "decode") as current:
+            blocks = ...
+            current.count(nbytes=..., rows=...)
+
+    Parameters
+    ----------
+    reader : str
+        Name of the reader.
+    name : str
+        Name of the stage.
+
+    Returns
+    -------
+    context manager
+        Its 'count(nbytes=0, rows=0)' method adds to the bytes read and
+        rows parsed by the stage. Without an active instrument it is a
+        shared object that does nothing.
+    """
+    profiles = _PROFILES
+    if not profiles:
+        return _NULL_STAGE
+    return _Stage(profiles, reader, name)
+
+
+@contextlib.contextmanager
+def instrument(on_stage=None):
+    """
+    Reports the stages of the readers while the context is active.
+
+    Instruments can be nested; every active one receives the reports.
+
+    Parameters
+    ----------
+    on_stage : callable, optional
+        Called with each 'StageEvent' as it is reported.
+
+    Yields
+    ------
+    Profile
+        The totals of the stages, updated while the context is active.
+    """
+    global _PROFILES
+    profile = Profile(on_stage=on_stage)
+    _PROFILES = _PROFILES + (profile,)
+    try:
+        yield profile
+    finally:
+        _PROFILES = tuple(p for p in _PROFILES if p is not profile)
@@ -0,0 +1,528 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Memory-mapped access to the text files read by the Spyctral readers.
+
+The readers map the whole file and work with byte offsets: sections are
+located by byte search and numeric regions are decoded straight from the
+mapped buffer, so no Python object is created per data row.
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import bz2
+import contextlib
+import glob
+import io
+import lzma
+import mmap
+import os
+import pathlib
+import re
+import warnings
+import zlib
+
+import numpy as np
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# One or more empty (or whitespace only) lines after a newline.
+BLANK_LINES = re.compile(rb"\n(?:[ \t\r\f\v]*\n)+")
+
+# Any character that is not whitespace.
+NON_BLANK = re.compile(rb"\S")
+
+# Bytes read from a stream at a time.
+CHUNK_SIZE = 1 << 20
+
+# Magic number of each supported compression format and the factory of its
+# incremental decompressor.
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": lambda: zlib.decompressobj(zlib.MAX_WBITS | 16),  # gzip
+    b"BZh": bz2.BZ2Decompressor,
+    b"\xfd7zXZ\x00": lzma.LZMADecompressor,
+}
+
+# Bytes needed to recognize any of the magic numbers.
+MAGIC_SIZE = max(map(len, COMPRESSION_MAGIC))
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _get_decompressor(head):
+    """
+    Finds the decompressor of a stream from its first bytes.
+
+    Parameters
+    ----------
+    head : bytes
+        First bytes of the stream.
+
+    Returns
+    -------
+    callable or None
+        Function that creates a new decompressor object, or None if the
+        stream is not compressed.
+    """
+    for magic, factory in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return factory
+    return None
+
+
+def _anonymous_map(size):
+    """
+    Creates an anonymous memory map.
+
+    On POSIX systems the map is private: a shared anonymous map cannot be
+    safely grown with 'mmap.resize'.
+
+    Parameters
+    ----------
+    size : int
+        Size of the map in bytes.
+
+    Returns
+    -------
+    mmap.mmap
+        The new map.
+    """
+    if hasattr(mmap, "MAP_PRIVATE"):
+        return mmap.mmap(-1, size, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    return mmap.mmap(-1, size)
+
+
+def _resize(buffer, size, used):
+    """
+    Resizes an anonymous memory map, keeping its first 'used' bytes.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap
+        Map created by '_anonymous_map'.
+    size : int
+        New size in bytes.
+    used : int
+        Bytes of the map that are already written.
+
+    Returns
+    -------
+    mmap.mmap
+        The resized map, or a new one with a copy of the content where
+        anonymous maps cannot be resized.
+    """
+    try:
+        buffer.resize(size)
+    except OSError:
+        resized = _anonymous_map(size)
+        with memoryview(buffer) as view:
+            resized[:used] = view[:used]
+        buffer.close()
+        buffer = resized
+    return buffer
+
+
+def _iter_chunks(fp):
+    """
+    Reads a stream in chunks of up to 'CHUNK_SIZE' bytes.
+
+    Reads that return fewer bytes than 'MAGIC_SIZE' (e.g. from a pipe or a
+    socket) are joined, so the first chunk is enough to recognize a magic
+    number unless the whole stream is shorter.
+
+    Parameters
+    ----------
+    fp : file-like
+        Object with a 'read' method that returns bytes or str.
+
+    Yields
+    ------
+    bytes
+        Each chunk that is not empty.
+    """
+    head = b""
+    while chunk := fp.read(CHUNK_SIZE):
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        if head is not None:
+            head += chunk
+            if len(head) < MAGIC_SIZE:
+                continue
+            chunk, head = head, None
+        yield chunk
+
+    if head:
+        yield head
+
+
+def _spool(fp):
+    """
+    Copies a stream into an anonymous memory map, decompressing it on the fly
+    when it starts with a gzip, bzip2 or xz magic number.
+
+    The stream is read in chunks (see '_iter_chunks') and each decompressed
+    chunk is appended to the map, which grows as needed. The compressed
+    content is never held in memory as a whole.
+
+    This is not a streaming read: the map holds the whole decompressed
+    content, so the peak memory is the decompressed size of the stream
+    (plus a copy while the map is grown where anonymous maps cannot be
+    resized). The readers locate the tables by byte offsets over the whole
+    content and decode each of them in a single call, which a bounded
+    window over the stream cannot give. Only plain files are read without
+    copying them, by mapping them.
+
+    Parameters
+    ----------
+    fp : file-like
+        Object with a 'read' method that returns bytes or str.
+
+    Returns
+    -------
+    mmap.mmap or bytes
+        Map with the (decompressed) content, or empty bytes for an empty
+        stream.
+
+    Raises
+    ------
+    ValueError
+        If a compressed stream is truncated.
+    """
+    buffer, size = None, 0
+    factory = decompressor = None
+
+    for chunk in _iter_chunks(fp):
+        if buffer is None:
+            factory = _get_decompressor(chunk)
+            buffer = _anonymous_map(max(len(chunk), CHUNK_SIZE))
+
+        if factory is not None:
+            data = b""
+            while chunk:  # concatenated streams are decoded one by one
+                if decompressor is None or decompressor.eof:
+                    decompressor = factory()
+                data += decompressor.decompress(chunk)
+                chunk = decompressor.unused_data if decompressor.eof else b""
+            chunk = data
+
+        if size + len(chunk) > len(buffer):
+            new_size = max(2 * len(buffer), size + len(chunk))
+            buffer = _resize(buffer, new_size, size)
+        buffer[size : size + len(chunk)] = chunk  # noqa: E203
+        size += len(chunk)
+
+    if decompressor is not None and not decompressor.eof:
+        raise ValueError("Compressed data ended before the end of the stream")
+    if not size:
+        return b""
+
+    return _resize(buffer, size, size)
+
+
+def file_identity(path):
+    """
+    Identifies the current version of a file, to tell later whether it was
+    replaced or modified.
+
+    Parameters
+    ----------
+    path : str or path-like
+        Path to the file.
+
+    Returns
+    -------
+    tuple
+        The absolute path of the file, with symbolic links resolved, and its
+        size, modification time (in nanoseconds) and inode number.
+    """
+    realpath = os.path.realpath(path)
+    stat = os.stat(realpath)
+    return realpath, stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+@contextlib.contextmanager
+def open_mapped(path_or_buffer):
+    """
+    Memory-maps a file, or the content of a buffer, for reading.
+
+    Files and streams compressed with gzip, bzip2 or xz (recognized by their
+    first bytes, not by their extension) are decompressed in chunks into an
+    anonymous memory map (see '_spool').
+
+    Parameters
+    ----------
+    path_or_buffer : str, path-like, bytes or file-like
+        Path to the file, its content as bytes, or an object with a 'read'
+        method (an open file, a pipe, a 'io.BytesIO', ...).
+
+    Yields
+    ------
+    mmap.mmap or bytes
+        Read-only map of the file, map with the content of the stream, or
+        the given bytes. Empty files, which cannot be mapped, are given as
+        empty bytes. Only the map of a file is closed on exit; the others are
+        released when they are no longer referenced.
+    """
+    if isinstance(path_or_buffer, (bytes, bytearray, memoryview)):
+        if _get_decompressor(bytes(path_or_buffer[:MAGIC_SIZE])) is None:
+            yield bytes(path_or_buffer)
+        else:
+            yield _spool(io.BytesIO(path_or_buffer))
+        return
+
+    if hasattr(path_or_buffer, "read"):
+        yield _spool(path_or_buffer)
+        return
+
+    with open(path_or_buffer, "rb") as fp:
+        if _get_decompressor(fp.read(MAGIC_SIZE)) is not None:
+            fp.seek(0)
+            yield _spool(fp)
+            return
+        try:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            yield b""
+            return
+        with buffer:
+            yield buffer
+
+
+def iter_lines(buffer, start=0):
+    """
+    Iterates over the lines of a buffer.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Buffer with the content of a file.
+    start : int, optional
+        Byte offset of the first line.
+        Default: 0.
+
+    Yields
+    ------
+    bytes
+        Each line, including its end of line.
+    """
+    end = len(buffer)
+    while start < end:
+        stop = buffer.find(b"\n", start, end) + 1 or end
+        yield buffer[start:stop]
+        start = stop
+
+
+def iter_blocks(buffer, start=0):
+    """
+    Iterates over the blocks of lines of a buffer that are separated by
+    empty lines.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Buffer with the content of a file.
+    start : int, optional
+        Byte offset where the search begins.
+        Default: 0.
+
+    Yields
+    ------
+    tuple of int
+        Byte span (start, stop) of each block that is not empty.
+    """
+    # the blocks are checked in place, without copying them
+    for match in BLANK_LINES.finditer(buffer, start):
+        stop = match.start() + 1
+        if NON_BLANK.search(buffer, start, stop):
+            yield start, stop
+        start = match.end()
+
+    if NON_BLANK.search(buffer, start):
+        yield start, len(buffer)
+
+
+def _row_sizes(region):
+    """
+    Counts the elements of each line of a region that is not empty.
+
+    The count is vectorized over the bytes of the region, without splitting
+    it into lines.
+
+    Parameters
+    ----------
+    region : bytes
+        Whitespace-separated numbers.
+
+    Returns
+    -------
+    numpy.ndarray
+        Number of elements of each line that is not empty, in order.
+    """
+    chars = np.frombuffer(region, dtype=np.uint8)
+    # first byte of each element: not blank (whitespace or control
+    # character) after a blank one
+    first = chars > 0x20
+    first[1:] &= chars[:-1] <= 0x20
+    elements = np.flatnonzero(first)
+    lines = np.flatnonzero(chars == 0x0A) + 1
+    bounds = np.concatenate([[0], lines, [len(chars)]])
+    sizes = np.diff(np.searchsorted(elements, bounds))
+    return sizes[sizes > 0]
+
+
+def decode_floats(buffer, start=0, stop=None, *, name="table"):
+    """
+    Decodes a region of whitespace-separated numbers into float64 columns.
+
+    The region is parsed in a single NumPy call. The number of columns is
+    taken from its first line, and every other line must have the same
+    number of elements. Empty lines are skipped.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Buffer with the content of a file.
+    start, stop : int, optional
+        Byte span of the region. Default: the whole buffer.
+    name : str, optional
+        Name of the table, used in the error message.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (n_columns, n_rows). Each row of the array is one
+        column of the table, stored contiguously.
+
+    Raises
+    ------
+    ValueError
+        If an element cannot be converted to a number or the rows do not
+        all have the same number of elements.
+    """
+    region = buffer[start:stop]
+    sizes = _row_sizes(region)
+    n_columns = int(sizes[0]) if len(sizes) else 0
+
+    try:
+        if (sizes != n_columns).any():
+            raise ValueError("ragged rows")
+        with warnings.catch_warnings():
+            # older NumPy versions warn instead of raising
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(region, sep=" ")
+        values = values.reshape(len(sizes), n_columns)
+    except (ValueError, DeprecationWarning):
+        # the slow parser tells which element or row is wrong
+        try:
+            np.loadtxt(io.BytesIO(region), ndmin=2, comments=None)
+        except ValueError as err:
+            reason = err
+        else:
+            reason = "unexpected end of the data"
+        raise ValueError(
+            f"Element in '{name}' table cannot be converted to a number: "
+            f"{reason}"
+        ) from None
+
+    return np.ascontiguousarray(values.T)
+
+
+def decode_blocks(buffer, spans, *, names=None):
+    """
+    Decodes several blocks of whitespace-separated numbers, with the same
+    number of columns, in a single NumPy call.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap or bytes
+        Buffer with the content of a file.
+    spans : list of tuple of int
+        Byte span of each block (see 'iter_blocks'), in file order.
+    names : list of str, optional
+        Name of each block, used in the error message.
+        Default: "block 0", "block 1", ...
+
+    Returns
+    -------
+    list of numpy.ndarray
+        One array of shape (n_rows, n_columns) per block. They are
+        consecutive views of a single array.
+
+    Raises
+    ------
+    ValueError
+        If an element cannot be converted to a number or the rows do not
+        all have the same number of elements.
+    """
+    if not spans:
+        return []
+    if names is None:
+        names = [f"block {i}" for i in range(len(spans))]
+
+    region = buffer[spans[0][0] : spans[-1][1]]  # noqa: E203
+    sizes = _row_sizes(region)
+    n_columns = int(sizes[0])
+    n_rows = [
+        buffer[start:stop].rstrip().count(b"\n") + 1 for start, stop in spans
+    ]
+
+    try:
+        if (sizes != n_columns).any():
+            raise ValueError("ragged rows")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(region, sep=" ")
+        values = values.reshape(sum(n_rows), n_columns)
+    except (ValueError, DeprecationWarning):
+        # each block is decoded alone to tell which one is wrong
+        for (start, stop), name in zip(spans, names):
+            decode_floats(buffer, start, stop, name=name)
+        raise ValueError(
+            "The blocks do not have the same number of columns"
+        ) from None
+
+    offsets = np.cumsum([0] + n_rows)
+    return [values[a:b] for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def resolve_paths(paths, pattern="*"):
+    """
+    Expands the 'paths' argument of the functions that work over many
+    files into a list of paths.
+
+    Parameters
+    ----------
+    paths : str, path-like or iterable of them
+        A directory (all the files matching 'pattern' inside it), a glob
+        expression, a single file or an iterable of files.
+    pattern : str, optional
+        Pattern of the files taken from a directory.
+        Default: "*".
+
+    Returns
+    -------
+    list
+        The paths, sorted when they come from a directory or a glob.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        if os.path.isdir(paths):
+            return sorted(pathlib.Path(paths).glob(pattern))
+        if glob.has_magic(str(paths)):
+            return sorted(glob.glob(str(paths)))
+        return [paths]
+    return list(paths)
@@ -34,6 +34,43 @@ from collections.abc import Mapping
 # =============================================================================
 
 
+class Lazy:
+    """Value of a Bunch computed the first time it is accessed.
+
+    The result of ``func`` is kept, so every access returns the same
+    object.
+
+    Parameters
+    ----------
+    func : callable
+        Function without arguments that computes the value.
+
+    Examples
+    --------
+    >>> b = Bunch("data", {"a": Lazy(lambda: 1)})
+    >>> b.a
+    1
+
+    """
+
+    __slots__ = ("_func", "_value")
+
+    def __init__(self, func):
+        self._func = func
+        self._value = None
+
+    def __call__(self):
+        """x.__call__() <==> x()."""
+        if self._func is not None:
+            self._value, self._func = self._func(), None
+        return self._value
+
+    def __repr__(self):
+        """x.__repr__() <==> repr(x)."""
+        state = "pending" if self._func is not None else "loaded"
+        return f"<Lazy {state}>"
+
+
 class Bunch(Mapping):
     """Container object exposing keys as attributes.
 
@@ -59,23 +96,47 @@ class Bunch(Mapping):
     >>> b['c']
     6
 
+    Values wrapped in a :class:`Lazy` are computed on first access and
+    then stored in place of the wrapper.
+
+    Bunch objects have no instance dictionary (``__slots__``): a summary
+    holds four of them, and collections hold many summaries.
+
     """
 
+    __slots__ = ("_name", "_data")
+
     def __init__(self, name, data):
         self._name = str(name)
         self._data = data
 
     def __getitem__(self, k):
         """x.__getitem__(y) <==> x[y]."""
-        return self._data[k]
+        value = self._data[k]
+        if isinstance(value, Lazy):
+            value = self._data[k] = value()
+        return value
 
     def __getattr__(self, a):
         """x.__getattr__(y) <==> x.y."""
         try:
-            return self._data[a]
+            return self[a]
         except KeyError:
             raise AttributeError(a)
 
+    def __getstate__(self):
+        """Needed for multiprocessing environment."""
+        return {"_name": self._name, "_data": self._data}
+
+    def __setstate__(self, state):
+        """Needed for multiprocessing environment."""
+        for attr, value in state.items():
+            object.__setattr__(self, attr, value)
+
+    def __contains__(self, k):
+        """x.__contains__(y) <==> y in x."""
+        return k in self._data
+
     def __copy__(self):
         """x.__copy__() <==> copy.copy(x)."""
         cls = type(self)
@@ -0,0 +1,115 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""Measure of the memory held by Python objects and their arrays."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import gc
+import mmap
+import sys
+import types
+
+import numpy as np
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Objects shared by the whole process, never counted nor followed.
+SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    np.dtype,
+)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def _array_root(array):
+    """Returns the object that owns the memory of an array."""
+    root = array
+    while isinstance(root, np.ndarray) and root.base is not None:
+        root = root.base
+    return root
+
+
+def measure(obj, *, seen=None, ignore=()):
+    """
+    Measures the memory held by an object and everything it references.
+
+    The graph of references is followed with 'gc.get_referents'. Each
+    object is counted once, so the memory of arrays shared by several
+    objects (views of the same buffer) is only counted the first time it
+    is reached.
+
+    Parameters
+    ----------
+    obj : object
+        The object to measure.
+    seen : set, optional
+        Identifiers of the objects already counted, updated in place. Pass
+        the same set to measure several objects without counting twice
+        what they share.
+    ignore : tuple of type, optional
+        Types of objects shared with the rest of the process (e.g. units)
+        that are neither counted nor followed, besides 'SHARED_TYPES'.
+
+    Returns
+    -------
+    dict
+        "objects": number of objects, "object_bytes": bytes of the objects
+        themselves and "array_bytes": bytes of the memory of the arrays
+        and of the buffers that back them.
+    """
+    seen = set() if seen is None else seen
+    skip = SHARED_TYPES + tuple(ignore)
+
+    objects = object_bytes = array_bytes = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, skip):
+            continue
+        seen.add(id(current))
+        objects += 1
+
+        size = sys.getsizeof(current)
+        if isinstance(current, np.ndarray):
+            # arrays do not expose their base to the garbage collector
+            if current.flags.owndata:
+                size -= current.nbytes
+                array_bytes += current.nbytes
+            else:
+                stack.append(_array_root(current))
+        elif isinstance(current, bytearray):
+            size -= len(current)
+            array_bytes += len(current)
+        elif isinstance(current, mmap.mmap) and not current.closed:
+            array_bytes += len(current)
+
+        object_bytes += size
+        stack.extend(gc.get_referents(current))
+
+    return {
+        "objects": objects,
+        "object_bytes": object_bytes,
+        "array_bytes": array_bytes,
+    }
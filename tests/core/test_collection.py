@@ -0,0 +1,234 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Test for spyctral.core.collection"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+import spyctral
+from spyctral.core import collection
+from spyctral.io import fisa, starlight
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture(scope="module")
+def starlight_collection(file_path):
+    return collection.SpectralCollection.from_starlight(
+        file_path("set_STARLIGHT_files"), workers=1, lazy=True
+    )
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_collection_columns(file_path, starlight_collection):
+    paths = sorted(file_path("set_STARLIGHT_files").glob("*.out"))
+
+    assert len(starlight_collection) == len(paths) == 30
+    assert list(starlight_collection.paths) == [str(p) for p in paths]
+    for name in collection.COLLECTION_COLUMNS:
+        column = starlight_collection[name]
+        assert column.dtype == np.float64
+        assert column.flags.c_contiguous
+        assert not column.flags.writeable
+        np.testing.assert_array_equal(
+            column, [getattr(s, name) for s in starlight_collection]
+        )
+    np.testing.assert_allclose(
+        starlight_collection.feh_ratio,
+        [s.feh_ratio for s in starlight_collection],
+    )
+
+
+def test_collection_selection(starlight_collection):
+    mask = starlight_collection.age > np.median(starlight_collection.age)
+
+    selected = starlight_collection[mask]
+
+    assert len(selected) == mask.sum()
+    np.testing.assert_array_equal(selected.age, starlight_collection.age[mask])
+    assert list(selected.summaries) == list(
+        starlight_collection.summaries[mask]
+    )
+    assert list(selected.paths) == list(starlight_collection.paths[mask])
+
+    sliced = starlight_collection[2:5]
+    assert len(sliced) == 3
+    assert sliced[0] is starlight_collection[2]
+    np.testing.assert_array_equal(
+        sliced.z_value, starlight_collection.z_value[2:5]
+    )
+
+    taken = starlight_collection[[4, 0]]
+    assert list(taken.paths) == list(starlight_collection.paths[[4, 0]])
+
+
+def test_collection_sort_by(starlight_collection):
+    ascending = starlight_collection.sort_by("age")
+    descending = starlight_collection.sort_by("feh_ratio", ascending=False)
+
+    assert np.all(np.diff(ascending.age) >= 0)
+    assert np.all(np.diff(descending.feh_ratio) <= 0)
+    assert sorted(ascending.paths) == sorted(starlight_collection.paths)
+
+
+def test_collection_sort_by_ties():
+    summaries = [
+        _summary("a", z_value=0.02),
+        _summary("b", z_value=0.01),
+        _summary("c", z_value=0.02),
+    ]
+    coll = collection.SpectralCollection(summaries)
+
+    ascending = coll.sort_by("z_value")
+    descending = coll.sort_by("z_value", ascending=False)
+
+    assert list(ascending.obj_name) == ["b", "a", "c"]
+    assert list(descending.obj_name) == ["a", "c", "b"]
+
+
+def test_collection_get_all_properties_paths(starlight_collection):
+    df = starlight_collection.get_all_properties
+
+    assert df.index.name == "path"
+    assert list(df.index) == list(starlight_collection.paths)
+    assert list(df.columns) == [
+        "object_name",
+        "age",
+        "err_age",
+        "reddening",
+        "av_value",
+        "z_value",
+        "feh_ratio",
+        "normalization_point",
+    ]
+    for name in df.columns[1:]:
+        assert df[name].dtype == np.float64
+    np.testing.assert_array_equal(df["age"], starlight_collection.age)
+
+
+def test_collection_get_all_properties(file_path):
+    summaries = [
+        fisa.read_fisa(file_path(name))
+        for name in ("case_SC_FISA.fisa", "fisa_1.fisa", "fisa_2.fisa")
+    ]
+    coll = collection.SpectralCollection(summaries)
+
+    df = coll.get_all_properties
+
+    assert list(df.columns) == list(
+        summaries[0].get_all_properties["Property"]
+    )
+    for name in df.columns[1:]:
+        assert df[name].dtype == np.float64
+    for (_, row), summary in zip(df.iterrows(), summaries):
+        assert row["object_name"] == summary.obj_name
+        assert row["age"] == summary.age
+        assert row["feh_ratio"] == summary.feh_ratio
+
+    # the table is a copy, changing it does not change the collection
+    df["age"] *= 2
+    assert coll.age[0] == summaries[0].age
+
+
+def test_collection_format_properties(file_path):
+    summary = fisa.read_fisa(file_path("case_SC_FISA.fisa"))
+    coll = collection.SpectralCollection([summary])
+
+    formatted = coll.format_properties()
+
+    expected = summary.get_all_properties.set_index("Property")["Value"]
+    assert formatted.iloc[0].tolist() == expected.tolist()
+    assert coll.get_all_properties["age"].dtype == np.float64
+
+
+@pytest.mark.parametrize(
+    "read_kwargs, unsupported",
+    [
+        ({"compact": True}, "compact"),
+        ({"lazy": True, "foo": 1, "bar": 2}, "bar, foo"),
+    ],
+)
+def test_collection_from_starlight_unsupported_kwargs(
+    file_path, read_kwargs, unsupported
+):
+    with pytest.raises(
+        ValueError, match=f"Unsupported keyword arguments: {unsupported}$"
+    ):
+        collection.SpectralCollection.from_starlight(
+            file_path("case_SC_Starlight.out"), **read_kwargs
+        )
+
+
+def test_collection_from_fisa(file_path):
+    paths = [file_path(f"fisa_{i}.fisa") for i in (1, 2, 3)]
+
+    coll = collection.SpectralCollection.from_fisa(paths)
+
+    assert len(coll) == 3
+    for summary, path in zip(coll, paths):
+        assert summary.header == fisa.read_fisa(path).header
+    df = coll.get_all_properties
+    assert list(df.index) == [str(path) for path in paths]
+
+
+def test_collection_from_summaries(file_path):
+    summary = starlight.read_starlight(file_path("case_SC_Starlight.out"))
+
+    coll = spyctral.SpectralCollection([summary, summary])
+
+    assert coll.paths is None
+    assert coll[1] is summary
+    assert isinstance(coll.get_all_properties.index, pd.RangeIndex)
+    assert repr(coll) == "<SpectralCollection [2 summaries]>"
+
+
+def test_collection_empty():
+    coll = collection.SpectralCollection([])
+
+    assert len(coll) == 0
+    assert coll.age.dtype == np.float64
+    assert len(coll.get_all_properties) == 0
+
+
+def test_collection_paths_mismatch(file_path):
+    summary = fisa.read_fisa(file_path("fisa_1.fisa"))
+
+    with pytest.raises(ValueError, match="Got 2 paths for 1 summaries"):
+        collection.SpectralCollection([summary], paths=["a", "b"])
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def _summary(obj_name, **values):
+    fields = dict.fromkeys(collection.COLLECTION_COLUMNS, 1.0)
+    fields.update(values)
+    return spyctral.SpectralSummary(
+        obj_name=obj_name,
+        header={},
+        data={},
+        spectra={},
+        extra_info={},
+        **fields,
+    )
@@ -151,7 +151,7 @@ def test_spectralsummary_len(file_path):
     assert len(summary) == 11
     assert len(summary.header) == 6
     assert len(summary.data) == 4
-    assert len(summary.extra_info) == 5
+    assert len(summary.extra_info) == 8
 
 
 def test_spectralsummary_repr(file_path):
@@ -171,7 +171,7 @@ def test_spectralsummary_repr(file_path):
         "  spectra={Unreddened_spectrum, Template_spectrum, Observed_spectrum,"
         " Residual_flux},\n"
         "  extra_info={str_template, name_template, age_map, error_age_map,"
-        " z_map})>"
+        " z_map, wavelength, flux_matrix, matrix_names})>"
     )
 
     assert repr(summary) == repr_expected
@@ -234,3 +234,84 @@ def test_spectralsummary_get_all_properties(file_path):
     )
 
     assert df.equals(df_expected)
+
+
+def test_spectralsummary_save_load(file_path, tmp_path):
+    """Test of the binary snapshot of a summary."""
+
+    path = file_path("case_SC_FISA.fisa")
+
+    summary = fisa.read_fisa(path)
+    saved = summary.save(tmp_path / "summary.snap")
+    loaded = core.SpectralSummary.load(saved)
+
+    assert isinstance(loaded, core.SpectralSummary)
+    assert repr(loaded) == repr(summary)
+    assert loaded.get_all_properties.equals(summary.get_all_properties)
+    assert np.all(
+        loaded.get_spectrum("Observed_spectrum").flux
+        == summary.get_spectrum("Observed_spectrum").flux
+    )
+
+
+def test_spectralsummary_compact(file_path):
+    """Test of the compact copy of a summary."""
+
+    path = file_path("case_SC_FISA.fisa")
+
+    summary = fisa.read_fisa(path)
+    compact = summary.compact()
+
+    assert isinstance(compact, core.SpectralSummary)
+    assert repr(compact) == repr(summary)
+    assert compact.get_all_properties.equals(summary.get_all_properties)
+    assert np.all(
+        compact.get_spectrum("Observed_spectrum").flux
+        == summary.get_spectrum("Observed_spectrum").flux
+    )
+
+
+def test_spectralsummary_footprint(file_path):
+    """Test of the memory report of a summary."""
+
+    summary = fisa.read_fisa(file_path("case_SC_FISA.fisa"))
+
+    report = summary.footprint()
+
+    assert list(report.index) == [
+        "header",
+        "data",
+        "spectra",
+        "extra_info",
+        "summary",
+        "total",
+    ]
+    assert list(report.columns) == [
+        "objects",
+        "object_bytes",
+        "array_bytes",
+        "total_bytes",
+    ]
+    assert (report.loc["total"] == report.iloc[:-1].sum()).all()
+    flux = summary.data.Observed_spectrum["Normalizated_flux"]
+    assert report.loc["data", "array_bytes"] >= flux.nbytes
+
+    # the compact layout keeps the arrays once and no objects around them
+    compact = summary.compact().footprint()
+    total = report.loc["total", "total_bytes"]
+    assert compact.loc["total", "total_bytes"] < total
+    assert compact.loc["spectra", "array_bytes"] == 0
+
+
+def test_format_properties():
+    """Test of the display format of a table of properties."""
+
+    properties = pd.DataFrame(
+        {"object_name": ["a", "b"], "age": [1.3e10, 2.5e9], "z_value": [1, 2]}
+    )
+
+    formatted = core.format_properties(properties)
+
+    assert formatted["age"].tolist() == ["1.30e+10", "2.50e+09"]
+    assert formatted["z_value"].tolist() == [1, 2]
+    assert properties["age"].dtype == np.float64
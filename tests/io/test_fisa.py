@@ -12,17 +12,23 @@
 # =============================================================================
 
 import datetime as dt
+import gzip
+import lzma
+import tracemalloc
 
 from astropy.table import QTable
 
 import numpy as np
 
+import pandas as pd
+
 import pytest
 
 from specutils import Spectrum1D
 
 from spyctral.core import core
 from spyctral.io import fisa
+from spyctral.utils import buffers
 from spyctral.utils.bunch import Bunch
 
 
@@ -124,3 +130,241 @@ def test_read_fisa_with_nodefault_parameters(file_path):
         match="Missing metallicity mapping for template 'G2' in z_map.",
     ):
         fisa.read_fisa(path, z_map=z_map_test)
+
+
+def test_process_blocks_shared_grid(file_path):
+    path = file_path("fisa_4.fisa")
+
+    with buffers.open_mapped(path) as buffer:
+        header_lines, data_start = fisa._split_fisa(buffer)
+        header = fisa._process_header(header_lines)
+        data, wavelength, flux_matrix, matrix_names = fisa._process_blocks(
+            buffer,
+            list(buffers.iter_blocks(buffer, data_start)),
+            header["spectra_names"],
+        )
+
+    assert matrix_names == (
+        "Unreddened_spectrum",
+        "Observed_spectrum",
+        "Residual_flux",
+    )
+    assert flux_matrix.shape == (3, 3000)
+    assert wavelength.shape == (3000,)
+
+    for row, name in enumerate(matrix_names):
+        table = data[name]
+        assert np.shares_memory(table["Wavelength"].value, wavelength)
+        assert np.shares_memory(table["Normalizated_flux"], flux_matrix[row])
+        np.testing.assert_array_equal(
+            table["Normalizated_flux"], flux_matrix[row]
+        )
+
+    # the template is sampled on its own grid
+    template = data["Template_spectrum"]
+    assert len(template) == 3401
+    assert not np.shares_memory(template["Wavelength"].value, wavelength)
+
+
+def test_read_fisa_shared_grid(file_path):
+    summary = fisa.read_fisa(file_path("fisa_4.fisa"))
+
+    wavelength = summary.extra_info.wavelength
+    flux_matrix = summary.extra_info.flux_matrix
+    matrix_names = summary.extra_info.matrix_names
+    assert flux_matrix.shape == (len(matrix_names), len(wavelength))
+    assert "Template_spectrum" not in matrix_names
+
+    for row, name in enumerate(matrix_names):
+        table = summary.data[name]
+        spectrum = summary.spectra[name]
+        assert np.shares_memory(table["Wavelength"].value, wavelength)
+        assert np.shares_memory(spectrum.flux.value, flux_matrix[row])
+        np.testing.assert_array_equal(
+            spectrum.spectral_axis.value, wavelength
+        )
+
+
+def test_read_fisa_spectra_views(file_path):
+    path = file_path("fisa_4.fisa")
+
+    summary = fisa.read_fisa(path)
+
+    observed = summary.spectra.Observed_spectrum
+    residual = summary.spectra.Residual_flux
+    table = summary.data.Observed_spectrum
+    assert np.shares_memory(observed.flux.value, table["Normalizated_flux"])
+    assert np.shares_memory(observed.spectral_axis, table["Wavelength"])
+    assert observed.spectral_axis is residual.spectral_axis
+    assert observed.wcs is residual.wcs
+    assert (
+        summary.spectra.Template_spectrum.spectral_axis
+        is not observed.spectral_axis
+    )
+
+
+@pytest.mark.parametrize("compress", [None, gzip.compress, lzma.compress])
+def test_read_fisa_sources(file_path, tmp_path, compress):
+    path = file_path("fisa_1.fisa")
+    content = path.read_bytes()
+    if compress is not None:
+        content = compress(content)
+    compressed_path = tmp_path / "fisa_1.fisa.z"
+    compressed_path.write_bytes(content)
+
+    expected = fisa.read_fisa(path)
+
+    with open(compressed_path, "rb") as fp:
+        for path_or_buffer in (compressed_path, content, fp):
+            summary = fisa.read_fisa(path_or_buffer)
+
+            assert summary.header == expected.header
+            assert summary.age == expected.age
+            for name, table in expected.data.items():
+                for col in table.colnames:
+                    assert np.all(summary.data[name][col] == table[col])
+
+
+def test_scan_fisa_headers(file_path):
+    path = file_path("fisa_4.fisa")
+
+    headers = fisa.scan_fisa_headers(path.parent)
+
+    assert isinstance(headers, pd.DataFrame)
+    assert len(headers) == 5
+    assert headers.index.name == "path"
+
+    summary = fisa.read_fisa(path)
+    row = headers.loc[str(path)]
+    for key, value in summary.header.items():
+        assert row[key] == value
+    assert row["name_template"] == summary.extra_info.name_template
+    assert row["age"] == summary.age
+    assert row["err_age"] == summary.err_age
+    assert row["z_value"] == summary.z_value
+    assert row["av_value"] == summary.av_value
+
+
+def test_scan_fisa_headers_missing_template(file_path):
+    path = file_path("case_SC_FISA.fisa")
+
+    headers = fisa.scan_fisa_headers([path], z_map={"G1": 0.19}, rv=1.0)
+
+    assert headers.iloc[0]["name_template"] == "G2"
+    assert np.isnan(headers.iloc[0]["z_value"])
+    assert headers.iloc[0]["age"] == fisa.FISA_DEFAULT_AGE_MAP["G2"]
+    assert headers.iloc[0]["av_value"] == headers.iloc[0]["reddening"]
+
+
+def test_resolve_fisa_templates():
+    templates = pd.Series(
+        ["/templates/G2.dat", "G1", None, "/other/G2.dat"],
+        index=["a", "b", "c", "d"],
+    )
+
+    resolved = fisa.resolve_fisa_templates(templates)
+
+    assert list(resolved.index) == ["a", "b", "c", "d"]
+    assert list(resolved.columns) == [
+        "name_template",
+        "age",
+        "err_age",
+        "z_value",
+    ]
+    assert resolved.loc["a", "name_template"] == "G2"
+    assert resolved.loc["d", "z_value"] == fisa.FISA_DEFAULT_Z_MAP["G2"]
+    assert resolved.loc["b", "age"] == fisa.FISA_DEFAULT_AGE_MAP["G1"]
+    assert resolved.loc["b", "err_age"] == 1e9
+    assert resolved.loc["c"].isna().all()
+
+
+def test_resolve_fisa_templates_missing():
+    templates = ["G1", "G2", "G7", "G2", "G9"]
+
+    with pytest.raises(ValueError) as excinfo:
+        fisa.resolve_fisa_templates(templates, z_map={"G1": 0.19})
+
+    message = str(excinfo.value)
+    assert (
+        "Missing age mapping for templates 'G7', 'G9' in age_map." in message
+    )
+    assert (
+        "Missing metallicity mapping for templates 'G2', 'G7', 'G9' "
+        "in z_map." in message
+    )
+
+    resolved = fisa.resolve_fisa_templates(
+        templates, z_map={"G1": 0.19}, errors="coerce"
+    )
+    assert resolved["z_value"].isna().tolist() == [
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+
+    with pytest.raises(ValueError, match="Invalid errors option: 'foo'"):
+        fisa.resolve_fisa_templates(templates, errors="foo")
+
+
+def test_iter_fisa_blocks(file_path):
+    path = file_path("fisa_4.fisa")
+    summary = fisa.read_fisa(path)
+
+    chunks = {}
+    for name, wavelength, flux in fisa.iter_fisa_blocks(path, chunk_pixels=7):
+        chunks.setdefault(name, []).append((wavelength, flux))
+
+    assert list(chunks) == list(summary.data)
+    for name, table in summary.data.items():
+        sizes = [len(wavelength) for wavelength, _ in chunks[name]]
+        assert all(size == 7 for size in sizes[:-1])
+        assert 0 < sizes[-1] <= 7
+        np.testing.assert_array_equal(
+            np.concatenate([wavelength for wavelength, _ in chunks[name]]),
+            table["Wavelength"].value,
+        )
+        np.testing.assert_array_equal(
+            np.concatenate([flux for _, flux in chunks[name]]),
+            table["Normalizated_flux"],
+        )
+
+
+def test_iter_fisa_blocks_bounded_memory(file_path, tmp_path):
+    content = file_path("fisa_4.fisa").read_bytes()
+    header = content[: content.index(b"   3800.44995")]
+    rows = b"".join(
+        b"   %.5f      %.9f    \r\n" % (3800 + 0.01 * i, 0.5)
+        for i in range(50_000)
+    )
+    path = tmp_path / "large.fisa"
+    path.write_bytes(header + (rows + b"\r\n") * 4)
+
+    tracemalloc.start()
+    try:
+        n_pixels = sum(
+            len(flux)
+            for _, _, flux in fisa.iter_fisa_blocks(path, chunk_pixels=1000)
+        )
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert n_pixels == 200_000
+    assert peak < len(rows) / 10
+
+
+def test_iter_fisa_blocks_stop_early(file_path):
+    blocks = fisa.iter_fisa_blocks(file_path("fisa_4.fisa"), chunk_pixels=10)
+
+    name, wavelength, flux = next(blocks)
+    blocks.close()
+
+    assert name == "Unreddened_spectrum"
+    assert len(wavelength) == len(flux) == 10
+
+
+def test_iter_fisa_blocks_invalid_chunk(file_path):
+    with pytest.raises(ValueError, match="'chunk_pixels' must be a positive"):
+        next(fisa.iter_fisa_blocks(file_path("fisa_4.fisa"), chunk_pixels=0))
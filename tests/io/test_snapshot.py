@@ -0,0 +1,282 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Test for spyctral.io.snapshot"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+
+import numpy as np
+
+import pandas as pd
+
+import pytest
+
+from spyctral.core import core
+from spyctral.io import fisa, snapshot, starlight
+from spyctral.utils.bunch import Lazy
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def assert_same_summary(loaded, summary):
+    for name in snapshot._SCALARS:
+        assert loaded[name] == summary[name]
+        assert type(loaded[name]) is type(summary[name])
+
+    assert dict(loaded.header) == dict(summary.header)
+
+    for name, table in summary.data.items():
+        assert loaded.data[name].colnames == table.colnames
+        for col in table.colnames:
+            assert type(loaded.data[name][col]) is type(table[col])
+            assert loaded.data[name][col].dtype == table[col].dtype
+            assert loaded.data[name][col].unit == table[col].unit
+            np.testing.assert_array_equal(loaded.data[name][col], table[col])
+
+    for name, spectrum in summary.spectra.items():
+        np.testing.assert_array_equal(loaded.spectra[name].flux, spectrum.flux)
+        np.testing.assert_array_equal(
+            loaded.spectra[name].spectral_axis, spectrum.spectral_axis
+        )
+
+    assert list(loaded.extra_info) == list(summary.extra_info)
+    for name, value in summary.extra_info.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(loaded.extra_info[name], value)
+        elif isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(loaded.extra_info[name], value)
+            assert loaded.extra_info[name].dtype == value.dtype
+        else:
+            assert loaded.extra_info[name] == value
+            assert type(loaded.extra_info[name]) is type(value)
+
+
+def _root(array):
+    while isinstance(array, np.ndarray):
+        array = array.base
+    return array.obj if isinstance(array, memoryview) else array
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_snapshot_starlight(file_path, tmp_path, lazy):
+    summary = starlight.read_starlight(
+        file_path("case_SC_Starlight.out"), lazy=lazy
+    )
+
+    path = snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+    loaded = snapshot.load_snapshot(path)
+
+    assert isinstance(loaded, core.SpectralSummary)
+    assert_same_summary(loaded, summary)
+
+
+def test_snapshot_fisa(file_path, tmp_path):
+    summary = fisa.read_fisa(file_path("fisa_4.fisa"))
+
+    path = snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+    loaded = snapshot.load_snapshot(path)
+
+    assert_same_summary(loaded, summary)
+
+    # the spectra on the same grid keep sharing their spectral axis
+    spectra = loaded.spectra
+    assert (
+        spectra.Observed_spectrum.spectral_axis
+        is spectra.Residual_flux.spectral_axis
+    )
+
+
+def test_snapshot_views(file_path, tmp_path):
+    summary = fisa.read_fisa(file_path("fisa_4.fisa"))
+
+    path = snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+    loaded = snapshot.load_snapshot(path)
+
+    # the fluxes are stored as views of the rows of the matrix
+    sidecar = json.loads((tmp_path / "summary.snap.json").read_text())
+    flux_matrix = sidecar["extra_info"]["flux_matrix"]
+    assert "view" not in flux_matrix
+    flux = sidecar["spectra"]["Observed_spectrum"]["__spectrum1d__"]["flux"]
+    assert flux["__array__"] == flux_matrix["__array__"]
+    assert flux["view"]["shape"] == [3000]
+
+    matrix_names = loaded.extra_info.matrix_names
+    row = matrix_names.index("Observed_spectrum")
+    spectrum = loaded.spectra.Observed_spectrum
+    assert np.shares_memory(spectrum.flux, loaded.extra_info.flux_matrix[row])
+    np.testing.assert_array_equal(
+        spectrum.flux.value, summary.extra_info.flux_matrix[row]
+    )
+
+
+def test_snapshot_files(file_path, tmp_path):
+    summary = fisa.read_fisa(file_path("fisa_4.fisa"))
+
+    path = snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+
+    sidecar = json.loads((tmp_path / "summary.snap.json").read_text())
+    assert sidecar["format"] == "spyctral-snapshot"
+    assert sidecar["version"] == snapshot.SNAPSHOT_VERSION
+    for spec in sidecar["arrays"]:
+        assert spec["offset"] % snapshot.SNAPSHOT_ALIGNMENT == 0
+
+    # the fluxes shared by the tables and the spectra are stored once
+    n_bytes = sum(
+        len(table) * 8 * len(table.colnames) for table in summary.data.values()
+    )
+    assert path.stat().st_size < 1.1 * n_bytes
+
+
+def test_load_snapshot_lazy(file_path, tmp_path):
+    summary = starlight.read_starlight(file_path("case_SC_Starlight.out"))
+    path = snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+
+    loaded = snapshot.load_snapshot(path)
+
+    for name in loaded.data:
+        assert isinstance(loaded.data._data[name], Lazy)
+    for name in loaded.spectra:
+        assert isinstance(loaded.spectra._data[name], Lazy)
+    assert isinstance(loaded.extra_info._data["ssps_vector"], Lazy)
+    assert not isinstance(loaded.extra_info._data["xj_percent"], Lazy)
+
+
+def test_load_snapshot_copy_on_write(file_path, tmp_path):
+    summary = starlight.read_starlight(file_path("case_SC_Starlight.out"))
+    path = snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+    content = path.read_bytes()
+
+    loaded = snapshot.load_snapshot(path)
+    loaded.data.synthetic_spectrum["f_obs"][:] = 0.0
+
+    assert path.read_bytes() == content
+    reloaded = snapshot.load_snapshot(path)
+    np.testing.assert_array_equal(
+        reloaded.data.synthetic_spectrum["f_obs"],
+        summary.data.synthetic_spectrum["f_obs"],
+    )
+
+
+def test_load_snapshot_not_a_snapshot(tmp_path):
+    path = tmp_path / "summary.snap"
+    path.write_bytes(b"")
+    (tmp_path / "summary.snap.json").write_text('{"format": "other"}')
+
+    with pytest.raises(ValueError, match="is not a Spyctral snapshot"):
+        snapshot.load_snapshot(path)
+
+
+def test_save_snapshot_unsupported_value(file_path, tmp_path):
+    summary = fisa.read_fisa(file_path("fisa_1.fisa"))
+    summary.extra_info._data["bad"] = object()
+
+    with pytest.raises(ValueError, match="Cannot save values of type"):
+        snapshot.save_snapshot(summary, tmp_path / "summary.snap")
+
+
+def test_save_snapshot_failure_keeps_old(file_path, tmp_path, monkeypatch):
+    path = tmp_path / "summary.snap"
+    old = fisa.read_fisa(file_path("fisa_4.fisa"))
+    snapshot.save_snapshot(old, path)
+    files = sorted(tmp_path.iterdir())
+    contents = [f.read_bytes() for f in files]
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    # the container is already written when the side-car fails
+    monkeypatch.setattr(snapshot.json, "dump", fail)
+    new = starlight.read_starlight(file_path("case_SC_Starlight.out"))
+    with pytest.raises(RuntimeError, match="disk full"):
+        snapshot.save_snapshot(new, path)
+
+    assert sorted(tmp_path.iterdir()) == files
+    assert [f.read_bytes() for f in files] == contents
+    monkeypatch.undo()
+    assert_same_summary(snapshot.load_snapshot(path), old)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_pack_summary_starlight(file_path, lazy):
+    summary = starlight.read_starlight(
+        file_path("case_SC_Starlight.out"), lazy=lazy
+    )
+
+    packed = snapshot.pack_summary(summary)
+
+    # the values not loaded yet are computed, then packed
+    for name in packed.data:
+        assert isinstance(packed.data._data[name], Lazy)
+    for name in packed.spectra:
+        assert isinstance(packed.spectra._data[name], Lazy)
+    assert_same_summary(packed, summary)
+
+
+def test_pack_summary_single_buffer(file_path):
+    summary = fisa.read_fisa(file_path("fisa_4.fisa"))
+
+    packed = snapshot.pack_summary(summary)
+
+    # every array is a view of the same buffer, equal arrays stored once
+    flux = packed.data.Observed_spectrum["Normalizated_flux"]
+    spectrum = packed.spectra.Observed_spectrum
+    assert np.shares_memory(flux, spectrum.flux)
+    assert np.shares_memory(
+        packed.data.Observed_spectrum["Wavelength"],
+        packed.data.Residual_flux["Wavelength"],
+    )
+    roots = {
+        id(_root(table[name]))
+        for table in packed.data.values()
+        for name in table.colnames
+    }
+    assert len(roots) == 1
+    assert_same_summary(packed, summary)
+
+
+def test_pack_summary_merged_arrays_read_only(file_path):
+    summary = starlight.read_starlight(file_path("case_SC_Starlight.out"))
+    j = summary.data.synthetic_results["j"]
+    col0 = summary.data.results_average_chains_xj["col0"]
+    assert np.array_equal(j, col0) and not np.shares_memory(j, col0)
+
+    packed = snapshot.pack_summary(summary)
+
+    # equal values are stored once, so they cannot be modified
+    packed_j = packed.data.synthetic_results["j"]
+    packed_col0 = packed.data.results_average_chains_xj["col0"]
+    assert np.shares_memory(packed_j, packed_col0)
+    with pytest.raises(ValueError, match="read-only"):
+        packed_j[0] = -1
+    assert packed_col0[0] == col0[0]
+
+    # the other arrays can
+    flux = packed.data.synthetic_spectrum["f_obs"]
+    flux[0] = -1
+    assert packed.spectra.observed_spectrum.flux[0].value == -1
+
+
+def test_pack_summary_keeps_unsupported_values(file_path):
+    summary = fisa.read_fisa(file_path("fisa_1.fisa"))
+    value = object()
+    summary.extra_info._data["other"] = value
+
+    packed = snapshot.pack_summary(summary)
+
+    assert packed.extra_info.other is value
@@ -11,8 +11,12 @@
 # IMPORTS
 # =============================================================================
 
+import bz2
 import datetime as dt
-
+import gzip
+import io
+import lzma
+import re
 
 from astropy.table import QTable
 
@@ -20,14 +24,14 @@ import numpy as np
 
 import pandas as pd
 
-# import pytest
+import pytest
 
 from specutils import Spectrum1D
 
 from spyctral.core import core
 from spyctral.io import starlight
-from spyctral.utils.bunch import Bunch
-
+from spyctral.utils import buffers
+from spyctral.utils.bunch import Bunch, Lazy
 
 # =============================================================================
 # STARLIGHT TESTS
@@ -136,26 +140,507 @@ def test_read_starlight(file_path):
     assert isinstance(summary.extra_info.average_log_age, float)
 
 
-def test_is_float():
-    assert starlight._is_float(np.random.randint(1, 100))
+def test_get_ssp_contributions(file_path):
+    path = file_path("case_SC_Starlight.out")
+    summary = starlight.read_starlight(path)
+
+    ssps_vector = starlight._get_ssp_contributions(summary.data, 5)
+
+    assert isinstance(ssps_vector, np.ndarray)
+    assert ssps_vector.dtype.names == tuple(
+        summary.data.synthetic_results.colnames
+    )
+    assert ssps_vector.dtype["x_j"] == np.float64
+    assert ssps_vector.dtype["component_j"].kind == "U"
+    assert np.all(ssps_vector["x_j"] > 0)
+    np.testing.assert_allclose(ssps_vector["x_j"].sum(), 100)
+
+    # the DataFrame is only built when accessed
+    assert isinstance(summary.extra_info._data["ssps_vector"], Lazy)
+    ssps_df = summary.extra_info.ssps_vector
+    assert list(ssps_df.columns) == list(ssps_vector.dtype.names)
+    np.testing.assert_array_equal(ssps_df["x_j"], ssps_vector["x_j"])
+
+
+def test_proces_header_grammar(file_path):
+    for path in sorted(file_path("set_STARLIGHT_files").glob("*.out")):
+        with buffers.open_mapped(path) as buffer:
+            header_lines, _, _ = starlight._split_starlight(buffer)
+
+        generic = {}
+        for sl in header_lines:
+            starlight._proces_header_line(sl, generic)
+        header = starlight._proces_header(header_lines)
+
+        assert list(header) == list(generic)
+        for key, value in generic.items():
+            assert type(header[key]) is type(value)
+            assert header[key] == value or value != value
+
+
+@pytest.mark.parametrize(
+    "date, expected",
+    [
+        ("01/Apr/2007", dt.datetime(2007, 4, 1)),
+        ("31/dec/1999", dt.datetime(1999, 12, 31)),
+        ("15/MAY/2020", dt.datetime(2020, 5, 15)),
+    ],
+)
+def test_parse_date(date, expected):
+    assert starlight._parse_date(date) == expected
+
+
+def test_parse_date_unknown_month():
+    with pytest.raises(ValueError, match="Unknown month in the date"):
+        starlight._parse_date("01/Abr/2007")
+
+
+def test_proces_header_fallback():
+    header = starlight._proces_header(
+        [
+            "  3.5   [some_new_tag (A)]\n",
+            "  OBS-1.txt   [arq_obs]\n",
+            "  4020.00   [l_norm (A) - for base]\n",
+            "  1 NSIGMA   [Ntot_cliped & clip_method]\n",
+            "  0 0 0 0 2.0 NAN   [Clip-Bug, RC-Crash & Burn-In warning-flags, "
+            "n_censored_weights, wei_nsig_threshold & wei_limit]\n",
+        ]
+    )
+
+    assert header == {
+        "some_new_tag": 3.5,
+        "arq_obs": "OBS_1.txt",
+        "l_norm": 4020.0,
+        "Ntot_cliped": 1.0,
+        "clip_method": "NSIGMA",
+        "Clip_Bug": 0.0,
+        "RC_Crash": 0.0,
+        "Burn_In": 0.0,
+        "n_censored_weights": 0.0,
+        "wei_nsig_threshold": 2.0,
+        "wei_limit": "NAN",
+    }
+
+
+def test_split_starlight(file_path):
+    path = file_path("case_SC_Starlight.out")
+
+    with buffers.open_mapped(path) as buffer:
+        header_lines, block_titles, spans = starlight._split_starlight(buffer)
+        rows = {
+            name: buffer[start:stop].splitlines()
+            for name, (start, stop) in spans.items()
+        }
+        size = len(buffer)
+
+    assert len(header_lines) == 47
+    assert all("[" in line for line in header_lines)
+
+    assert list(spans) == [
+        "synthetic_results",
+        "results_average_chains_xj",
+        "results_average_chains_mj",
+        "results_average_chains_Av_chi2_mass",
+        "synthetic_spectrum",
+    ]
+    assert block_titles["synthetic_results"].startswith("# j     x_j(%)")
+    assert len(rows["synthetic_results"]) == 69
+    assert len(rows["results_average_chains_xj"]) == 69
+    assert rows["results_average_chains_xj"][0].split()[:2] == [
+        b"1",
+        b"3.0368",
+    ]
+    assert len(rows["results_average_chains_mj"]) == 69
+    assert [
+        row.split()[0] for row in rows["results_average_chains_Av_chi2_mass"]
+    ] == [b"AV", b"chi2", b"Mass"]
+    assert len(rows["synthetic_spectrum"]) == 1524
+    assert rows["synthetic_spectrum"][0].split() == [
+        b"3808.00",
+        b"0.77398",
+        b"0.73504",
+        b"36.115",
+    ]
+    assert spans["synthetic_spectrum"][1] == size
+
+
+def test_read_starlight_columns(file_path):
+    path = file_path("case_SC_Starlight.out")
+
+    summary = starlight.read_starlight(path)
+
+    results = summary.data.synthetic_results
+    assert results["component_j"].dtype.kind == "U"
+    assert results["component_j"][0] == "age020_m42"
+    assert results["x_j"].dtype == np.float64
+    assert results["x_j"][0].value == 3.0368
+
+    spectrum = summary.data.synthetic_spectrum
+    for name in spectrum.colnames:
+        assert spectrum[name].dtype == np.float64
+        assert spectrum[name].flags["C_CONTIGUOUS"]
+    assert spectrum["l_obs"][0].value == 3808.0
+    assert spectrum["weights"][8] == -1.0
 
+    av_chi2_mass = summary.data.results_average_chains_Av_chi2_mass
+    assert av_chi2_mass["AV"][0] == 0.7854
+    assert av_chi2_mass["Mass"][-1] == 9.5511e03
 
-def test_is_float_none():
-    assert not starlight._is_float(None)
 
+def test_read_starlight_spectra_views(file_path):
+    path = file_path("case_SC_Starlight.out")
+
+    summary = starlight.read_starlight(path)
+
+    table = summary.data.synthetic_spectrum
+    synthetic = summary.spectra.synthetic_spectrum
+    observed = summary.spectra.observed_spectrum
+
+    # the spectra are views of the table, on a single spectral axis
+    assert np.shares_memory(synthetic.flux.value, table["f_syn"])
+    assert np.shares_memory(observed.flux.value, table["f_obs"])
+    assert np.shares_memory(observed.spectral_axis, table["l_obs"])
+    assert synthetic.spectral_axis is observed.spectral_axis
+    assert synthetic.wcs is observed.wcs
+
+    # the residual spectrum is only computed when accessed
+    assert isinstance(summary.spectra._data["residual_spectrum"], Lazy)
+    residual = summary.spectra.residual_spectrum
+    assert residual.spectral_axis is observed.spectral_axis
+    np.testing.assert_array_equal(
+        residual.flux.value, table["f_obs"] - table["f_syn"]
+    )
+
+
+def test_read_starlight_lazy(file_path):
+    path = file_path("case_SC_Starlight.out")
+
+    eager = starlight.read_starlight(path)
+    summary = starlight.read_starlight(path, lazy=True)
+
+    assert dict(summary.header) == dict(eager.header)
+    assert summary.age == eager.age
+    assert summary.err_age == eager.err_age
+    assert summary.z_value == eager.z_value
+    assert summary.reddening == eager.reddening
+    assert isinstance(summary.data._data["synthetic_results"], QTable)
+    for name in starlight.SL_LAZY_TABLES:
+        assert isinstance(summary.data._data[name], Lazy)
+    for name in starlight.SL_SPECTRA_NAMES:
+        assert isinstance(summary.spectra._data[name], Lazy)
+
+    for name, table in eager.data.items():
+        assert summary.data[name].colnames == table.colnames
+        for col in table.colnames:
+            assert np.all(summary.data[name][col] == table[col])
+
+    for name, spectrum in eager.spectra.items():
+        assert isinstance(summary.spectra[name], Spectrum1D)
+        assert np.all(summary.spectra[name].flux == spectrum.flux)
+
+
+def test_read_starlight_lazy_relative_path(file_path, monkeypatch):
+    path = file_path("case_SC_Starlight.out")
+    monkeypatch.chdir(path.parent)
+
+    summary = starlight.read_starlight(path.name, lazy=True)
+    monkeypatch.chdir(path.parent.parent)
+
+    assert len(summary.data.synthetic_spectrum) == 1524
+
+
+def test_read_starlight_lazy_file_changed(file_path, tmp_path):
+    content = file_path("case_SC_Starlight.out").read_bytes()
+    path = tmp_path / "case.out"
+    path.write_bytes(content)
+
+    summary = starlight.read_starlight(path, lazy=True)
+    summary.data.results_average_chains_xj
+    path.write_bytes(b"# header\n" + content)
+
+    # tables built before the change are kept
+    assert len(summary.data.results_average_chains_xj) > 0
+    with pytest.raises(ValueError, match="changed since it was read"):
+        summary.data.synthetic_spectrum
+
+
+def test_read_starlight_lazy_compressed(file_path, tmp_path, monkeypatch):
+    path = tmp_path / "case.out.gz"
+    path.write_bytes(
+        gzip.compress(file_path("case_SC_Starlight.out").read_bytes())
+    )
+    spool = buffers._spool
+    calls = []
+    monkeypatch.setattr(
+        buffers, "_spool", lambda fp: calls.append(fp) or spool(fp)
+    )
+
+    summary = starlight.read_starlight(path, lazy=True)
+    assert len(calls) == 1
+
+    # each lazy table decompresses the file again
+    summary.data.synthetic_spectrum
+    summary.data.results_average_chains_xj
+    summary.data.synthetic_spectrum
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "compress", [None, gzip.compress, bz2.compress, lzma.compress]
+)
+@pytest.mark.parametrize("source", ["path", "bytes", "stream"])
+def test_read_starlight_sources(file_path, tmp_path, source, compress, lazy):
+    path = file_path("case_SC_Starlight.out")
+    content = path.read_bytes()
+    if compress is not None:
+        content = compress(content)
+
+    if source == "path":
+        path_or_buffer = tmp_path / "case.out.z"
+        path_or_buffer.write_bytes(content)
+    elif source == "bytes":
+        path_or_buffer = content
+    else:
+        path_or_buffer = io.BytesIO(content)
 
-"""
-def test_convert_to_float(file_path):
+    eager = starlight.read_starlight(path)
+    summary = starlight.read_starlight(path_or_buffer, lazy=lazy)
+
+    assert dict(summary.header) == dict(eager.header)
+    assert summary.age == eager.age
+    assert summary.z_value == eager.z_value
+    for name, table in eager.data.items():
+        for col in table.colnames:
+            assert np.all(summary.data[name][col] == table[col])
+    for name, spectrum in eager.spectra.items():
+        assert np.all(summary.spectra[name].flux == spectrum.flux)
+
+
+def test_scan_starlight_headers(file_path):
+    path = file_path("set_STARLIGHT_files")
+
+    headers = starlight.scan_starlight_headers(path)
+
+    assert isinstance(headers, pd.DataFrame)
+    assert len(headers) == 30
+    assert headers.index.name == "path"
+
+    summary = starlight.read_starlight(headers.index[0])
+    assert list(headers.columns) == list(summary.header)
+    assert headers.iloc[0]["AV_min"] == summary.header.AV_min
+    assert headers.iloc[0]["arq_obs"] == summary.header.arq_obs
+
+    for column in ["AV_min", "v0_min", "vd_min", "chi2_Nl_eff", "adev"]:
+        assert headers[column].dtype == np.float64
+    assert headers["S_N_in_S_N_window"].dtype == np.float64
+    assert headers["Date"].dtype.kind == "M"
+
+    # 'NAN' in some files
+    assert headers["wei_limit"].dtype == np.float64
+    assert headers["wei_limit"].isna().any()
+
+
+def test_scan_starlight_headers_paths(file_path):
+    paths = [
+        file_path("case_SC_Starlight.out"),
+        file_path("case_SC_Starlight_2.out"),
+    ]
+
+    headers = starlight.scan_starlight_headers(paths)
+
+    assert list(headers.index) == [str(p) for p in paths]
+    assert headers.loc[str(paths[0]), "l_norm"] == 4020.0
+    assert headers.loc[str(paths[0]), "Nl_obs"] == 1524.0
+
+
+def test_read_starlight_broken(file_path):
     path = file_path("case_SC_Starlight_broken.out")
 
     with pytest.raises(
         ValueError,
         match=re.escape(
-            "Element at position (1) in ['2', 'novalue', "
-            "'0.2377', '0.0000', '0.9042', '0.2231', '0.4009', "
-            "'0.0000', '0.4409', '0.0000'] table cannot be "
-            "converted to a number."
+            "Element in 'synthetic_spectrum' table cannot be converted to a "
+            "number: could not convert string 'novalue' to float64 at row 0, "
+            "column 2."
         ),
     ):
         starlight.read_starlight(path)
-"""
+
+
+def test_sweep_starlight(file_path):
+    path = file_path("case_SC_Starlight.out")
+    summary = starlight.read_starlight(path)
+
+    sweep = starlight.sweep_starlight(
+        summary, xj_percent=[1, 5, 10], rv=[2.5, 3.1]
+    )
+
+    assert list(sweep.columns) == [
+        "xj_percent",
+        "rv",
+        "age",
+        "err_age",
+        "average_log_age",
+        "z_value",
+        "reddening",
+        "av_value",
+    ]
+    assert len(sweep) == 6
+    assert list(sweep.xj_percent) == [1, 1, 5, 5, 10, 10]
+    assert list(sweep.rv) == [2.5, 3.1] * 3
+
+    for row in sweep.itertuples():
+        expected = starlight.read_starlight(
+            path, xj_percent=row.xj_percent, rv=row.rv
+        )
+        assert row.age == expected.age
+        assert row.err_age == expected.err_age
+        assert row.average_log_age == expected.extra_info.average_log_age
+        assert row.z_value == expected.z_value
+        assert row.reddening == expected.reddening
+        assert row.av_value == expected.av_value
+
+
+def test_sweep_starlight_path(file_path):
+    path = file_path("case_SC_Starlight.out")
+    summary = starlight.read_starlight(path, xj_percent=10, rv=2.5)
+
+    sweep = starlight.sweep_starlight(path, xj_percent=10, rv=2.5)
+
+    assert len(sweep) == 1
+    assert sweep.age[0] == summary.age
+    assert sweep.reddening[0] == summary.reddening
+
+    # the settings of the summary are the default grid
+    sweep = starlight.sweep_starlight(summary)
+    assert sweep.xj_percent[0] == 10
+    assert sweep.rv[0] == 2.5
+    assert sweep.z_value[0] == summary.z_value
+
+
+def test_sweep_starlight_empty_cutoff(file_path):
+    path = file_path("case_SC_Starlight.out")
+
+    sweep = starlight.sweep_starlight(path, xj_percent=[100])
+
+    assert np.isnan(sweep.age[0])
+    assert np.isnan(sweep.z_value[0])
+
+
+def test_summarize_starlight_chains(file_path):
+    path = file_path("case_SC_Starlight.out")
+    summary = starlight.read_starlight(path)
+
+    chains = starlight.summarize_starlight_chains(summary)
+
+    assert len(chains) == 1
+    assert chains.obj_name[0] == "object_1"
+    assert chains.n_chains[0] == 7
+
+    # the best model gives the values of the summary
+    assert round(chains.age_best[0], 2) == summary.age
+    assert round(chains.log_age_best[0], 2) == (
+        summary.extra_info.average_log_age
+    )
+    assert round(chains.z_value_best[0], 3) == summary.z_value
+    assert chains.av_value_best[0] == summary.av_value
+
+    # each chain weights the SSPs with its own contributions
+    table = summary.data.results_average_chains_xj
+    results = summary.data.synthetic_results
+    ages = []
+    for name in table.colnames[3:]:
+        x_j = np.where(table[name] > 5, table[name], 0)
+        ages.append(np.sum(x_j * results["age_j"]) / np.sum(x_j))
+    np.testing.assert_allclose(chains.age_mean[0], np.mean(ages))
+    np.testing.assert_allclose(chains.age_std[0], np.std(ages, ddof=1))
+    assert chains.age_min[0] == pytest.approx(min(ages))
+
+    av = summary.data.results_average_chains_Av_chi2_mass["AV"][2:]
+    np.testing.assert_allclose(chains.av_value_mean[0], np.mean(av))
+    assert chains.age_spread_ratio[0] >= 1
+
+
+def test_summarize_starlight_chains_batch(file_path):
+    paths = sorted(file_path("set_STARLIGHT_files").glob("*.out"))[:5]
+    paths.append(file_path("case_SC_Starlight_oneSSP.out"))
+
+    batch = starlight.summarize_starlight_chains(paths)
+
+    single = pd.concat(
+        [starlight.summarize_starlight_chains(path) for path in paths],
+        ignore_index=True,
+    )
+    pd.testing.assert_frame_equal(batch, single)
+
+    # a single SSP has the same age in every chain
+    assert batch.age_std.iloc[-1] == 0
+    assert batch.age_spread_ratio.iloc[-1] == 1
+
+
+def test_summarize_starlight_chains_directory(file_path):
+    folder = file_path("set_STARLIGHT_files")
+    paths = sorted(folder.glob("*.out"))
+
+    chains = starlight.summarize_starlight_chains(folder)
+
+    assert len(chains) == len(paths) == 30
+    pd.testing.assert_frame_equal(
+        chains, starlight.summarize_starlight_chains(paths)
+    )
+    pd.testing.assert_frame_equal(
+        chains, starlight.summarize_starlight_chains(str(folder / "*.out"))
+    )
+
+
+def test_read_starlight_many(file_path):
+    paths = sorted(file_path("set_STARLIGHT_files").glob("*.out"))[:6]
+
+    summaries = starlight.read_starlight_many(
+        paths[::-1], workers=2, xj_percent=10
+    )
+
+    assert len(summaries) == 6
+    for path, summary in zip(paths[::-1], summaries):
+        expected = starlight.read_starlight(path, xj_percent=10)
+        assert isinstance(summary, core.SpectralSummary)
+        assert summary.header.arq_obs == expected.header.arq_obs
+        assert summary.age == expected.age
+        assert summary.extra_info.xj_percent == 10
+
+        assert isinstance(summary.data._data["synthetic_spectrum"], Lazy)
+        spectrum = summary.data.synthetic_spectrum
+        assert spectrum.colnames == expected.data.synthetic_spectrum.colnames
+        assert (
+            spectrum["l_obs"].unit
+            == expected.data.synthetic_spectrum["l_obs"].unit
+        )
+        np.testing.assert_array_equal(
+            summary.spectra.residual_spectrum.flux,
+            expected.spectra.residual_spectrum.flux,
+        )
+
+
+def test_read_starlight_many_compact(file_path):
+    directory = file_path("set_STARLIGHT_files")
+
+    compact = starlight.read_starlight_many(
+        directory, workers=2, chunksize=4, compact=True
+    )
+
+    paths = sorted(directory.glob("*.out"))
+    assert list(compact.index) == [str(path) for path in paths]
+    assert list(compact.columns) == list(starlight.SL_COMPACT_COLUMNS[1:])
+
+    expected = starlight.read_starlight(paths[0])
+    row = compact.iloc[0]
+    assert row.age == expected.age
+    assert row.z_value == expected.z_value
+    assert row.average_log_age == expected.extra_info.average_log_age
+
+    # a glob and a single worker give the same table
+    serial = starlight.read_starlight_many(
+        str(directory / "*.out"), workers=1, compact=True
+    )
+    pd.testing.assert_frame_equal(compact, serial)
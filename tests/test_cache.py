@@ -0,0 +1,400 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Test for spyctral.cache"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import concurrent.futures as cf
+import errno
+import os
+import shutil
+
+import numpy as np
+
+import pytest
+
+from spyctral import cache
+from spyctral.io import fisa, starlight
+from spyctral.utils.bunch import Lazy
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    yield cache.enable(tmp_path / "cache")
+    cache.disable()
+
+
+@pytest.fixture
+def memory_cache():
+    yield cache.enable_memory()
+    cache.disable_memory()
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_enable_disable(tmp_path):
+    assert cache.get_cache() is None
+
+    disk_cache = cache.enable(tmp_path / "a" / "b", max_bytes=10)
+    try:
+        assert cache.get_cache() is disk_cache
+        assert disk_cache.path.is_dir()
+        assert disk_cache.max_bytes == 10
+    finally:
+        cache.disable()
+
+    assert cache.get_cache() is None
+
+
+def test_cached_read_starlight(file_path, disk_cache):
+    path = file_path("case_SC_Starlight.out")
+
+    first = starlight.read_starlight(path)
+    second = starlight.read_starlight(path, xj_percent=5)
+
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+    assert len(disk_cache.entries()) == 1
+    assert second.age == first.age
+    assert dict(second.header) == dict(first.header)
+    np.testing.assert_array_equal(
+        second.data.synthetic_spectrum["f_obs"],
+        first.data.synthetic_spectrum["f_obs"],
+    )
+
+    # other arguments are another entry
+    other = starlight.read_starlight(path, xj_percent=10)
+    assert (disk_cache.hits, disk_cache.misses) == (1, 2)
+    assert len(disk_cache.entries()) == 2
+    assert other.extra_info.xj_percent == 10
+
+
+def test_cached_read_fisa(file_path, disk_cache):
+    path = file_path("fisa_1.fisa")
+
+    first = fisa.read_fisa(path)
+    second = fisa.read_fisa(path)
+
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+    assert second.header == first.header
+    assert second.z_value == first.z_value
+
+
+def test_cache_invalidated_by_file_change(file_path, tmp_path, disk_cache):
+    path = tmp_path / "case.fisa"
+    shutil.copy(file_path("fisa_1.fisa"), path)
+    fisa.read_fisa(path)
+
+    shutil.copy(file_path("fisa_2.fisa"), path)
+    os.utime(path, ns=(0, 0))
+    summary = fisa.read_fisa(path)
+
+    assert disk_cache.misses == 2
+    assert summary.header == fisa.read_fisa(file_path("fisa_2.fisa")).header
+
+
+def test_cache_hash_content(file_path, tmp_path):
+    disk_cache = cache.enable(tmp_path / "cache", hash_content=True)
+    try:
+        for name in ("a.fisa", "b.fisa"):
+            shutil.copy(file_path("fisa_1.fisa"), tmp_path / name)
+            fisa.read_fisa(tmp_path / name)
+    finally:
+        cache.disable()
+
+    # same content, same entry
+    assert (disk_cache.hits, disk_cache.misses) == (1, 1)
+
+
+def test_cache_buffers_not_cached(file_path, disk_cache):
+    content = file_path("fisa_1.fisa").read_bytes()
+
+    fisa.read_fisa(content)
+
+    assert (disk_cache.hits, disk_cache.misses) == (0, 0)
+    assert disk_cache.entries() == []
+
+
+def test_cache_evict_lru(file_path, disk_cache):
+    paths = [file_path(f"fisa_{i}.fisa") for i in (1, 2, 3)]
+    for path in paths:
+        fisa.read_fisa(path)
+    keys = [key for key, _, _ in disk_cache.entries()]
+
+    # the first file becomes the most recently used
+    os.utime(disk_cache.path / keys[0], ns=(2**62, 2**62))
+    sizes = {key: size for key, _, size in disk_cache.entries()}
+    disk_cache.evict(sizes[keys[0]] + sizes[keys[2]])
+
+    assert {key for key, _, _ in disk_cache.entries()} == {keys[0], keys[2]}
+
+
+def test_cache_max_bytes(file_path, tmp_path):
+    disk_cache = cache.enable(tmp_path / "cache", max_bytes=1)
+    try:
+        fisa.read_fisa(file_path("fisa_1.fisa"))
+    finally:
+        cache.disable()
+
+    assert disk_cache.entries() == []
+
+
+def test_cache_max_bytes_estimate(file_path, tmp_path, monkeypatch):
+    disk_cache = cache.enable(tmp_path / "cache", max_bytes=2**30)
+    listings = []
+    entries = cache.DiskCache.entries
+    monkeypatch.setattr(
+        cache.DiskCache,
+        "entries",
+        lambda self: listings.append(1) or entries(self),
+    )
+    try:
+        for i in (1, 2, 3, 4):
+            fisa.read_fisa(file_path(f"fisa_{i}.fisa"))
+    finally:
+        cache.disable()
+
+    # the entries are listed once, then the size is added up
+    assert len(listings) == 1
+    assert disk_cache.nbytes == sum(
+        size for _, _, size in entries(disk_cache)
+    )
+
+    disk_cache.max_bytes = disk_cache.nbytes - 1
+    disk_cache.store("other", fisa.read_fisa(file_path("fisa_1.fisa")))
+    assert len(listings) == 2
+    assert disk_cache.nbytes <= disk_cache.max_bytes
+
+
+def test_cache_store_errors(file_path, tmp_path, monkeypatch):
+    disk_cache = cache.DiskCache(tmp_path / "cache")
+    summary = fisa.read_fisa(file_path("fisa_1.fisa"))
+    disk_cache.store("key", summary)
+
+    # an entry stored by another process is kept
+    disk_cache.store("key", summary)
+    assert [key for key, _, _ in disk_cache.entries()] == ["key"]
+
+    def rename(src, dst):
+        raise PermissionError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setattr(os, "rename", rename)
+    with pytest.raises(PermissionError):
+        disk_cache.store("other", summary)
+    assert [p.name for p in disk_cache.path.iterdir()] == ["key"]
+
+
+def test_cache_lazy_not_stored(file_path, disk_cache):
+    path = file_path("case_SC_Starlight.out")
+
+    summary = starlight.read_starlight(path, lazy=True)
+
+    assert isinstance(summary.data._data["synthetic_spectrum"], Lazy)
+    assert (disk_cache.hits, disk_cache.misses) == (0, 0)
+    assert disk_cache.entries() == []
+
+
+def test_cache_clear(file_path, disk_cache):
+    fisa.read_fisa(file_path("fisa_1.fisa"))
+
+    disk_cache.clear()
+
+    assert disk_cache.entries() == []
+    assert list(disk_cache.path.iterdir()) == []
+
+
+def test_cache_shared_by_processes(file_path, tmp_path):
+    path = file_path("case_SC_Starlight.out")
+    cache_dir = tmp_path / "cache"
+
+    with cf.ProcessPoolExecutor(
+        2, initializer=cache.enable, initargs=(cache_dir,)
+    ) as executor:
+        ages = list(executor.map(_read_age, [path] * 6))
+
+    assert len(set(ages)) == 1
+    disk_cache = cache.DiskCache(cache_dir)
+    assert len(disk_cache.entries()) == 1
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_cached_read_starlight_many(file_path, disk_cache, memory_cache):
+    paths = sorted(file_path("set_STARLIGHT_files").glob("*.out"))[:4]
+
+    first = starlight.read_starlight_many(paths, workers=1)
+    assert (disk_cache.hits, disk_cache.misses) == (0, 4)
+    assert (memory_cache.hits, memory_cache.misses) == (0, 4)
+
+    second = starlight.read_starlight_many(paths, workers=1)
+    assert memory_cache.hits == 4
+
+    cache.disable_memory()
+    third = starlight.read_starlight_many(paths, workers=1)
+    assert (disk_cache.hits, disk_cache.misses) == (4, 4)
+
+    # the processes load the entries and send back every table
+    parallel = starlight.read_starlight_many(paths, workers=2)
+    assert len(disk_cache.entries()) == 4
+
+    for summaries in (second, third, parallel):
+        for summary, expected in zip(summaries, first):
+            assert summary.age == expected.age
+            np.testing.assert_array_equal(
+                summary.data.synthetic_spectrum["f_syn"],
+                expected.data.synthetic_spectrum["f_syn"],
+            )
+            assert summary.extra_info.ssps_vector.equals(
+                expected.extra_info.ssps_vector
+            )
+
+
+def _read_age(path):
+    return starlight.read_starlight(path).age
+
+
+def test_enable_disable_memory():
+    assert cache.get_memory_cache() is None
+
+    memory_cache = cache.enable_memory(max_entries=3, max_bytes=10)
+    try:
+        assert cache.get_memory_cache() is memory_cache
+        assert memory_cache.max_entries == 3
+        assert memory_cache.max_bytes == 10
+    finally:
+        cache.disable_memory()
+
+    assert cache.get_memory_cache() is None
+
+
+def test_memory_cache_read_starlight(file_path, memory_cache):
+    path = file_path("case_SC_Starlight.out")
+
+    first = starlight.read_starlight(path)
+    second = starlight.read_starlight(str(path), xj_percent=5)
+    other = starlight.read_starlight(path, xj_percent=10)
+
+    assert memory_cache.stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+        "invalidations": 0,
+        "entries": 2,
+        "nbytes": memory_cache.nbytes,
+    }
+    assert memory_cache.nbytes > 0
+    assert second is not first
+    assert second.age == first.age
+    np.testing.assert_array_equal(
+        second.data.synthetic_spectrum["f_obs"],
+        first.data.synthetic_spectrum["f_obs"],
+    )
+    assert other.extra_info.xj_percent == 10
+
+
+def test_memory_cache_no_aliasing(file_path, memory_cache):
+    path = file_path("case_SC_Starlight.out")
+    expected = starlight.read_starlight(path)
+
+    summary = starlight.read_starlight(path)
+    summary.data.synthetic_spectrum["f_obs"][:] = 0.0
+    summary.spectra.observed_spectrum.flux.value[:] = 0.0
+    summary.header._data["new"] = 1
+    summary.extra_info._data.pop("xj_percent")
+
+    again = starlight.read_starlight(path)
+    np.testing.assert_array_equal(
+        again.data.synthetic_spectrum["f_obs"],
+        expected.data.synthetic_spectrum["f_obs"],
+    )
+    np.testing.assert_array_equal(
+        again.spectra.observed_spectrum.flux,
+        expected.spectra.observed_spectrum.flux,
+    )
+    assert "new" not in again.header
+    assert "xj_percent" in again.extra_info
+    assert memory_cache.hits == 2
+
+
+def test_memory_cache_invalidated_by_file_change(
+    file_path, tmp_path, memory_cache
+):
+    path = tmp_path / "case.fisa"
+    shutil.copy(file_path("fisa_1.fisa"), path)
+    fisa.read_fisa(path)
+
+    shutil.copy(file_path("fisa_2.fisa"), path)
+    os.utime(path, ns=(0, 0))
+    summary = fisa.read_fisa(path)
+
+    assert (memory_cache.misses, memory_cache.invalidations) == (2, 1)
+    assert len(memory_cache) == 1
+    assert summary.header == fisa.read_fisa(file_path("fisa_2.fisa")).header
+
+
+def test_memory_cache_max_entries(file_path):
+    memory_cache = cache.enable_memory(max_entries=2)
+    try:
+        for i in (1, 2, 1, 3):
+            fisa.read_fisa(file_path(f"fisa_{i}.fisa"))
+        fisa.read_fisa(file_path("fisa_1.fisa"))
+    finally:
+        cache.disable_memory()
+
+    # fisa_2 was the least recently used when fisa_3 was read
+    assert (memory_cache.hits, memory_cache.misses) == (2, 3)
+    assert memory_cache.evictions == 1
+    assert len(memory_cache) == 2
+
+
+def test_memory_cache_max_bytes(file_path):
+    memory_cache = cache.enable_memory(max_bytes=1)
+    try:
+        summary = fisa.read_fisa(file_path("fisa_1.fisa"))
+    finally:
+        cache.disable_memory()
+
+    assert len(memory_cache) == 0
+    assert memory_cache.nbytes == 0
+    assert memory_cache.evictions == 1
+    assert summary.header  # the copy outlives its entry
+
+
+def test_memory_cache_lazy_values_counted(file_path, memory_cache):
+    path = file_path("case_SC_Starlight.out")
+
+    summary = starlight.read_starlight(path, lazy=True)
+    nbytes = memory_cache.nbytes
+    summary.data.synthetic_spectrum
+
+    assert memory_cache.nbytes > nbytes
+
+
+def test_memory_cache_before_disk_cache(file_path, disk_cache, memory_cache):
+    path = file_path("fisa_1.fisa")
+
+    for _ in range(3):
+        fisa.read_fisa(path)
+
+    assert (disk_cache.hits, disk_cache.misses) == (0, 1)
+    assert (memory_cache.hits, memory_cache.misses) == (2, 1)
+
+
+def test_memory_cache_buffers_not_cached(file_path, memory_cache):
+    fisa.read_fisa(file_path("fisa_1.fisa").read_bytes())
+
+    assert memory_cache.stats()["entries"] == 0
+    assert (memory_cache.hits, memory_cache.misses) == (0, 0)
@@ -0,0 +1,137 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Test for spyctral (the package namespace)"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import spyctral
+from spyctral import core
+from spyctral.io import fisa, starlight
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Budget of 'import spyctral' in microseconds, as reported by
+# 'python -X importtime'. Loading the readers eagerly takes well over a
+# second, the lazy namespace a few milliseconds.
+IMPORT_TIME_BUDGET = 100_000
+
+HEAVY_MODULES = ("numpy", "pandas", "astropy", "specutils", "matplotlib")
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+
+def _run(code, *options):
+    """Runs code in a new interpreter and returns its stdout and stderr."""
+    result = subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout, result.stderr
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_import_does_not_load_dependencies():
+    stdout, _ = _run(
+        "import json, sys, spyctral; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} "
+        "if m in sys.modules]))"
+    )
+
+    assert json.loads(stdout) == []
+
+
+def test_import_core_does_not_load_readers():
+    stdout, _ = _run(
+        "import sys, spyctral.core.core; "
+        "print('spyctral.io.fisa' in sys.modules, 'specutils' in sys.modules)"
+    )
+
+    assert stdout.split() == ["False", "False"]
+
+
+def test_instrument_does_not_load_dependencies():
+    stdout, _ = _run(
+        "import json, sys, spyctral; "
+        "spyctral.instrument; spyctral.profiling.stage('r', 's'); "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} "
+        "if m in sys.modules]))"
+    )
+
+    assert json.loads(stdout) == []
+
+
+def test_lazy_subpackages():
+    stdout, _ = _run(
+        "import spyctral; "
+        "print(spyctral.core.plot.__name__, spyctral.io.__name__, "
+        "spyctral.utils.__name__, spyctral.core.collection.__name__)"
+    )
+
+    assert stdout.split() == [
+        "spyctral.core.plot",
+        "spyctral.io",
+        "spyctral.utils",
+        "spyctral.core.collection",
+    ]
+
+
+def test_import_time_budget():
+    _, stderr = _run("import spyctral", "-X", "importtime")
+
+    # lines look like "import time:  self [us] | cumulative | name"
+    cumulative = {
+        fields[2].strip(): int(fields[1])
+        for fields in (
+            line.split(":", 1)[1].split("|") for line in stderr.splitlines()
+        )
+        if fields[1].strip().isdigit()
+    }
+    assert cumulative["spyctral"] < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize("name", spyctral.__all__)
+def test_lazy_attributes(name):
+    value = getattr(spyctral, name)
+
+    assert name in dir(spyctral)
+    assert spyctral.__dict__[name] is value
+
+
+def test_lazy_attributes_resolve_to_the_modules():
+    assert spyctral.read_starlight is starlight.read_starlight
+    assert spyctral.read_fisa is fisa.read_fisa
+    assert spyctral.fisa is fisa
+    assert spyctral.SpectralSummary is core.core.SpectralSummary
+    assert core.read_fisa is fisa.read_fisa
+    assert core.SpectralCollection is core.collection.SpectralCollection
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match="has no attribute 'foo'"):
+        spyctral.foo
+    with pytest.raises(AttributeError, match="has no attribute 'foo'"):
+        core.foo
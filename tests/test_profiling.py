@@ -0,0 +1,155 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Test for spyctral.profiling"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import numpy as np
+
+import pytest
+
+import spyctral
+from spyctral import profiling
+from spyctral.io import fisa, starlight
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_stage_disabled():
+    assert profiling._PROFILES == ()
+
+    with profiling.stage("reader", "stage") as current:
+        current.count(nbytes=10, rows=1)
+
+    assert current is profiling._NULL_STAGE
+    assert profiling.stage("other", "stage") is current
+
+
+def test_instrument_read_starlight(file_path):
+    path = file_path("case_SC_Starlight.out")
+    events = []
+
+    with spyctral.instrument(on_stage=events.append) as profile:
+        summary = starlight.read_starlight(path)
+
+    assert profiling._PROFILES == ()
+    df = profile.to_dataframe()
+    assert list(df.columns) == ["calls", "seconds", "nbytes", "rows"]
+    assert list(df.loc["read_starlight"].index) == [
+        "split",
+        "decode",
+        "qtable",
+        "header",
+        "properties",
+        "spectra",
+    ]
+    assert len(events) == df["calls"].sum()
+    assert all(event.seconds >= 0 for event in events)
+
+    stages = df.loc["read_starlight"]
+    n_pixels = len(summary.data.synthetic_spectrum)
+    header_lines, _, _ = starlight._split_starlight(path.read_bytes())
+    assert stages.loc["split", "rows"] == len(header_lines)
+    assert stages.loc["header", "rows"] == len(header_lines)
+    assert stages.loc["properties", "rows"] == 69
+    assert stages.loc["spectra", "rows"] == n_pixels
+    assert stages.loc["qtable", "calls"] == 5
+    # the scan stops at the spectrum, which is decoded afterwards
+    assert stages.loc["split", "nbytes"] < path.stat().st_size
+    assert stages.loc["decode", "nbytes"] > n_pixels * 30
+
+
+def test_instrument_read_fisa(file_path):
+    path = file_path("fisa_4.fisa")
+
+    with spyctral.instrument() as profile:
+        summary = fisa.read_fisa(path)
+
+    stages = profile.to_dataframe().loc["read_fisa"]
+    n_rows = sum(len(table) for table in summary.data.values())
+    assert list(stages.index) == [
+        "split",
+        "header",
+        "decode",
+        "qtable",
+        "properties",
+        "spectra",
+    ]
+    assert stages.loc["split", "nbytes"] == path.stat().st_size
+    assert stages.loc["decode", "rows"] == n_rows
+    assert stages.loc["qtable", "rows"] == n_rows
+    assert stages.loc["spectra", "rows"] == n_rows
+
+
+def test_instrument_aggregates_files(file_path):
+    paths = sorted(file_path("set_STARLIGHT_files").glob("*.out"))[:4]
+
+    with spyctral.instrument() as profile:
+        for path in paths:
+            starlight.read_starlight(path)
+        single = profile.to_dataframe()
+        profile.clear()
+        starlight.read_starlight(paths[0])
+        first = profile.to_dataframe()
+
+    assert (single["calls"] == 4 * first["calls"]).all()
+    expected = sum(
+        len(starlight.read_starlight(p).data.synthetic_spectrum)
+        for p in paths
+    )
+    assert single.loc[("read_starlight", "spectra"), "rows"] == expected
+
+
+def test_instrument_lazy_tables(file_path):
+    path = file_path("case_SC_Starlight.out")
+
+    summary = starlight.read_starlight(path, lazy=True)
+    with spyctral.instrument() as profile:
+        spectrum = summary.spectra.observed_spectrum
+
+    stages = profile.to_dataframe().loc["read_starlight"]
+    assert list(stages.index) == ["decode", "qtable", "spectra"]
+    assert stages.loc["spectra", "rows"] == len(spectrum.flux)
+
+
+def test_instrument_nested(file_path):
+    path = file_path("fisa_1.fisa")
+
+    with spyctral.instrument() as outer:
+        fisa.read_fisa(path)
+        with spyctral.instrument() as inner:
+            fisa.read_fisa(path)
+        assert profiling._PROFILES == (outer,)
+
+    outer_calls = outer.to_dataframe()["calls"]
+    inner_calls = inner.to_dataframe()["calls"]
+    np.testing.assert_array_equal(outer_calls, 2 * inner_calls)
+
+
+def test_instrument_stage_raises():
+    with spyctral.instrument() as profile:
+        with pytest.raises(ValueError):
+            with profiling.stage("reader", "stage") as current:
+                current.count(nbytes=3)
+                raise ValueError()
+
+    stats = profile.stages["reader", "stage"]
+    assert (stats.calls, stats.nbytes, stats.rows) == (1, 3, 0)
+    assert profiling._PROFILES == ()
+
+
+def test_profile_empty():
+    df = profiling.Profile().to_dataframe()
+
+    assert len(df) == 0
+    assert df.index.names == ["reader", "stage"]
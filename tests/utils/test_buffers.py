@@ -0,0 +1,246 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+# =============================================================================
+# DOCS
+# =============================================================================
+
+"""
+Test for spyctral.utils.buffers
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+
+import numpy as np
+
+import pytest
+
+from spyctral.utils import buffers
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_open_mapped(file_path):
+    path = file_path("fisa_1.fisa")
+
+    with buffers.open_mapped(path) as buffer:
+        assert isinstance(buffer, mmap.mmap)
+        assert buffer[:] == path.read_bytes()
+
+    assert buffer.closed
+
+
+def test_open_mapped_empty(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    with buffers.open_mapped(path) as buffer:
+        assert buffer == b""
+        assert list(buffers.iter_lines(buffer)) == []
+        assert list(buffers.iter_blocks(buffer)) == []
+
+
+@pytest.mark.parametrize(
+    "compress",
+    [lambda data: data, gzip.compress, bz2.compress, lzma.compress],
+)
+def test_open_mapped_sources(tmp_path, compress):
+    content = b"1 2\n3 4\n" * 1000
+    path = tmp_path / "table.txt"
+    path.write_bytes(compress(content))
+
+    for path_or_buffer in (path, str(path), compress(content)):
+        with buffers.open_mapped(path_or_buffer) as buffer:
+            assert buffer[:] == content
+
+    with open(path, "rb") as fp, buffers.open_mapped(fp) as buffer:
+        assert buffer[:] == content
+
+
+def test_open_mapped_text_stream():
+    with buffers.open_mapped(io.StringIO("1 2\n3 4\n")) as buffer:
+        assert buffer[:] == b"1 2\n3 4\n"
+
+    with buffers.open_mapped(io.StringIO("")) as buffer:
+        assert buffer == b""
+
+
+def test_open_mapped_chunks(monkeypatch):
+    monkeypatch.setattr(buffers, "CHUNK_SIZE", 7)
+    content = bytes(range(256)) * 10
+    # two concatenated gzip members are read as one stream
+    stream = io.BytesIO(gzip.compress(content) + gzip.compress(content))
+
+    with buffers.open_mapped(stream) as buffer:
+        assert len(buffer) == 2 * len(content)
+        assert buffer[:] == content + content
+
+
+class _TrickleStream:
+    """Stream that gives one byte per read, like a slow pipe."""
+
+    def __init__(self, content):
+        self._stream = io.BytesIO(content)
+
+    def read(self, size=-1):
+        return self._stream.read(1)
+
+
+@pytest.mark.parametrize(
+    "compress", [gzip.compress, bz2.compress, lzma.compress]
+)
+def test_open_mapped_short_reads(compress):
+    content = b"1 2\n3 4\n" * 100
+
+    with buffers.open_mapped(_TrickleStream(compress(content))) as buffer:
+        assert buffer[:] == content
+
+    with buffers.open_mapped(_TrickleStream(b"1")) as buffer:
+        assert buffer[:] == b"1"
+
+
+def test_open_mapped_truncated():
+    content = gzip.compress(b"1 2\n3 4\n" * 1000)
+
+    with pytest.raises(ValueError, match="Compressed data ended"):
+        with buffers.open_mapped(content[:-10]):
+            pass
+
+
+def test_file_identity(tmp_path, monkeypatch):
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"12")
+    link = tmp_path / "link.txt"
+    link.symlink_to(path)
+    monkeypatch.chdir(tmp_path)
+
+    identity = buffers.file_identity("link.txt")
+
+    assert identity[:2] == (str(path.resolve()), 2)
+    assert buffers.file_identity(path) == identity
+    path.write_bytes(b"34 ")
+    assert buffers.file_identity(path) != identity
+
+
+def test_iter_lines():
+    buffer = b"a b\r\n\nc"
+
+    assert list(buffers.iter_lines(buffer)) == [b"a b\r\n", b"\n", b"c"]
+    assert list(buffers.iter_lines(buffer, 5)) == [b"\n", b"c"]
+
+
+def test_iter_blocks():
+    buffer = b"1 2\r\n3 4\r\n\r\n  \r\n5 6\n\n\n7 8\n\n"
+
+    spans = list(buffers.iter_blocks(buffer))
+
+    assert [buffer[start:stop] for start, stop in spans] == [
+        b"1 2\r\n3 4\r\n",
+        b"5 6\n",
+        b"7 8\n",
+    ]
+
+
+def test_decode_floats():
+    buffer = b"#\n 1.0  2.0\r\n3.0 4E1\r\n\r\n"
+
+    values = buffers.decode_floats(buffer, 2)
+
+    np.testing.assert_array_equal(values, [[1.0, 3.0], [2.0, 40.0]])
+    assert values.dtype == np.float64
+    assert values.flags["C_CONTIGUOUS"]
+
+
+def test_decode_floats_bad_element():
+    with pytest.raises(
+        ValueError,
+        match="Element in 'foo' table cannot be converted to a number: "
+        "could not convert string 'x'",
+    ):
+        buffers.decode_floats(b"1 2\n3 x\n", name="foo")
+
+
+def test_decode_floats_ragged_rows():
+    with pytest.raises(
+        ValueError, match="Element in 'table' table cannot be converted"
+    ):
+        buffers.decode_floats(b"1 2 3\n4 5\n6\n")
+
+
+def test_decode_floats_ragged_rows_same_size():
+    # 9 elements fit a 3x3 table, but the rows have 3, 2 and 4 elements
+    with pytest.raises(
+        ValueError, match="number of columns changed from 3 to 2 at row 2"
+    ):
+        buffers.decode_floats(b"1 2 3\n4 5\n6 7 8 9\n")
+
+
+def test_decode_blocks():
+    buffer = b"1 2\n3 4\n\n5 6\n\n\n7 8\n9 10\n"
+    spans = list(buffers.iter_blocks(buffer))
+
+    blocks = buffers.decode_blocks(buffer, spans)
+
+    assert [block.tolist() for block in blocks] == [
+        [[1.0, 2.0], [3.0, 4.0]],
+        [[5.0, 6.0]],
+        [[7.0, 8.0], [9.0, 10.0]],
+    ]
+    assert all(block.base is blocks[0].base for block in blocks)
+    assert buffers.decode_blocks(buffer, []) == []
+
+
+def test_decode_blocks_bad_element():
+    buffer = b"1 2\n3 4\n\n5 x\n"
+    spans = list(buffers.iter_blocks(buffer))
+
+    with pytest.raises(
+        ValueError, match="Element in 'foo' table cannot be converted"
+    ):
+        buffers.decode_blocks(buffer, spans, names=["bar", "foo"])
+
+
+def test_decode_blocks_ragged_rows():
+    buffer = b"1 2\n3 4\n\n5\n6 7 8\n"
+    spans = list(buffers.iter_blocks(buffer))
+
+    with pytest.raises(
+        ValueError, match="Element in 'block 1' table cannot be converted"
+    ):
+        buffers.decode_blocks(buffer, spans)
+
+
+def test_decode_blocks_different_columns():
+    buffer = b"1 2\n3 4\n\n5 6 7\n8 9 10\n"
+    spans = list(buffers.iter_blocks(buffer))
+
+    with pytest.raises(ValueError, match="same number of columns"):
+        buffers.decode_blocks(buffer, spans)
+
+
+def test_resolve_paths(file_path):
+    folder = file_path("set_STARLIGHT_files")
+
+    paths = buffers.resolve_paths(folder, "*.out")
+
+    assert len(paths) == 30
+    assert paths == sorted(paths)
+    assert buffers.resolve_paths(str(folder / "*.out")) == list(
+        map(str, paths)
+    )
+    assert buffers.resolve_paths(paths[0]) == [paths[0]]
+    assert buffers.resolve_paths(iter(paths)) == paths
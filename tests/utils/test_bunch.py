@@ -22,6 +22,7 @@ Test for spyctral.utils.bunch
 # =============================================================================
 
 import copy
+import pickle
 
 import pytest
 
@@ -89,3 +90,48 @@ def test_bunch_copy():
     assert md is not md_c
     assert md._name == md_c._name
     assert md._data == md_c._data and md._data is md_c._data
+
+
+def test_bunch_lazy():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return [1, 2]
+
+    md = bunch.Bunch("foo", {"alfa": bunch.Lazy(load)})
+    assert "alfa" in md
+    assert calls == []
+
+    assert md.alfa == md["alfa"] == [1, 2]
+    assert md.alfa is md["alfa"]
+    assert calls == [1]
+
+
+def test_lazy_repr():
+    value = bunch.Lazy(lambda: 1)
+    assert repr(value) == "<Lazy pending>"
+    assert value() == 1
+    assert repr(value) == "<Lazy loaded>"
+
+
+def test_bunch_pickle():
+    md = bunch.Bunch("foo", {"alfa": 1, "beta": bunch.Lazy(int)})
+    result = pickle.loads(pickle.dumps(md))
+    assert result.alfa == 1
+    assert result.beta == 0
+    assert repr(result) == repr(md)
+
+
+def test_bunch_slots():
+    md = bunch.Bunch("foo", {"alfa": 1})
+    assert not hasattr(md, "__dict__")
+    with pytest.raises(AttributeError):
+        md.beta = 2
+
+
+def test_bunch_unpickle_dict_state():
+    md = bunch.Bunch.__new__(bunch.Bunch)
+    md.__setstate__({"_name": "foo", "_data": {"alfa": 1}})
+    assert md.alfa == 1
+    assert repr(md) == "<foo {'alfa'}>"
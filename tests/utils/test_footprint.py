@@ -0,0 +1,75 @@
+# !/usr/bin/env python
+# -*- coding: utf-8 -*-
+# License: MIT
+# Copyright (c) 2023, Cerdosino Candela, Fiore J.Manuel, Martinez J.Luis,
+# Tapia-Reina Martina
+# All rights reserved.
+
+"""Test for spyctral.utils.footprint"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+import functools
+
+import numpy as np
+
+from spyctral.utils import footprint
+from spyctral.utils.bunch import Bunch, Lazy
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+def test_measure_array():
+    array = np.zeros(1000)
+
+    result = footprint.measure(array)
+
+    assert result["objects"] == 1
+    assert result["array_bytes"] == array.nbytes
+    assert 0 < result["object_bytes"] < array.nbytes
+
+
+def test_measure_shared_buffer():
+    base = np.zeros((4, 1000))
+    bunch = Bunch("data", {"a": base[0], "b": base[1], "c": base[1:]})
+
+    result = footprint.measure(bunch)
+
+    # the buffer is counted once, not once per view
+    assert result["array_bytes"] == base.nbytes
+
+
+def test_measure_seen():
+    array = np.zeros(1000)
+    seen = set()
+
+    first = footprint.measure([array], seen=seen)
+    second = footprint.measure((array,), seen=seen)
+
+    assert first["array_bytes"] == array.nbytes
+    assert second["array_bytes"] == 0
+    assert second["objects"] == 1
+
+
+def test_measure_lazy_and_buffers():
+    buffer = bytearray(1000)
+    value = Lazy(functools.partial(np.frombuffer, buffer))
+
+    result = footprint.measure(Bunch("data", {"a": value}))
+
+    # the arguments of the function are followed, functions are not counted
+    assert result["array_bytes"] == len(buffer)
+
+
+def test_measure_ignore():
+    class Shared:
+        pass
+
+    result = footprint.measure([Shared()], ignore=(Shared,))
+
+    assert result["objects"] == 1